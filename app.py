@@ -1,18 +1,34 @@
 import os
+import time
 import pandas as pd
-from fastapi import FastAPI, UploadFile, File
+from functools import partial
+from contextlib import asynccontextmanager
+from typing import List, Union
+from fastapi import FastAPI, UploadFile, File, Body
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import Response
+from fastapi.responses import Response, StreamingResponse
+from starlette.concurrency import run_in_threadpool
 from starlette.responses import RedirectResponse
-from uvicorn import run as app_run
 
-from sensor.pipeline.train_pipeline import TrainPipeline
-from sensor.utils import read_yaml_file, load_object
-from sensor.ml.model.estimator import ModelResolver, TargetValueMapping
-from sensor.constant.training_pipeline import SAVED_MODEL_DIR, SCHEMA_FILE_PATH
+from sensor.pipeline.prediction_pipeline import PredictionPipeline
+from sensor.pipeline.inference_pool import InferencePool
+from sensor.pipeline.micro_batcher import MicroBatcher
+from sensor.pipeline.prefork_server import PreforkServer
+from sensor.pipeline.training_job import TrainingJobRunner
+from sensor.utils import read_yaml_file
+from sensor.utils.schema_validator import read_schema_config
+from sensor.ml.model.registry import ModelRegistry
+from sensor.constant.training_pipeline import (
+    SAVED_MODEL_DIR,
+    PREDICTION_CHUNK_SIZE,
+    PREDICTION_EXECUTOR_TYPE,
+    PREDICTION_MAX_WORKERS,
+    MICRO_BATCH_MAX_SIZE,
+    MICRO_BATCH_MAX_WAIT_MS,
+    SERVING_WORKERS,
+)
 from sensor.logger import logging
 
-
 env_file_path = os.path.join(os.getcwd(), "env.yaml")
 
 
@@ -22,7 +38,34 @@ def set_env_variable(env_file_path):
         os.environ["MONGO_DB_URL"] = env_config["MONGO_DB_URL"]
 
 
-app = FastAPI()
+schema_config = read_schema_config()
+model_registry = ModelRegistry(model_dir=SAVED_MODEL_DIR)
+prediction_pipeline = PredictionPipeline(model_registry, schema_config=schema_config)
+inference_pool = InferencePool(
+    prediction_pipeline,
+    executor_type=os.getenv("PREDICTION_EXECUTOR_TYPE", PREDICTION_EXECUTOR_TYPE),
+    max_workers=int(os.getenv("PREDICTION_MAX_WORKERS", PREDICTION_MAX_WORKERS)),
+)
+micro_batcher = MicroBatcher(
+    # Probabilities come at no extra cost and are only returned when requested.
+    partial(inference_pool.predict_records, with_probability=True),
+    max_batch_size=int(os.getenv("MICRO_BATCH_MAX_SIZE", MICRO_BATCH_MAX_SIZE)),
+    max_wait_ms=float(os.getenv("MICRO_BATCH_MAX_WAIT_MS", MICRO_BATCH_MAX_WAIT_MS)),
+)
+training_job_runner = TrainingJobRunner()
+
+STREAM_MEDIA_TYPES = {"csv": "text/csv", "ndjson": "application/x-ndjson"}
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    micro_batcher.start()
+    yield
+    await micro_batcher.stop()
+    inference_pool.shutdown()
+
+
+app = FastAPI(lifespan=lifespan)
 
 app.add_middleware(
     CORSMiddleware,
@@ -38,51 +81,161 @@ async def index():
     return RedirectResponse(url="/docs")
 
 
+@app.get("/health")
+async def health_route():
+    return {"status": "ok"}
+
+
 @app.get("/train")
 async def train_route():
     try:
-        train_pipeline = TrainPipeline()
-        if train_pipeline.is_pipeline_running:
+        job = training_job_runner.submit()
+        if job is None:
             return Response("The training pipeline is already running.")
-        train_pipeline.run_pipeline()
-        return Response("Training Done Successfully.")
+        return Response(f"Training Started with Job ID [{job.job_id}].")
 
     except Exception as e:
         return Response(f"Error Occurred! {e}")
 
 
+@app.get("/train/status")
+async def train_status_route():
+    status = training_job_runner.status()
+    if status is None:
+        return Response("No Training Job has been started.")
+    return status
+
+
 @app.get("/predict")
 async def predict_route(datafile: UploadFile = File(Ellipsis)):
     try:
-        # Read Prediction CSV File.
-        df = pd.read_csv(datafile.file)
+        # Parse and predict on the Inference Pool.
+        predictions = await inference_pool.predict_csv(datafile)
+        if predictions is None:
+            return Response("Model is Unavailable.")
+        return Response("Prediction Done Successfully.")
 
-        # Drop Specified Columns.
-        schema_config = read_yaml_file(SCHEMA_FILE_PATH)
-        df = df.drop(schema_config["drop_columns"], axis=1)
+    except Exception as e:
+        return Response(f"Error Occurred! {e}")
 
-        # Load Model.
-        model_resolver = ModelResolver(model_dir=SAVED_MODEL_DIR)
-        if not model_resolver.is_model_exists():
-            return Response("Model is Unavailable.")
 
-        best_model_path = model_resolver.get_best_model_path()
-        model = load_object(file_path=best_model_path)
-        y_pred = model.predict(df)
+@app.post("/predict/records")
+async def predict_records_route(
+    records: Union[dict, List[dict]] = Body(Ellipsis), with_probability: bool = False
+):
+    try:
+        if isinstance(records, dict):
+            records = [records]
+        predictions = await micro_batcher.predict(records)
+        response = {"predicted_class": [p["predicted_class"] for p in predictions]}
+        if with_probability:
+            response["probability"] = [p["probability"] for p in predictions]
+        return response
+
+    except Exception as e:
+        return Response(f"Error Occurred! {e}")
+
+
+def encode_predictions(
+    predictions: Union[pd.Series, pd.DataFrame], output_format: str, header: bool
+) -> str:
+    if output_format == "ndjson":
+        if isinstance(predictions, pd.Series):
+            predictions = predictions.to_frame()
+        records = predictions.to_json(orient="records", lines=True)
+        return records.rstrip("\n") + "\n"
+    return predictions.to_csv(index=False, header=header)
+
+
+@app.post("/predict/stream")
+async def predict_stream_route(
+    datafile: UploadFile = File(Ellipsis),
+    chunk_size: int = PREDICTION_CHUNK_SIZE,
+    output_format: str = "csv",
+    with_probability: bool = False,
+):
+    try:
+        if output_format not in STREAM_MEDIA_TYPES:
+            return Response(f"Unsupported output format: {output_format}.")
+
+        if await run_in_threadpool(model_registry.get_model) is None:
+            return Response("Model is Unavailable.")
 
-        df["predicted_class"] = y_pred
-        df["predicted_class"].replace(
-            TargetValueMapping().reverse_mapping(), inplace=True
+        # Each chunk is parsed on the thread pool and scored by the inference
+        # pool, like every other prediction route. The first chunk is scored
+        # up front so errors surface before streaming starts and its
+        # throughput can be reported in the headers.
+        reader = pd.read_csv(datafile.file, chunksize=chunk_size)
+
+        async def predict_next_chunk():
+            chunk = await run_in_threadpool(next, reader, None)
+            if chunk is None:
+                return None
+            predictions = await inference_pool.predict_dataframe(
+                chunk, with_probability=with_probability
+            )
+            if predictions is None:
+                raise Exception("Model is Unavailable.")
+            return predictions
+
+        start = time.perf_counter()
+        first_chunk = await predict_next_chunk()
+        elapsed = time.perf_counter() - start
+        if first_chunk is None:
+            return Response("Uploaded file has no rows.")
+
+        async def stream():
+            num_rows, stream_start = len(first_chunk), time.perf_counter() - elapsed
+            yield encode_predictions(first_chunk, output_format, header=True)
+            while (predictions := await predict_next_chunk()) is not None:
+                num_rows += len(predictions)
+                yield encode_predictions(predictions, output_format, header=False)
+            total = time.perf_counter() - stream_start
+            logging.info(
+                f"Streamed {num_rows} predictions at {num_rows / total:.0f} rows/sec."
+            )
+
+        headers = {
+            "X-Chunk-Size": str(chunk_size),
+            "X-Rows-Per-Second": f"{len(first_chunk) / elapsed:.0f}",
+        }
+        return StreamingResponse(
+            stream(), media_type=STREAM_MEDIA_TYPES[output_format], headers=headers
         )
-        df.to_html()
-        return Response("Prediction Done Successfully.")
 
     except Exception as e:
         return Response(f"Error Occurred! {e}")
 
 
+@app.get("/drift")
+async def drift_route():
+    # Drift is tracked per process: this covers only the traffic scored by the
+    # server worker answering the request, not by other pre-forked workers or
+    # process pool workers.
+    drift_checker = model_registry.get_drift_checker()
+    if drift_checker is None:
+        return Response("Reference Sketch is Unavailable.")
+    report = await run_in_threadpool(drift_checker.report)
+    return {
+        "version": model_registry.version,
+        "scope": f"Predictions served by worker process [{os.getpid()}] only.",
+        "row_count": drift_checker.row_count,
+        "min_rows": drift_checker.min_rows,
+        "dropped_batches": drift_checker.dropped_batches,
+        "drift_status": any(column["drift_status"] for column in report.values()),
+        "columns": report,
+    }
+
+
+@app.get("/model")
+async def model_route():
+    return {**model_registry.stats(), "micro_batcher": micro_batcher.stats()}
+
+
 def main():
     try:
+        from sensor.pipeline.train_pipeline import TrainPipeline
+
         set_env_variable(env_file_path)
         training_pipeline = TrainPipeline()
         training_pipeline.run_pipeline()
@@ -91,4 +244,8 @@ def main():
 
 
 if __name__ == "__main__":
-    app_run(app, host="0.0.0.0", port=8080)
+    PreforkServer(
+        app,
+        model_registry,
+        workers=int(os.getenv("SERVING_WORKERS", SERVING_WORKERS)),
+    ).run()
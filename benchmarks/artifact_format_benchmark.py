@@ -0,0 +1,81 @@
+"""
+Compare the data artifact formats on the I/O a training pipeline run performs:
+DataIngestion writes the feature store, train and test files; DataValidation,
+DataTransformation and ModelEvaluation each read train and test back.
+
+    python benchmarks/artifact_format_benchmark.py --rows 200000
+"""
+
+import os
+import time
+import argparse
+import tempfile
+import numpy as np
+import pandas as pd
+
+from sensor.constant.training_pipeline import SCHEMA_FILE_PATH
+from sensor.utils import load_dataframe, read_yaml_file, save_dataframe
+
+FORMATS = ("csv", "feather", "parquet")
+NUM_READING_STAGES = 3
+
+
+def make_sensor_dataframe(num_rows: int, seed: int = 42) -> pd.DataFrame:
+    schema_config = read_yaml_file(SCHEMA_FILE_PATH)
+    drop_columns = set(schema_config["drop_columns"])
+    columns = [
+        column
+        for column in schema_config["numerical_columns"]
+        if column not in drop_columns
+    ]
+    rng = np.random.default_rng(seed)
+    data = rng.lognormal(mean=5, sigma=3, size=(num_rows, len(columns)))
+    data[rng.random(data.shape) < 0.08] = np.nan
+    df = pd.DataFrame(data.astype(np.float32), columns=columns)
+    df.insert(0, "class", np.where(rng.random(num_rows) < 0.02, "pos", "neg"))
+    return df
+
+
+def run_pipeline_io(df: pd.DataFrame, file_format: str, dir_path: str) -> dict:
+    paths = {
+        name: os.path.join(dir_path, f"{name}.{file_format}")
+        for name in ("sensor", "train", "test")
+    }
+    split = int(len(df) * 0.8)
+
+    start = time.perf_counter()
+    save_dataframe(paths["sensor"], df)
+    save_dataframe(paths["train"], df.iloc[:split])
+    save_dataframe(paths["test"], df.iloc[split:])
+    write_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for _ in range(NUM_READING_STAGES):
+        load_dataframe(paths["train"])
+        load_dataframe(paths["test"])
+    read_seconds = time.perf_counter() - start
+
+    return {
+        "format": file_format,
+        "write_seconds": round(write_seconds, 3),
+        "read_seconds": round(read_seconds, 3),
+        "total_seconds": round(write_seconds + read_seconds, 3),
+        "size_mb": round(sum(os.path.getsize(p) for p in paths.values()) / 2**20, 1),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=100000)
+    args = parser.parse_args()
+
+    df = make_sensor_dataframe(args.rows)
+    results = []
+    for file_format in FORMATS:
+        with tempfile.TemporaryDirectory() as dir_path:
+            results.append(run_pipeline_io(df, file_format, dir_path))
+    print(pd.DataFrame(results).to_string(index=False))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""
+Measure the cold-start import time of the serving modules in fresh
+interpreters, and fail if one exceeds its time budget or imports a training
+module.
+
+    python benchmarks/import_time_benchmark.py --repeat 5 --max-seconds 2.0
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import numpy as np
+import pandas as pd
+
+SERVING_MODULES = (
+    "app",
+    "sensor.pipeline.prediction_pipeline",
+    "sensor.ml.model.registry",
+)
+# Modules only training needs; serving must not import them at startup.
+TRAINING_MODULES = (
+    "sensor.pipeline.train_pipeline",
+    "sensor.components.data_ingestion",
+    "sensor.components.model_trainer",
+    "imblearn",
+    "pymongo",
+    "scipy.stats",
+    "sklearn",
+    "xgboost",
+)
+
+IMPORT_SCRIPT = """
+import json, sys, time
+start = time.perf_counter()
+import {module}
+seconds = time.perf_counter() - start
+print(json.dumps({{
+    "seconds": seconds,
+    "training_modules": [m for m in {training_modules!r} if m in sys.modules],
+}}))
+"""
+
+
+def import_once(module: str) -> dict:
+    repo_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    result = subprocess.run(
+        [
+            sys.executable,
+            "-c",
+            IMPORT_SCRIPT.format(module=module, training_modules=TRAINING_MODULES),
+        ],
+        cwd=repo_dir,
+        env={**os.environ, "PYTHONPATH": repo_dir},
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return json.loads(result.stdout.splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--max-seconds", type=float, default=2.0)
+    args = parser.parse_args()
+
+    results = []
+    for module in SERVING_MODULES:
+        runs = [import_once(module) for _ in range(args.repeat)]
+        results.append(
+            {
+                "module": module,
+                "median_seconds": np.median([run["seconds"] for run in runs]),
+                "max_seconds": max(run["seconds"] for run in runs),
+                "training_modules": ",".join(runs[0]["training_modules"]) or "-",
+            }
+        )
+    report = pd.DataFrame(results)
+    print(report.round(3).to_string(index=False))
+
+    too_slow = report["median_seconds"] > args.max_seconds
+    imports_training = report["training_modules"] != "-"
+    if too_slow.any() or imports_training.any():
+        print(
+            f"Cold-start guard failed: over {args.max_seconds}s "
+            f"{list(report.loc[too_slow, 'module'])}, importing training "
+            f"modules {list(report.loc[imports_training, 'module'])}."
+        )
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
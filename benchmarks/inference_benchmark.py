@@ -0,0 +1,87 @@
+"""
+Compare the latency of scoring a batch of sensor readings through the fitted
+preprocessor + XGBClassifier.predict with the fused SensorModel and the
+CompiledSensorModel, at batch sizes from one row upwards.
+
+    python benchmarks/inference_benchmark.py --max-rows 1000000
+"""
+
+import argparse
+import tempfile
+import time
+import numpy as np
+import pandas as pd
+import xgboost as xgb
+
+from benchmarks.preprocessor_benchmark import make_sensor_like_data
+from sensor.components.data_transformation import DataTransformation
+from sensor.ml.model.compiled import CompiledSensorModel, export_compiled_model
+from sensor.ml.model.estimator import SensorModel
+
+TRAIN_ROWS = 20000
+
+
+def time_per_call(predict_fn, data, min_seconds: float = 0.5):
+    """
+    :return: The predictions and the best seconds per call over repeated calls.
+    """
+    y_pred = predict_fn(data)
+    timings = []
+    start = time.perf_counter()
+    while not timings or time.perf_counter() - start < min_seconds:
+        call_start = time.perf_counter()
+        predict_fn(data)
+        timings.append(time.perf_counter() - call_start)
+    return y_pred, min(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--max-rows", type=int, default=1000000)
+    parser.add_argument("--n-estimators", type=int, default=100)
+    args = parser.parse_args()
+
+    train_df = make_sensor_like_data(TRAIN_ROWS, seed=0)
+    # A label the trees can learn from a few of the sensors.
+    target = (train_df.iloc[:, :3].fillna(0).sum(axis=1) > 3000).astype(int)
+    preprocessor = DataTransformation.get_data_transformer_object().fit(train_df)
+    classifier = xgb.XGBClassifier(
+        n_estimators=args.n_estimators, tree_method="hist"
+    ).fit(preprocessor.transform(train_df), target)
+    sensor_model = SensorModel(preprocessor=preprocessor, model=classifier)
+    with tempfile.TemporaryDirectory() as model_dir:
+        export_compiled_model(sensor_model, model_dir)
+        compiled_model = CompiledSensorModel.load(model_dir)
+
+    predictors = {
+        "preprocessor_then_predict": lambda df: classifier.predict(
+            preprocessor.transform(df)
+        ),
+        "fused_sensor_model": sensor_model.predict,
+        "compiled_sensor_model": compiled_model.predict,
+    }
+    test_df = make_sensor_like_data(args.max_rows, seed=1)
+    results = []
+    batch_rows = 1
+    while batch_rows <= args.max_rows:
+        batch = test_df.iloc[:batch_rows]
+        for name, predict_fn in predictors.items():
+            y_pred, seconds = time_per_call(predict_fn, batch)
+            if name == "preprocessor_then_predict":
+                y_baseline, baseline_seconds = y_pred, seconds
+            results.append(
+                {
+                    "batch_rows": batch_rows,
+                    "predictor": name,
+                    "ms_per_batch": seconds * 1000,
+                    "us_per_row": seconds * 1e6 / batch_rows,
+                    "speedup": baseline_seconds / seconds,
+                    "agreement": np.mean(y_pred == y_baseline),
+                }
+            )
+        batch_rows *= 10
+    print(pd.DataFrame(results).round(3).to_string(index=False))
+
+
+if __name__ == "__main__":
+    main()
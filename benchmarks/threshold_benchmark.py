@@ -0,0 +1,75 @@
+"""
+Compare the one-pass cost-optimal threshold sweep with re-scoring the
+evaluation set at every candidate threshold, on time and the chosen cost.
+
+    python benchmarks/threshold_benchmark.py --rows 100000 --naive-thresholds 1000
+"""
+
+import argparse
+import time
+import numpy as np
+import pandas as pd
+
+from sensor.constant.training_pipeline import (
+    MODEL_TRAINER_FALSE_NEGATIVE_COST,
+    MODEL_TRAINER_FALSE_POSITIVE_COST,
+)
+from sensor.ml.metric.classification_metric import (
+    get_cost_optimal_threshold,
+    get_threshold_cost,
+)
+
+POSITIVE_RATE = 0.02
+
+
+def make_scores(num_rows: int, seed: int = 42):
+    """
+    Imbalanced labels with overlapping, rounded scores, so ties are common.
+    """
+    rng = np.random.default_rng(seed)
+    y_true = (rng.random(num_rows) < POSITIVE_RATE).astype(np.int64)
+    logits = rng.normal(loc=np.where(y_true == 1, 1.5, -1.5), scale=1.2)
+    return y_true, np.round(1 / (1 + np.exp(-logits)), 4)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=100000)
+    parser.add_argument("--naive-thresholds", type=int, default=1000)
+    args = parser.parse_args()
+
+    y_true, y_score = make_scores(args.rows)
+    costs = (MODEL_TRAINER_FALSE_POSITIVE_COST, MODEL_TRAINER_FALSE_NEGATIVE_COST)
+
+    start = time.perf_counter()
+    sweep = get_cost_optimal_threshold(y_true, y_score, *costs)
+    sweep_seconds = time.perf_counter() - start
+
+    # Re-score at every distinct score, or an evenly spaced subset of them.
+    candidates = np.unique(y_score)
+    if len(candidates) > args.naive_thresholds:
+        candidates = candidates[
+            np.linspace(0, len(candidates) - 1, args.naive_thresholds).astype(int)
+        ]
+    start = time.perf_counter()
+    naive = min(
+        (get_threshold_cost(y_true, y_score, t, *costs) for t in candidates),
+        key=lambda artifact: artifact.cost,
+    )
+    naive_seconds = time.perf_counter() - start
+
+    default = get_threshold_cost(y_true, y_score, 0.5, *costs)
+    results = [
+        {"method": "default_0.5", "seconds": 0.0, **vars(default)},
+        {"method": "one_pass_sweep", "seconds": sweep_seconds, **vars(sweep)},
+        {
+            "method": f"rescore_{len(candidates)}_thresholds",
+            "seconds": naive_seconds,
+            **vars(naive),
+        },
+    ]
+    print(pd.DataFrame(results).round(4).to_string(index=False))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,11 +1,13 @@
-import os
 import sys
+from datetime import timedelta
+from bson import ObjectId
 from pandas import DataFrame
 from sklearn.model_selection import train_test_split
 
-from sensor.constant.training_pipeline import SCHEMA_FILE_PATH
-from sensor.data_access.sensor_data import SensorData
-from sensor.utils import read_yaml_file
+from sensor.data_access.feature_store import FeatureStore
+from sensor.data_access.sensor_data import ID_COLUMN, SensorData
+from sensor.utils import save_dataframe
+from sensor.utils.schema_validator import read_schema_config
 from sensor.entity.artifact_entity import DataIngestionArtifact
 from sensor.entity.config_entity import DataIngestionConfig
 from sensor.exception import SensorException
@@ -21,7 +23,74 @@ class DataIngestion:
     def __init__(self, data_ingestion_config: DataIngestionConfig):
         try:
             self.data_ingestion_config = data_ingestion_config
-            self._schema_config = read_yaml_file(SCHEMA_FILE_PATH)
+            self._schema_config = read_schema_config()
+        except Exception as e:
+            raise SensorException(e, sys) from e
+
+    def ingest_new_records(self, sensor_data: SensorData) -> DataFrame:
+        """
+        Export only the records the persisted Feature Store doesn't hold yet,
+        append them to the store, and return the full stored dataset.
+
+        ObjectIds only roughly increase: their leading timestamp comes from the
+        client that made them, so a document from a client whose clock lags,
+        or one inserted late, can get an `_id` below a watermark already
+        recorded. Each run therefore re-reads the documents from
+        `watermark_overlap_seconds` before the watermark and drops those
+        already stored. A document that arrives later than that is still missed.
+
+        Only the MongoDB export is incremental. The model is retrained on the
+        whole history, so the full store is returned, and the split,
+        validation, transformation and training stages still cost in
+        proportion to the total history rather than to the new records.
+        """
+        try:
+            collection_name = self.data_ingestion_config.collection_name
+            feature_store = FeatureStore(
+                self.data_ingestion_config.persisted_feature_store_dir
+            )
+            watermark = feature_store.get_watermark()
+            latest_id = sensor_data.get_latest_id(collection_name=collection_name)
+            if latest_id is None:
+                logging.info("No records to ingest.")
+                return feature_store.read()
+
+            # Bounded by the latest `_id` up front, so the partitions cover a
+            # fixed range even while records are being inserted.
+            id_range = {"$lte": latest_id}
+            stored_ids = set()
+            if watermark is not None:
+                overlap_start = ObjectId.from_datetime(
+                    ObjectId(watermark).generation_time
+                    - timedelta(
+                        seconds=self.data_ingestion_config.watermark_overlap_seconds
+                    )
+                )
+                stored_ids = feature_store.get_ids_since(str(overlap_start))
+                if stored_ids is None:
+                    # Parts written without `_id` can't be de-duplicated against.
+                    id_range["$gt"] = ObjectId(watermark)
+                    stored_ids = set()
+                else:
+                    id_range["$gte"] = overlap_start
+
+            new_dataframe = sensor_data.export_collection_as_dataframe(
+                collection_name=collection_name,
+                num_partitions=self.data_ingestion_config.num_partitions,
+                query={"_id": id_range},
+                include_id=True,
+            )
+            new_dataframe = new_dataframe[~new_dataframe[ID_COLUMN].isin(stored_ids)]
+            if len(new_dataframe):
+                # Named after its own largest `_id`, which no other part holds.
+                feature_store.append(
+                    new_dataframe, watermark=new_dataframe[ID_COLUMN].max()
+                )
+            else:
+                logging.info("No new records to ingest since the last watermark.")
+
+            return feature_store.read()
+
         except Exception as e:
             raise SensorException(e, sys) from e
 
@@ -29,13 +98,18 @@ class DataIngestion:
         try:
             logging.info("Exporting data from MongoDB to Feature Store.")
             sensor_data = SensorData()
-            dataframe = sensor_data.export_collection_as_dataframe(
-                collection_name=self.data_ingestion_config.collection_name
+            if self.data_ingestion_config.incremental:
+                dataframe = self.ingest_new_records(sensor_data)
+            else:
+                dataframe = sensor_data.export_collection_as_dataframe(
+                    collection_name=self.data_ingestion_config.collection_name,
+                    num_partitions=self.data_ingestion_config.num_partitions,
+                )
+            save_dataframe(
+                self.data_ingestion_config.feature_store_file_path,
+                dataframe,
+                export_csv=self.data_ingestion_config.export_csv,
             )
-            feature_store_file_path = self.data_ingestion_config.feature_store_file_path
-            dir_path = os.path.dirname(feature_store_file_path)
-            os.makedirs(dir_path, exist_ok=True)
-            dataframe.to_csv(feature_store_file_path, index=False, header=True)
             return dataframe
 
         except Exception as e:
@@ -50,15 +124,16 @@ class DataIngestion:
             train_set, test_set = train_test_split(
                 dataframe, test_size=self.data_ingestion_config.train_test_split_ratio
             )
-            dir_path = os.path.dirname(self.data_ingestion_config.training_file_path)
-            os.makedirs(dir_path, exist_ok=True)
-
             logging.info("Export train and test file path.")
-            train_set.to_csv(
-                self.data_ingestion_config.training_file_path, index=False, header=True
+            save_dataframe(
+                self.data_ingestion_config.training_file_path,
+                train_set,
+                export_csv=self.data_ingestion_config.export_csv,
             )
-            test_set.to_csv(
-                self.data_ingestion_config.testing_file_path, index=False, header=True
+            save_dataframe(
+                self.data_ingestion_config.testing_file_path,
+                test_set,
+                export_csv=self.data_ingestion_config.export_csv,
             )
 
         except Exception as e:
@@ -68,7 +143,6 @@ class DataIngestion:
         try:
             logging.info(">> Data Ingestion Component Started.")
             dataframe = self.export_data_into_feature_store()
-            dataframe = dataframe.drop(self._schema_config["drop_columns"], axis=1)
             self.split_data_as_train_test(dataframe=dataframe)
             data_ingestion_artifact = DataIngestionArtifact(
                 trained_file_path=self.data_ingestion_config.training_file_path,
@@ -1,8 +1,11 @@
+import os
 import sys
-import pandas as pd
 import numpy as np
-from imblearn.combine import SMOTETomek
+import pandas as pd
+from dataclasses import asdict
+from typing import Optional, Tuple
 from sklearn.impute import SimpleImputer
+from sklearn.model_selection import train_test_split
 from sklearn.preprocessing import RobustScaler
 from sklearn.pipeline import Pipeline
 
@@ -13,10 +16,27 @@ from sensor.entity.artifact_entity import (
 )
 from sensor.entity.config_entity import DataTransformationConfig
 from sensor.ml.model.estimator import TargetValueMapping
-from sensor.utils import save_numpy_array_data, save_object
+from sensor.ml.preprocessing.streaming_preprocessor import (
+    StreamingRobustPreprocessor,
+    split_rows,
+)
+from sensor.ml.sampling.resampler import Resampler
+from sensor.utils import (
+    count_dataframe_rows,
+    iter_dataframe_batches,
+    load_dataframe,
+    save_numpy_array_data,
+    save_object,
+)
+from sensor.utils.report import write_jsonl_report
 from sensor.exception import SensorException
 from sensor.logger import logging
 
+PREPROCESSORS = ("exact", "sketch")
+
+# SMOTE and Tomek links need every training row in memory at once.
+OUT_OF_CORE_RESAMPLING_STRATEGIES = ("class_weight", "none")
+
 
 class DataTransformation:
     """
@@ -38,7 +58,7 @@ class DataTransformation:
     @staticmethod
     def read_data(file_path) -> pd.DataFrame:
         try:
-            return pd.read_csv(file_path)
+            return load_dataframe(file_path)
         except Exception as e:
             raise SensorException(e, sys) from e
 
@@ -58,10 +78,244 @@ class DataTransformation:
         except Exception as e:
             raise SensorException(e, sys) from e
 
+    def get_streaming_transformer_object(self) -> StreamingRobustPreprocessor:
+        """
+        Function to perform the same imputation and scaling with statistics
+        from quantile sketches, so it can be fitted in batches or partitions.
+        :return: StreamingRobustPreprocessor object to transform dataset.
+        """
+        try:
+            return StreamingRobustPreprocessor(
+                fill_value=0,
+                relative_accuracy=self.data_transformation_config.sketch_relative_accuracy,
+            )
+        except Exception as e:
+            raise SensorException(e, sys) from e
+
+    def fit_preprocessor(self, input_feature_df: pd.DataFrame):
+        """
+        :return: The exact Pipeline, or the streaming preprocessor fitted over
+        `sketch_n_jobs` row partitions, per the configured preprocessor.
+        """
+        try:
+            preprocessor = self.data_transformation_config.preprocessor
+            if preprocessor not in PREPROCESSORS:
+                raise Exception(
+                    f"Unknown preprocessor [{preprocessor}]; expected one of {PREPROCESSORS}."
+                )
+            if preprocessor == "exact":
+                return self.get_data_transformer_object().fit(input_feature_df)
+
+            n_jobs = self.data_transformation_config.sketch_n_jobs
+            return self.get_streaming_transformer_object().fit_partitions(
+                split_rows(input_feature_df, n_jobs), n_jobs=n_jobs
+            )
+        except Exception as e:
+            raise SensorException(e, sys) from e
+
+    def split_validation_rows(
+        self, train_df: pd.DataFrame
+    ) -> Tuple[pd.DataFrame, pd.DataFrame]:
+        """
+        Hold out a stratified `valid_fraction` of the training rows before the
+        preprocessor is fitted and the rest resampled, so early stopping,
+        tuning and the decision threshold are judged on real rows with the
+        real class balance rather than on synthetic or rebalanced ones.
+        :return: The training and validation Dataframes.
+        """
+        try:
+            return train_test_split(
+                train_df,
+                test_size=self.data_transformation_config.valid_fraction,
+                stratify=train_df[TARGET_COLUMN],
+                random_state=42,
+            )
+        except Exception as e:
+            raise SensorException(e, sys) from e
+
+    def get_validation_row_mask(self, num_rows: int) -> np.ndarray:
+        """
+        Out-of-core counterpart of `split_validation_rows`: the rows can't be
+        stratified without reading the labels first, so each row is held out
+        at random with probability `valid_fraction`.
+        :return: A boolean mask of the validation rows.
+        """
+        rng = np.random.default_rng(42)
+        return rng.random(num_rows) < self.data_transformation_config.valid_fraction
+
+    def fit_preprocessor_from_batches(
+        self, file_path: str, row_mask: Optional[np.ndarray] = None
+    ) -> StreamingRobustPreprocessor:
+        """
+        Fit the streaming preprocessor on the file, read in batches.
+        :param row_mask: Fit on the rows where the mask is set only.
+        :return: Fitted StreamingRobustPreprocessor object.
+        """
+        try:
+            preprocessor = self.get_streaming_transformer_object()
+            start = 0
+            for batch in iter_dataframe_batches(
+                file_path, self.data_transformation_config.batch_rows
+            ):
+                end = start + len(batch)
+                if row_mask is not None:
+                    batch = batch[row_mask[start:end]]
+                start = end
+                if len(batch):
+                    preprocessor.partial_fit(batch.drop(columns=[TARGET_COLUMN]))
+            return preprocessor
+        except Exception as e:
+            raise SensorException(e, sys) from e
+
+    def transform_in_batches(
+        self,
+        preprocessor: StreamingRobustPreprocessor,
+        file_path: str,
+        feature_file_path: str,
+        label_file_path: str,
+        row_mask: Optional[np.ndarray] = None,
+    ) -> np.ndarray:
+        """
+        Transform a Dataframe file batch by batch straight into memory-mapped
+        feature and label .npy files.
+        :param row_mask: Transform the rows where the mask is set only.
+        :return: The memory-mapped labels.
+        """
+        try:
+            if row_mask is None:
+                num_rows = count_dataframe_rows(file_path)
+            else:
+                num_rows = int(np.count_nonzero(row_mask))
+            os.makedirs(os.path.dirname(feature_file_path), exist_ok=True)
+            features = np.lib.format.open_memmap(
+                feature_file_path,
+                mode="w+",
+                dtype=self.data_transformation_config.feature_dtype,
+                shape=(num_rows, preprocessor.n_features_in_),
+            )
+            labels = np.lib.format.open_memmap(
+                label_file_path,
+                mode="w+",
+                dtype=self.data_transformation_config.label_dtype,
+                shape=(num_rows,),
+            )
+            start = file_start = 0
+            for batch in iter_dataframe_batches(
+                file_path, self.data_transformation_config.batch_rows
+            ):
+                if row_mask is not None:
+                    file_end = file_start + len(batch)
+                    batch = batch[row_mask[file_start:file_end]]
+                    file_start = file_end
+                end = start + len(batch)
+                features[start:end] = preprocessor.transform(
+                    batch.drop(columns=[TARGET_COLUMN])
+                )
+                labels[start:end] = batch[TARGET_COLUMN].map(
+                    TargetValueMapping().to_dict()
+                )
+                start = end
+            features.flush()
+            labels.flush()
+            return labels
+        except Exception as e:
+            raise SensorException(e, sys) from e
+
+    def get_data_transformation_artifact(
+        self, scale_pos_weight: float
+    ) -> DataTransformationArtifact:
+        return DataTransformationArtifact(
+            transformed_object_file_path=self.data_transformation_config.transformed_object_file_path,
+            transformed_train_file_path=self.data_transformation_config.transformed_train_file_path,
+            transformed_test_file_path=self.data_transformation_config.transformed_test_file_path,
+            transformed_train_label_file_path=self.data_transformation_config.transformed_train_label_file_path,
+            transformed_test_label_file_path=self.data_transformation_config.transformed_test_label_file_path,
+            transformed_valid_file_path=self.data_transformation_config.transformed_valid_file_path,
+            transformed_valid_label_file_path=self.data_transformation_config.transformed_valid_label_file_path,
+            resampling_report_file_path=self.data_transformation_config.resampling_report_file_path,
+            scale_pos_weight=scale_pos_weight,
+        )
+
+    def initiate_out_of_core_data_transformation(self) -> DataTransformationArtifact:
+        """
+        Transform the dataset without loading it: the streaming preprocessor is
+        fitted and the files are transformed batch by batch. Only
+        the strategies that keep every row are supported for class imbalance;
+        the others fall back to "class_weight".
+        """
+        try:
+            logging.info(">> Data Transformation Component Started (out-of-core).")
+            train_file_path = self.data_validation_artifact.valid_train_file_path
+            valid_mask = self.get_validation_row_mask(
+                count_dataframe_rows(train_file_path)
+            )
+            preprocessor_object = self.fit_preprocessor_from_batches(
+                train_file_path, row_mask=~valid_mask
+            )
+
+            strategy = self.data_transformation_config.resampling_strategy
+            if strategy not in OUT_OF_CORE_RESAMPLING_STRATEGIES:
+                logging.info(
+                    f"[{strategy}] needs the whole training set in memory; "
+                    "using [class_weight] instead."
+                )
+                strategy = "class_weight"
+
+            logging.info("Transforming the dataset in batches.....")
+            train_labels = self.transform_in_batches(
+                preprocessor_object,
+                train_file_path,
+                self.data_transformation_config.transformed_train_file_path,
+                self.data_transformation_config.transformed_train_label_file_path,
+                row_mask=~valid_mask,
+            )
+            self.transform_in_batches(
+                preprocessor_object,
+                train_file_path,
+                self.data_transformation_config.transformed_valid_file_path,
+                self.data_transformation_config.transformed_valid_label_file_path,
+                row_mask=valid_mask,
+            )
+            self.transform_in_batches(
+                preprocessor_object,
+                self.data_validation_artifact.valid_test_file_path,
+                self.data_transformation_config.transformed_test_file_path,
+                self.data_transformation_config.transformed_test_label_file_path,
+            )
+
+            # Neither strategy touches the features; only the labels are read.
+            _, _, train_resampling_report = Resampler(strategy=strategy).fit_resample(
+                None, train_labels
+            )
+            logging.info(f"Resampling Report: [{train_resampling_report}].")
+            write_jsonl_report(
+                self.data_transformation_config.resampling_report_file_path,
+                [{"split": "train", **asdict(train_resampling_report)}],
+            )
+
+            save_object(
+                self.data_transformation_config.transformed_object_file_path,
+                preprocessor_object,
+            )
+
+            data_transformation_artifact = self.get_data_transformation_artifact(
+                train_resampling_report.scale_pos_weight
+            )
+            logging.info(
+                f"Data Transformation Artifact: [{data_transformation_artifact}]."
+            )
+            logging.info(">> Data Transformation Component Ended.")
+            return data_transformation_artifact
+
+        except Exception as e:
+            raise SensorException(e, sys) from e
+
     def initiate_data_transformation(self) -> DataTransformationArtifact:
         try:
+            if self.data_transformation_config.out_of_core:
+                return self.initiate_out_of_core_data_transformation()
+
             logging.info(">> Data Transformation Component Started.")
-            preprocessor = self.get_data_transformer_object()
 
             train_df = DataTransformation.read_data(
                 file_path=self.data_validation_artifact.valid_train_file_path
@@ -69,69 +323,127 @@ class DataTransformation:
             test_df = DataTransformation.read_data(
                 file_path=self.data_validation_artifact.valid_test_file_path
             )
+            train_df, valid_df = self.split_validation_rows(train_df)
 
             # Train Dataframe.
-            input_feature_train_df = train_df.drop(columns=[TARGET_COLUMN], axis=1)
+            input_feature_train_df = train_df.drop(columns=[TARGET_COLUMN])
             target_feature_train_df = train_df[TARGET_COLUMN]
-            target_feature_train_df = target_feature_train_df.replace(
+            target_feature_train_df = target_feature_train_df.map(
                 TargetValueMapping().to_dict()
             )
 
             # Test Dataframe.
-            input_feature_test_df = test_df.drop(columns=[TARGET_COLUMN], axis=1)
+            input_feature_test_df = test_df.drop(columns=[TARGET_COLUMN])
             target_feature_test_df = test_df[TARGET_COLUMN]
-            target_feature_test_df = target_feature_test_df.replace(
+            target_feature_test_df = target_feature_test_df.map(
+                TargetValueMapping().to_dict()
+            )
+
+            # Validation Dataframe.
+            input_feature_valid_df = valid_df.drop(columns=[TARGET_COLUMN])
+            target_feature_valid_df = valid_df[TARGET_COLUMN].map(
                 TargetValueMapping().to_dict()
             )
 
             logging.info("Applying the Pipeline object to transform the dataset.....")
-            preprocessor_object = preprocessor.fit(input_feature_train_df)
+            preprocessor_object = self.fit_preprocessor(input_feature_train_df)
             transformed_input_train_feature = preprocessor_object.transform(
                 input_feature_train_df
             )
             transformed_input_test_feature = preprocessor_object.transform(
                 input_feature_test_df
             )
+            transformed_input_valid_feature = preprocessor_object.transform(
+                input_feature_valid_df
+            )
 
-            smt = SMOTETomek(sampling_strategy="minority")
+            resampler = Resampler(
+                strategy=self.data_transformation_config.resampling_strategy,
+                n_jobs=self.data_transformation_config.resampling_n_jobs,
+            )
 
-            logging.info("Applying SMOTETomek to handle the imbalanced dataset.....")
-            input_feature_train_final, target_feature_train_final = smt.fit_resample(
-                transformed_input_train_feature, target_feature_train_df
+            logging.info(
+                f"Applying [{resampler.strategy}] to handle the imbalanced dataset....."
             )
-            input_feature_test_final, target_feature_test_final = smt.fit_resample(
-                transformed_input_test_feature, target_feature_test_df
+            (
+                input_feature_train_final,
+                target_feature_train_final,
+                train_resampling_report,
+            ) = resampler.fit_resample(
+                transformed_input_train_feature, target_feature_train_df
             )
+            logging.info(f"Resampling Report: [{train_resampling_report}].")
+            resampling_reports = [{"split": "train", **asdict(train_resampling_report)}]
 
-            train_arr = np.c_[
-                input_feature_train_final, np.array(target_feature_train_final)
-            ]
-            test_arr = np.c_[
-                input_feature_test_final, np.array(target_feature_test_final)
-            ]
+            # The test set keeps its real class balance unless asked otherwise.
+            input_feature_test_final, target_feature_test_final = (
+                transformed_input_test_feature,
+                target_feature_test_df,
+            )
+            if self.data_transformation_config.resample_test:
+                (
+                    input_feature_test_final,
+                    target_feature_test_final,
+                    test_resampling_report,
+                ) = resampler.fit_resample(
+                    transformed_input_test_feature, target_feature_test_df
+                )
+                resampling_reports.append(
+                    {"split": "test", **asdict(test_resampling_report)}
+                )
+            write_jsonl_report(
+                self.data_transformation_config.resampling_report_file_path,
+                resampling_reports,
+            )
 
             save_object(
                 self.data_transformation_config.transformed_object_file_path,
                 preprocessor_object,
             )
+
+            # Features and labels are stored apart, so neither is copied into
+            # a combined matrix; the casts are no-ops when dtypes already match.
+            feature_dtype = self.data_transformation_config.feature_dtype
+            label_dtype = self.data_transformation_config.label_dtype
             save_numpy_array_data(
                 self.data_transformation_config.transformed_train_file_path,
-                array=train_arr,
+                array=input_feature_train_final,
+                dtype=feature_dtype,
+            )
+            save_numpy_array_data(
+                self.data_transformation_config.transformed_train_label_file_path,
+                array=target_feature_train_final,
+                dtype=label_dtype,
             )
             save_numpy_array_data(
                 self.data_transformation_config.transformed_test_file_path,
-                array=test_arr,
+                array=input_feature_test_final,
+                dtype=feature_dtype,
+            )
+            save_numpy_array_data(
+                self.data_transformation_config.transformed_test_label_file_path,
+                array=target_feature_test_final,
+                dtype=label_dtype,
+            )
+            save_numpy_array_data(
+                self.data_transformation_config.transformed_valid_file_path,
+                array=transformed_input_valid_feature,
+                dtype=feature_dtype,
+            )
+            save_numpy_array_data(
+                self.data_transformation_config.transformed_valid_label_file_path,
+                array=target_feature_valid_df,
+                dtype=label_dtype,
             )
 
-            data_transformation_artifact = DataTransformationArtifact(
-                transformed_object_file_path=self.data_transformation_config.transformed_object_file_path,
-                transformed_train_file_path=self.data_transformation_config.transformed_train_file_path,
-                transformed_test_file_path=self.data_transformation_config.transformed_test_file_path,
+            data_transformation_artifact = self.get_data_transformation_artifact(
+                train_resampling_report.scale_pos_weight
             )
             logging.info(
                 f"Data Transformation Artifact: [{data_transformation_artifact}]."
             )
             logging.info(">> Data Transformation Component Ended.")
+            return data_transformation_artifact
 
         except Exception as e:
             raise SensorException(e, sys) from e
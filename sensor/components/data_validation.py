@@ -1,12 +1,20 @@
-import os
 import sys
 import pandas as pd
 from scipy.stats import ks_2samp
+from typing import Optional, Tuple
 
-from sensor.constant.training_pipeline import SCHEMA_FILE_PATH
+from sensor.ml.metric.drift_sketch import ReferenceSketch
+from sensor.ml.metric.drift_metric import (
+    bin_proportions,
+    parallel_ks_2samp_columns,
+    population_stability_index,
+    quantile_bin_edges,
+)
 from sensor.entity.artifact_entity import DataIngestionArtifact, DataValidationArtifact
 from sensor.entity.config_entity import DataValidationConfig
-from sensor.utils import read_yaml_file, write_yaml_file
+from sensor.utils import load_dataframe, save_dataframe
+from sensor.utils.report import JsonLinesReportWriter
+from sensor.utils.schema_validator import get_schema_validator, read_schema_config
 from sensor.exception import SensorException
 from sensor.logger import logging
 
@@ -20,17 +28,24 @@ class DataValidation:
         try:
             self.data_ingestion_artifact = data_ingestion_artifact
             self.data_validation_config = data_validation_config
-            self._schema_config = read_yaml_file(file_path=SCHEMA_FILE_PATH)
+            self._schema_config = read_schema_config()
+            self._schema_validator = get_schema_validator()
         except Exception as e:
             raise SensorException(e, sys) from e
 
     def validate_number_of_columns(self, dataframe: pd.DataFrame) -> bool:
         """
         :param dataframe:
-        :return: Returns True if required columns are present.
+        :return: Returns True if exactly the schema columns are present.
         """
         try:
-            return len(dataframe.columns) == len(self._schema_config["columns"])
+            missing_columns = self._schema_validator.get_missing_columns(dataframe)
+            unexpected_columns = self._schema_validator.get_unexpected_columns(
+                dataframe
+            )
+            if unexpected_columns:
+                logging.info(f"Unexpected Columns: [{unexpected_columns}]")
+            return not missing_columns and not unexpected_columns
         except Exception as e:
             raise SensorException(e, sys) from e
 
@@ -40,16 +55,59 @@ class DataValidation:
         :return: Returns True if all numerical columns are present, else False.
         """
         try:
-            dataframe_columns = dataframe.columns
-            numerical_column_present = True
-            missing_numerical_columns = []
-            for num_column in self._schema_config["numerical_columns"]:
-                if num_column not in dataframe_columns:
-                    numerical_column_present = False
-                    missing_numerical_columns.append(num_column)
+            dataframe_columns = set(dataframe.columns)
+            missing_numerical_columns = [
+                column
+                for column in self._schema_validator.numerical_columns
+                if column not in dataframe_columns
+            ]
 
             logging.info(f"Missing Numerical Columns: [{missing_numerical_columns}]")
-            return numerical_column_present
+            return not missing_numerical_columns
+
+        except Exception as e:
+            raise SensorException(e, sys) from e
+
+    def is_column_dtype_valid(self, dataframe: pd.DataFrame) -> bool:
+        """
+        :param dataframe:
+        :return: Returns True if all numerical columns hold numeric values, else False.
+        """
+        try:
+            invalid_dtype_columns = self._schema_validator.get_invalid_dtype_columns(
+                dataframe
+            )
+            if invalid_dtype_columns:
+                logging.info(f"Non-Numeric Columns: [{invalid_dtype_columns}]")
+            return not invalid_dtype_columns
+
+        except Exception as e:
+            raise SensorException(e, sys) from e
+
+    def route_invalid_rows(
+        self,
+        dataframe: pd.DataFrame,
+        file_path: str,
+        valid_file_path: str,
+        invalid_file_path: str,
+    ) -> Tuple[pd.DataFrame, str, Optional[str]]:
+        """
+        Move rows that break the schema's ranges or categories to `invalid_file_path`.
+        :return: The valid rows, the file holding them and the invalid rows'
+        file, which is None when every row is valid and `file_path` is kept.
+        """
+        try:
+            valid_df, invalid_df = self._schema_validator.split_valid_rows(dataframe)
+            if len(invalid_df) == 0:
+                return dataframe, file_path, None
+
+            logging.info(
+                f"Routing {len(invalid_df)} of {len(dataframe)} rows to [{invalid_file_path}]."
+            )
+            valid_df = valid_df.reset_index(drop=True)
+            save_dataframe(valid_file_path, valid_df)
+            save_dataframe(invalid_file_path, invalid_df.reset_index(drop=True))
+            return valid_df, valid_file_path, invalid_file_path
 
         except Exception as e:
             raise SensorException(e, sys) from e
@@ -57,37 +115,111 @@ class DataValidation:
     @staticmethod
     def read_data(file_path) -> pd.DataFrame:
         try:
-            return pd.read_csv(file_path)
+            return load_dataframe(file_path)
+        except Exception as e:
+            raise SensorException(e, sys) from e
+
+    def get_drift_methods(self, columns) -> dict:
+        """
+        :param columns:
+        :return: The drift test of each column, "ks" or "psi". Columns listed
+        under the optional schema key `drift_methods` override the default.
+        """
+        try:
+            drift_methods = self._schema_config.get("drift_methods") or {}
+            methods = {
+                column: drift_methods.get(
+                    column, self.data_validation_config.drift_method
+                )
+                for column in columns
+            }
+            unknown_methods = set(methods.values()) - {"ks", "psi"}
+            if unknown_methods:
+                raise Exception(f"Unknown drift methods: [{unknown_methods}]")
+            return methods
         except Exception as e:
             raise SensorException(e, sys) from e
 
     def detect_dataset_drift(self, base_df, current_df, threshold=0.05) -> bool:
+        """
+        Numerical columns are tested together: KS statistics for all "ks"
+        columns come from one batched engine, optionally spread over
+        `drift_n_jobs` processes, and "psi" columns are compared on quantile
+        bins of the base data. NaNs are left out of both tests.
+        """
         try:
             status = True
-            report = {}
-            for column in base_df.columns:
-                d1 = base_df[column]
-                d2 = current_df[column]
-                is_same_dist = ks_2samp(d1, d2)
-                if threshold <= is_same_dist.pvalue:
-                    is_found = False
-                else:
-                    is_found = True
-                    status = False
-                report[column] = {
-                    "p_value": float(is_same_dist.pvalue),
-                    "drift_status": is_found,
-                }
-
-            drift_report_file_path = self.data_validation_config.drift_report_file_path
-
-            # Create Directory.
-            dir_path = os.path.dirname(drift_report_file_path)
-            os.makedirs(dir_path, exist_ok=True)
-            write_yaml_file(
-                file_path=drift_report_file_path,
-                content=report,
-            )
+            methods = self.get_drift_methods(base_df.columns)
+            numerical_columns = set(base_df.select_dtypes("number").columns)
+            ks_columns = [
+                column
+                for column in base_df.columns
+                if methods[column] == "ks" and column in numerical_columns
+            ]
+            psi_columns = [
+                column
+                for column in base_df.columns
+                if methods[column] == "psi" and column in numerical_columns
+            ]
+
+            # Records are written as each group of columns is tested.
+            with JsonLinesReportWriter(
+                self.data_validation_config.drift_report_file_path
+            ) as report_writer:
+                if ks_columns:
+                    _, p_values = parallel_ks_2samp_columns(
+                        base_df[ks_columns].to_numpy(),
+                        current_df[ks_columns].to_numpy(),
+                        n_jobs=self.data_validation_config.drift_n_jobs,
+                    )
+                    for column, p_value in zip(ks_columns, p_values):
+                        is_found = not threshold <= p_value
+                        status = status and not is_found
+                        report_writer.write(
+                            {
+                                "column": column,
+                                "method": "ks",
+                                "p_value": float(p_value),
+                                "drift_status": is_found,
+                            }
+                        )
+
+                if psi_columns:
+                    base = base_df[psi_columns].to_numpy()
+                    bin_edges = quantile_bin_edges(
+                        base, num_bins=self.data_validation_config.psi_bins
+                    )
+                    psi_values = population_stability_index(
+                        bin_proportions(base, bin_edges),
+                        bin_proportions(current_df[psi_columns].to_numpy(), bin_edges),
+                    )
+                    for column, psi in zip(psi_columns, psi_values):
+                        is_found = bool(psi > self.data_validation_config.psi_threshold)
+                        status = status and not is_found
+                        report_writer.write(
+                            {
+                                "column": column,
+                                "method": "psi",
+                                "psi": float(psi),
+                                "drift_status": is_found,
+                            }
+                        )
+
+                # Non-numerical columns, like the target, keep the per-column KS test.
+                for column in base_df.columns:
+                    if column in numerical_columns:
+                        continue
+                    is_same_dist = ks_2samp(base_df[column], current_df[column])
+                    is_found = not threshold <= is_same_dist.pvalue
+                    status = status and not is_found
+                    report_writer.write(
+                        {
+                            "column": column,
+                            "method": "ks",
+                            "p_value": float(is_same_dist.pvalue),
+                            "drift_status": is_found,
+                        }
+                    )
             return status
 
         except Exception as e:
@@ -135,19 +267,57 @@ class DataValidation:
                     f"{error_message} Missing numerical columns in Test Dataframe.\n"
                 )
 
+            status = self.is_column_dtype_valid(dataframe=train_df)
+
+            if not status:
+                error_message = f"{error_message} Non-numeric numerical columns in Train Dataframe.\n"
+
+            status = self.is_column_dtype_valid(dataframe=test_df)
+
+            if not status:
+                error_message = f"{error_message} Non-numeric numerical columns in Test Dataframe.\n"
+
             if error_message != "":
                 raise Exception(error_message)
 
+            # Route rows that break the schema aside before checking drift.
+            (
+                train_df,
+                valid_train_file_path,
+                invalid_train_file_path,
+            ) = self.route_invalid_rows(
+                train_df,
+                self.data_ingestion_artifact.trained_file_path,
+                self.data_validation_config.valid_train_file_path,
+                self.data_validation_config.invalid_train_file_path,
+            )
+            (
+                test_df,
+                valid_test_file_path,
+                invalid_test_file_path,
+            ) = self.route_invalid_rows(
+                test_df,
+                self.data_ingestion_artifact.test_file_path,
+                self.data_validation_config.valid_test_file_path,
+                self.data_validation_config.invalid_test_file_path,
+            )
+
             # Checking Data Drift.
             status = self.detect_dataset_drift(base_df=train_df, current_df=test_df)
 
+            # Persist the training distribution for drift checks on new data.
+            ReferenceSketch.from_dataframe(
+                train_df, num_bins=self.data_validation_config.psi_bins
+            ).save(self.data_validation_config.reference_sketch_file_path)
+
             data_validation_artifact = DataValidationArtifact(
                 validation_status=status,
-                valid_train_file_path=self.data_ingestion_artifact.trained_file_path,
-                valid_test_file_path=self.data_ingestion_artifact.test_file_path,
-                invalid_train_file_path=None,
-                invalid_test_file_path=None,
+                valid_train_file_path=valid_train_file_path,
+                valid_test_file_path=valid_test_file_path,
+                invalid_train_file_path=invalid_train_file_path,
+                invalid_test_file_path=invalid_test_file_path,
                 drift_report_file_path=self.data_validation_config.drift_report_file_path,
+                reference_sketch_file_path=self.data_validation_config.reference_sketch_file_path,
             )
             logging.info(f"Data Validation Artifact: [{data_validation_artifact}].")
             logging.info(">> Data Validation Component Ended.")
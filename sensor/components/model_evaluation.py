@@ -1,5 +1,6 @@
 import sys
 import pandas as pd
+from dataclasses import asdict
 
 from sensor.constant.training_pipeline import TARGET_COLUMN
 from sensor.entity.artifact_entity import (
@@ -11,8 +12,10 @@ from sensor.entity.config_entity import ModelEvaluationConfig
 from sensor.exception import SensorException
 from sensor.logger import logging
 from sensor.ml.metric.classification_metric import get_classification_score
+from sensor.ml.model.compiled import load_sensor_model
 from sensor.ml.model.estimator import TargetValueMapping, ModelResolver
-from sensor.utils import load_object, write_yaml_file
+from sensor.utils import load_dataframe
+from sensor.utils.report import flatten_record, write_jsonl_report
 
 """
 The Evaluator component performs a deep analysis of the training results for our models 
@@ -45,12 +48,13 @@ class ModelEvaluation:
         try:
             logging.info(">> Model Evaluation Component Started.")
 
-            train_df = pd.read_csv(self.data_validation_artifact.valid_train_file_path)
-            test_df = pd.read_csv(self.data_validation_artifact.valid_test_file_path)
+            train_df = load_dataframe(
+                self.data_validation_artifact.valid_train_file_path
+            )
+            test_df = load_dataframe(self.data_validation_artifact.valid_test_file_path)
 
             df = pd.concat([train_df, test_df])
-            y_true = df[TARGET_COLUMN]
-            y_true.replace(TargetValueMapping().to_dict(), inplace=True)
+            y_true = df[TARGET_COLUMN].map(TargetValueMapping().to_dict())
             df.drop(TARGET_COLUMN, axis=1, inplace=True)
 
             train_model_file_path = self.model_trainer_artifact.trained_model_file_path
@@ -72,11 +76,13 @@ class ModelEvaluation:
                 return model_evaluation_artifact
 
             latest_model_path = model_resolver.get_best_model_path()
-            latest_model = load_object(file_path=latest_model_path)
-            train_model = load_object(file_path=train_model_file_path)
+            latest_model = load_sensor_model(latest_model_path)
+            train_model = load_sensor_model(train_model_file_path)
 
-            y_trained_pred = train_model.predict(df)
-            y_latest_pred = latest_model.predict(df)
+            # Both models are compared by F1 at the default threshold, not at
+            # their own cost thresholds, which each picked on different data.
+            y_trained_pred = train_model.predict(df, threshold=0.5)
+            y_latest_pred = latest_model.predict(df, threshold=0.5)
 
             trained_metric = get_classification_score(y_true, y_trained_pred)
             latest_metric = get_classification_score(y_true, y_latest_pred)
@@ -95,11 +101,11 @@ class ModelEvaluation:
                 best_model_metric_artifact=latest_metric,
             )
 
-            model_evaluation_report = model_evaluation_artifact.__dict__
+            model_evaluation_report = flatten_record(asdict(model_evaluation_artifact))
 
-            # Save the Report.
-            write_yaml_file(
-                self.model_evaluation_config.report_file_path, model_evaluation_report
+            # Save the Report as a single flat record.
+            write_jsonl_report(
+                self.model_evaluation_config.report_file_path, [model_evaluation_report]
             )
 
             logging.info(f"Model Evaluation Artifact: [{model_evaluation_artifact}].")
@@ -1,11 +1,14 @@
 import os
 import sys
 import shutil
+from typing import Optional
 from sensor.entity.artifact_entity import (
+    DataValidationArtifact,
     ModelPusherArtifact,
     ModelEvaluationArtifact,
 )
 from sensor.entity.config_entity import ModelPusherConfig
+from sensor.ml.model.compiled import COMPILED_MODEL_FILE_NAMES
 from sensor.exception import SensorException
 from sensor.logger import logging
 
@@ -20,15 +23,30 @@ class ModelPusher:
         self,
         model_evaluation_artifact: ModelEvaluationArtifact,
         model_pusher_config: ModelPusherConfig,
+        data_validation_artifact: Optional[DataValidationArtifact] = None,
     ):
         self.model_evaluation_artifact = model_evaluation_artifact
         self.model_pusher_config = model_pusher_config
+        self.data_validation_artifact = data_validation_artifact
 
     """
     A Pusher component consumes a trained model in SavedModel format 
     and produces the same SavedModel, along with versioning metadata.
     """
 
+    @staticmethod
+    def copy_compiled_model(src_model_path: str, dst_model_path: str) -> None:
+        """
+        Copy the compiled model files exported beside a model file, if any.
+        """
+        for file_name in COMPILED_MODEL_FILE_NAMES:
+            src = os.path.join(os.path.dirname(src_model_path), file_name)
+            if os.path.exists(src):
+                shutil.copy(
+                    src=src,
+                    dst=os.path.join(os.path.dirname(dst_model_path), file_name),
+                )
+
     def initiate_model_pusher(self) -> ModelPusherArtifact:
         try:
             logging.info(">> Model Pusher Component Started.")
@@ -39,11 +57,24 @@ class ModelPusher:
             model_file_path = self.model_pusher_config.model_file_path
             os.makedirs(os.path.dirname(model_file_path), exist_ok=True)
             shutil.copy(src=trained_model_path, dst=model_file_path)
+            self.copy_compiled_model(trained_model_path, model_file_path)
 
             # Save Model Directory.
+            # Copy beside the target and rename, so a serving ModelRegistry
+            # never observes a partially written model file.
             saved_model_path = self.model_pusher_config.saved_model_path
             os.makedirs(os.path.dirname(saved_model_path), exist_ok=True)
-            shutil.copy(src=trained_model_path, dst=saved_model_path)
+
+            # The reference sketch and the compiled model go first, so they are
+            # in place by the time a ModelRegistry picks up the model.
+            self.copy_compiled_model(trained_model_path, saved_model_path)
+            if self.data_validation_artifact is not None:
+                shutil.copy(
+                    src=self.data_validation_artifact.reference_sketch_file_path,
+                    dst=self.model_pusher_config.saved_reference_sketch_path,
+                )
+            shutil.copy(src=trained_model_path, dst=f"{saved_model_path}.tmp")
+            os.replace(f"{saved_model_path}.tmp", saved_model_path)
 
             model_pusher_artifact = ModelPusherArtifact(
                 saved_model_path=saved_model_path, model_file_path=model_file_path
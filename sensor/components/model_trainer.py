@@ -1,14 +1,35 @@
 import os
 import sys
+import shutil
+import numpy as np
+import xgboost as xgb
+from typing import Optional
 from xgboost import XGBClassifier
+from xgboost.callback import EarlyStopping
 from sensor.entity.artifact_entity import (
+    CostThresholdArtifact,
     DataTransformationArtifact,
     ModelTrainerArtifact,
 )
 from sensor.entity.config_entity import ModelTrainerConfig
-from sensor.ml.metric.classification_metric import get_classification_score
+from sensor.ml.metric.classification_metric import (
+    EARLY_STOPPING_METRICS,
+    f1,
+    f1_custom_metric,
+    get_classification_score,
+    get_cost_optimal_threshold,
+    get_threshold_cost,
+)
+from sensor.ml.model.compiled import export_compiled_model
 from sensor.ml.model.estimator import SensorModel
+from sensor.ml.model.external_memory import (
+    build_external_memory_matrices,
+    predict_in_batches,
+)
+from sensor.ml.model.tuner import HyperparameterTuner
 from sensor.utils import load_numpy_array_data, load_object, save_object
+from sensor.utils.artifact_cache import get_active_cache
+from sensor.utils.report import flatten_record, write_jsonl_report
 from sensor.exception import SensorException
 from sensor.logger import logging
 
@@ -30,35 +51,234 @@ class ModelTrainer:
         except Exception as e:
             raise SensorException(e, sys) from e
 
-    def perform_hyperparamter_tuning(self):
-        pass
+    def perform_hyperparamter_tuning(self) -> dict:
+        """
+        Search XGBoost parameters on the transformed training set.
+        :return: The best parameters, with `n_estimators` set to the number of
+        boosting rounds they needed, or an empty dict if tuning is disabled.
+        """
+        try:
+            if not self.model_trainer_config.tuning_enabled:
+                return {}
+            if self.model_trainer_config.out_of_core:
+                # Tuning trials hold their matrices in memory.
+                logging.info("Skipping hyperparameter tuning for out-of-core training.")
+                return {}
+
+            # Tuning workers read the arrays from disk, so pending writes go first.
+            artifact_cache = get_active_cache()
+            if artifact_cache is not None:
+                artifact_cache.flush()
+
+            tuner = HyperparameterTuner(
+                cache_dir=self.model_trainer_config.tuning_cache_dir,
+                num_trials=self.model_trainer_config.tuning_num_trials,
+                min_rounds=self.model_trainer_config.tuning_min_rounds,
+                max_rounds=self.model_trainer_config.tuning_max_rounds,
+                reduction_factor=self.model_trainer_config.tuning_reduction_factor,
+                early_stopping_rounds=self.model_trainer_config.tuning_early_stopping_rounds,
+                early_stopping_metric=self.model_trainer_config.early_stopping_metric,
+                n_jobs=self.model_trainer_config.tuning_n_jobs,
+            )
+            tuning_result = tuner.tune(
+                feature_file_path=self.data_transformation_artifact.transformed_train_file_path,
+                label_file_path=self.data_transformation_artifact.transformed_train_label_file_path,
+                valid_feature_file_path=self.data_transformation_artifact.transformed_valid_file_path,
+                valid_label_file_path=self.data_transformation_artifact.transformed_valid_label_file_path,
+                scale_pos_weight=self.data_transformation_artifact.scale_pos_weight,
+            )
+            write_jsonl_report(
+                self.model_trainer_config.tuning_report_file_path,
+                [flatten_record(trial) for trial in tuning_result.trials],
+            )
+            logging.info(
+                f"Best Parameters: [{tuning_result.best_params}] with "
+                f"{tuning_result.best_num_boost_round} rounds, "
+                f"validation F1 {tuning_result.best_score:.4f}."
+            )
+            return {
+                **tuning_result.best_params,
+                "n_estimators": tuning_result.best_num_boost_round,
+            }
+
+        except Exception as e:
+            raise SensorException(e, sys) from e
+
+    def get_classifier(self, params: Optional[dict] = None) -> XGBClassifier:
+        """
+        :param params: Overrides of the default XGBoost parameters.
+        :return: An unfitted XGBClassifier that stops early on the validation
+        split and discards the trees after its best iteration.
+        """
+        early_stopping_metric = self.model_trainer_config.early_stopping_metric
+        if early_stopping_metric not in EARLY_STOPPING_METRICS:
+            raise Exception(
+                f"Unknown early stopping metric [{early_stopping_metric}]; "
+                f"expected one of {EARLY_STOPPING_METRICS}."
+            )
+
+        # Left at 1.0 unless the "class_weight" resampling strategy is used.
+        return XGBClassifier(
+            **{
+                "n_estimators": self.model_trainer_config.n_estimators,
+                "tree_method": self.model_trainer_config.tree_method,
+                "n_jobs": self.model_trainer_config.n_jobs,
+                "scale_pos_weight": self.data_transformation_artifact.scale_pos_weight,
+                "eval_metric": f1 if early_stopping_metric == "f1" else "logloss",
+                "callbacks": [
+                    EarlyStopping(
+                        rounds=self.model_trainer_config.early_stopping_rounds,
+                        maximize=early_stopping_metric == "f1",
+                        save_best=True,
+                    )
+                ],
+                **(params or {}),
+            }
+        )
 
-    def train_model(self, X_train, y_train):
+    def train_model(
+        self, X_train, y_train, X_valid, y_valid, params: Optional[dict] = None
+    ):
+        """
+        Fit XGBoost on the training set and stop once the validation set, held
+        out before resampling, hasn't improved for `early_stopping_rounds` rounds.
+        :param params: Overrides of the default XGBoost parameters.
+        """
         try:
-            xgb_clf = XGBClassifier()
-            xgb_clf.fit(X_train, y_train)
+            xgb_clf = self.get_classifier(params)
+            xgb_clf.fit(
+                X_train,
+                y_train,
+                eval_set=[(X_valid, y_valid)],
+                verbose=False,
+            )
+            logging.info(
+                f"Early stopping on [{self.model_trainer_config.early_stopping_metric}] "
+                f"kept {xgb_clf.best_iteration + 1} of {xgb_clf.n_estimators} rounds."
+            )
             return xgb_clf
         except Exception as e:
             raise e
 
-    def initiate_model_trainer(self) -> ModelTrainerArtifact:
+    def train_model_out_of_core(self, params: Optional[dict] = None):
+        """
+        Same as `train_model`, but XGBoost reads the transformed training set
+        from disk in batches through an external-memory DMatrix, so training
+        memory doesn't grow with the number of rows.
+        :param params: Overrides of the default XGBoost parameters.
+        """
         try:
-            logging.info(">> Model Trainer Component Started.")
-            train_arr = load_numpy_array_data(
-                file_path=self.data_transformation_artifact.transformed_train_file_path
+            xgb_clf = self.get_classifier(params)
+            cache_dir = self.model_trainer_config.external_memory_cache_dir
+            dtrain, dvalid = build_external_memory_matrices(
+                feature_file_path=self.data_transformation_artifact.transformed_train_file_path,
+                label_file_path=self.data_transformation_artifact.transformed_train_label_file_path,
+                valid_feature_file_path=self.data_transformation_artifact.transformed_valid_file_path,
+                valid_label_file_path=self.data_transformation_artifact.transformed_valid_label_file_path,
+                batch_rows=self.model_trainer_config.external_memory_batch_rows,
+                cache_dir=cache_dir,
             )
-            test_arr = load_numpy_array_data(
-                file_path=self.data_transformation_artifact.transformed_test_file_path
+            try:
+                # The parameters the sklearn wrapper would pass to `xgb.train`.
+                booster = xgb.train(
+                    {**xgb_clf.get_xgb_params(), "eval_metric": "logloss"},
+                    dtrain,
+                    num_boost_round=xgb_clf.n_estimators,
+                    evals=[(dvalid, "validation_0")],
+                    custom_metric=(
+                        f1_custom_metric
+                        if self.model_trainer_config.early_stopping_metric == "f1"
+                        else None
+                    ),
+                    callbacks=xgb_clf.callbacks,
+                    verbose_eval=False,
+                )
+            finally:
+                del dtrain, dvalid
+                shutil.rmtree(cache_dir, ignore_errors=True)
+
+            xgb_clf.load_model(bytearray(booster.save_raw("ubj")))
+            logging.info(
+                f"Early stopping on [{self.model_trainer_config.early_stopping_metric}] "
+                f"kept {xgb_clf.best_iteration + 1} of {xgb_clf.n_estimators} rounds."
             )
-            X_train, y_train, X_test, y_test = (
-                train_arr[:, :-1],
-                train_arr[:, -1],
-                test_arr[:, :-1],
-                test_arr[:, -1],
+            return xgb_clf
+        except Exception as e:
+            raise e
+
+    def predict(self, model, features):
+        if self.model_trainer_config.out_of_core:
+            return predict_in_batches(
+                model, features, self.model_trainer_config.external_memory_batch_rows
             )
+        return model.predict(features)
 
-            model = self.train_model(X_train, y_train)
-            y_train_pred = model.predict(X_train)
+    def predict_proba(self, model, features) -> np.ndarray:
+        """
+        :return: The positive-class probability of each row.
+        """
+        if self.model_trainer_config.out_of_core:
+            y_prob = predict_in_batches(
+                model,
+                features,
+                self.model_trainer_config.external_memory_batch_rows,
+                method="predict_proba",
+            )
+        else:
+            y_prob = model.predict_proba(features)
+        return y_prob[:, 1]
+
+    def get_cost_threshold(self, model, X_valid, y_valid) -> CostThresholdArtifact:
+        """
+        Pick the decision threshold with the lowest misclassification cost on
+        the validation set, which unlike the training set isn't resampled and
+        so has the class balance the model will serve, and which keeps the
+        test set out of model selection.
+        """
+        try:
+            y_score = self.predict_proba(model, X_valid)
+            costs = (
+                self.model_trainer_config.false_positive_cost,
+                self.model_trainer_config.false_negative_cost,
+            )
+            default_artifact = get_threshold_cost(y_valid, y_score, 0.5, *costs)
+            if not self.model_trainer_config.cost_threshold_enabled:
+                return default_artifact
+
+            threshold_artifact = get_cost_optimal_threshold(y_valid, y_score, *costs)
+            logging.info(
+                f"Cost-optimal threshold [{threshold_artifact.threshold:.4f}] costs "
+                f"{threshold_artifact.cost:.0f} on the validation set, against "
+                f"{default_artifact.cost:.0f} at 0.5."
+            )
+            return threshold_artifact
+        except Exception as e:
+            raise SensorException(e, sys) from e
+
+    def initiate_model_trainer(self) -> ModelTrainerArtifact:
+        try:
+            logging.info(">> Model Trainer Component Started.")
+            # Memory-mapped, so the arrays are paged in as training reads them.
+            X_train, y_train, X_valid, y_valid, X_test, y_test = (
+                load_numpy_array_data(file_path=file_path, mmap_mode="r")
+                for file_path in (
+                    self.data_transformation_artifact.transformed_train_file_path,
+                    self.data_transformation_artifact.transformed_train_label_file_path,
+                    self.data_transformation_artifact.transformed_valid_file_path,
+                    self.data_transformation_artifact.transformed_valid_label_file_path,
+                    self.data_transformation_artifact.transformed_test_file_path,
+                    self.data_transformation_artifact.transformed_test_label_file_path,
+                )
+            )
+
+            best_params = self.perform_hyperparamter_tuning()
+            if self.model_trainer_config.out_of_core:
+                model = self.train_model_out_of_core(params=best_params)
+            else:
+                model = self.train_model(
+                    X_train, y_train, X_valid, y_valid, params=best_params
+                )
+            y_train_pred = self.predict(model, X_train)
 
             classification_train_metric = get_classification_score(
                 y_true=y_train, y_pred=y_train_pred
@@ -72,7 +292,7 @@ class ModelTrainer:
                     "The trained model is unable to provide the expected accuracy."
                 )
 
-            y_test_pred = model.predict(X_test)
+            y_test_pred = self.predict(model, X_test)
             classification_test_metric = get_classification_score(
                 y_true=y_test, y_pred=y_test_pred
             )
@@ -97,15 +317,23 @@ class ModelTrainer:
             )
             os.makedirs(model_dir_path, exist_ok=True)
 
-            sensor_model = SensorModel(preprocessor=preprocessor, model=model)
+            threshold_artifact = self.get_cost_threshold(model, X_valid, y_valid)
+            sensor_model = SensorModel(
+                preprocessor=preprocessor,
+                model=model,
+                threshold=threshold_artifact.threshold,
+            )
             save_object(
                 self.model_trainer_config.trained_model_file_path, obj=sensor_model
             )
+            export_compiled_model(sensor_model, model_dir_path)
 
             model_trainer_artifact = ModelTrainerArtifact(
                 trained_model_file_path=self.model_trainer_config.trained_model_file_path,
                 train_metric_artifact=classification_train_metric,
                 test_metric_artifact=classification_test_metric,
+                best_iteration=model.best_iteration,
+                threshold_artifact=threshold_artifact,
             )
 
             logging.info(f"Model Trainer Artifact: [{model_trainer_artifact}].")
@@ -1,6 +1,8 @@
 # Database Constants.
 DATABASE_NAME = "sensordb"
 COLLECTION_NAME = "vehicles"
+MONGO_CURSOR_BATCH_SIZE = 10000
+MONGO_EXPORT_CHUNK_SIZE = 100000
 
 # Environment Variable Constants.
 MONGO_DB_URL = "MONGO_DB_URL"
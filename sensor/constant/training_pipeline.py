@@ -2,17 +2,31 @@ import os
 from sensor.constant.constant import COLLECTION_NAME
 
 SAVED_MODEL_DIR = os.path.join("saved_models")
+FEATURE_STORE_DIR: str = "feature_store"
 
 TARGET_COLUMN = "class"
 PIPELINE_NAME: str = "sensor-fault-detection-pipeline"
 ARTIFACT_DIR: str = "artifact"
+# Kept across runs; only the entries for the latest training data are retained.
+TUNING_CACHE_DIR: str = os.path.join(ARTIFACT_DIR, "tuning_cache")
+IN_MEMORY_ARTIFACT_HANDOFF: bool = True
+# Stream the data through transformation and training instead of loading it whole.
+OUT_OF_CORE_TRAINING: bool = False
+
+# Data Artifact Format Constants: "parquet", "feather" or "csv".
+DATA_ARTIFACT_FORMAT: str = "parquet"
+DATA_ARTIFACT_EXPORT_CSV: bool = False
 
 # Filename Constants.
-FILE_NAME: str = "sensor.csv"
-TRAIN_FILE_NAME: str = "train.csv"
-TEST_FILE_NAME: str = "test.csv"
+FILE_NAME: str = f"sensor.{DATA_ARTIFACT_FORMAT}"
+TRAIN_FILE_NAME: str = f"train.{DATA_ARTIFACT_FORMAT}"
+TEST_FILE_NAME: str = f"test.{DATA_ARTIFACT_FORMAT}"
+VALID_FILE_NAME: str = f"valid.{DATA_ARTIFACT_FORMAT}"
 PREPROCSSING_OBJECT_FILE_NAME = "preprocessing.pkl"
 MODEL_FILE_NAME = "model.pkl"
+COMPILED_PREPROCESSOR_FILE_NAME = "preprocessor.npz"
+COMPILED_BOOSTER_FILE_NAME = "model.ubj"
+REFERENCE_SKETCH_FILE_NAME = "reference_sketch.npz"
 SCHEMA_FILE_PATH = os.path.join("config", "schema.yaml")
 
 # Data Ingestion Constants.
@@ -21,18 +35,43 @@ DATA_INGESTION_DIR_NAME: str = "data_ingestion"
 DATA_INGESTION_FEATURE_STORE_DIR: str = "feature_store"
 DATA_INGESTION_INGESTED_DIR: str = "ingested"
 DATA_INGESTION_TRAIN_TEST_SPLIT_RATIO: float = 0.2
+DATA_INGESTION_NUM_PARTITIONS: int = 4
+DATA_INGESTION_INCREMENTAL: bool = True
+# ObjectIds only roughly increase, so each run re-reads this far behind the watermark.
+DATA_INGESTION_WATERMARK_OVERLAP_SECONDS: int = 300
 
 # Data Validation Constants.
 DATA_VALIDATION_DIR_NAME: str = "data_validation"
 DATA_VALIDATION_VALID_DIR: str = "validated"
 DATA_VALIDATION_INVALID_DIR: str = "invalid"
 DATA_VALIDATION_DRIFT_REPORT_DIR: str = "drift_report"
-DATA_VALIDATION_DRIFT_REPORT_FILE_NAME: str = "report.yaml"
+DATA_VALIDATION_DRIFT_REPORT_FILE_NAME: str = "report.jsonl"
+DATA_VALIDATION_DRIFT_METHOD: str = "ks"
+DATA_VALIDATION_DRIFT_N_JOBS: int = 1
+DATA_VALIDATION_PSI_BINS: int = 10
+DATA_VALIDATION_PSI_THRESHOLD: float = 0.2
+DATA_VALIDATION_NULL_RATE_THRESHOLD: float = 0.1
+DATA_VALIDATION_REFERENCE_SKETCH_DIR: str = "reference_sketch"
 
 # Data Transformation Constants.
 DATA_TRANSFORMATION_DIR_NAME: str = "data_transformation"
 DATA_TRANSFORMATION_TRANSFORMED_DATA_DIR: str = "transformed"
 DATA_TRANSFORMATION_TRANSFORMED_OBJECT_DIR: str = "transformed_object"
+DATA_TRANSFORMATION_RESAMPLING_STRATEGY: str = "smote_tomek"
+DATA_TRANSFORMATION_RESAMPLING_N_JOBS: int = -1
+DATA_TRANSFORMATION_RESAMPLING_REPORT_NAME: str = "resampling_report.jsonl"
+DATA_TRANSFORMATION_RESAMPLE_TEST: bool = False
+# Training rows held out before resampling, for early stopping and tuning.
+DATA_TRANSFORMATION_VALID_FRACTION: float = 0.1
+DATA_TRANSFORMATION_FEATURE_DTYPE: str = "float32"
+DATA_TRANSFORMATION_LABEL_DTYPE: str = "uint8"
+DATA_TRANSFORMATION_LABEL_FILE_SUFFIX: str = "_label.npy"
+DATA_TRANSFORMATION_BATCH_ROWS: int = 65536
+# "exact" Imputer + RobustScaler, or "sketch" for quantile-sketch statistics.
+# Out-of-core runs always use the sketches.
+DATA_TRANSFORMATION_PREPROCESSOR: str = "exact"
+DATA_TRANSFORMATION_SKETCH_RELATIVE_ACCURACY: float = 0.005
+DATA_TRANSFORMATION_SKETCH_N_JOBS: int = 1
 
 # Model Trainer Constants.
 MODEL_TRAINER_DIR_NAME: str = "model_trainer"
@@ -40,12 +79,62 @@ MODEL_TRAINER_TRAINED_MODEL_DIR: str = "trained_model"
 MODEL_TRAINER_TRAINED_MODEL_NAME: str = "model.pkl"
 MODEL_TRAINER_EXPECTED_SCORE: float = 0.6
 MODEL_TRAINER_OVERFITTING_UNDERFITTING_THRESHOLD: float = 0.05
+MODEL_TRAINER_TREE_METHOD: str = "hist"
+MODEL_TRAINER_N_JOBS: int = os.cpu_count() or 1
+MODEL_TRAINER_N_ESTIMATORS: int = 1000
+MODEL_TRAINER_EARLY_STOPPING_ROUNDS: int = 20
+MODEL_TRAINER_EARLY_STOPPING_METRIC: str = "logloss"
+MODEL_TRAINER_COST_THRESHOLD_ENABLED: bool = True
+# Costs of the APS challenge: a false positive sends a truck for an
+# unnecessary check, a false negative misses a failing APS.
+MODEL_TRAINER_FALSE_POSITIVE_COST: float = 10.0
+MODEL_TRAINER_FALSE_NEGATIVE_COST: float = 500.0
+MODEL_TRAINER_EXTERNAL_MEMORY_BATCH_ROWS: int = 65536
+MODEL_TRAINER_EXTERNAL_MEMORY_CACHE_DIR: str = "external_memory_cache"
+# Tuning runs on every training job, /train included: with these defaults up to
+# 27 + 9 + 3 + 1 trials of 30, 90, 270 and 810 rounds, as many boosting rounds
+# as four full 810-round fits, unless trials stop early or are cached.
+MODEL_TRAINER_TUNING_ENABLED: bool = True
+MODEL_TRAINER_TUNING_NUM_TRIALS: int = 27
+MODEL_TRAINER_TUNING_MIN_ROUNDS: int = 30
+MODEL_TRAINER_TUNING_MAX_ROUNDS: int = 810
+MODEL_TRAINER_TUNING_REDUCTION_FACTOR: int = 3
+MODEL_TRAINER_TUNING_EARLY_STOPPING_ROUNDS: int = 20
+# Cores shared by all trials; half, leaving the rest to a server on the same host.
+MODEL_TRAINER_TUNING_N_JOBS: int = max(1, (os.cpu_count() or 1) // 2)
+MODEL_TRAINER_TUNING_REPORT_NAME: str = "tuning_report.jsonl"
 
 # Model Evaluation Constants.
 MODEL_EVALUATION_DIR_NAME: str = "model_evaluation"
 MODEL_EVALUATION_CHANGED_THRESHOLD_SCORE: float = 0.02
-MODEL_EVALUATION_REPORT_NAME = "report.yaml"
+MODEL_EVALUATION_REPORT_NAME = "report.jsonl"
 
 # Model Pusher Constants.
 MODEL_PUSHER_DIR_NAME = "model_pusher"
 MODEL_PUSHER_SAVED_MODEL_DIR = SAVED_MODEL_DIR
+
+# Model Registry Constants.
+MODEL_REGISTRY_POLL_INTERVAL_SECONDS: float = 5.0
+# Share of prediction rows folded into the drift counts, off the request path.
+MODEL_REGISTRY_DRIFT_SAMPLE_RATE: float = 0.1
+MODEL_REGISTRY_DRIFT_MAX_PENDING_BATCHES: int = 64
+# PSI over fewer sampled rows than this is noise; no drift is reported below it.
+MODEL_REGISTRY_DRIFT_MIN_ROWS: int = 1000
+
+# Prediction Pipeline Constants.
+PREDICTION_CHUNK_SIZE: int = 50000
+PREDICTION_EXECUTOR_TYPE: str = "thread"
+PREDICTION_MAX_WORKERS: int = os.cpu_count() or 1
+MICRO_BATCH_MAX_SIZE: int = 256
+MICRO_BATCH_MAX_WAIT_MS: float = 5.0
+
+# Serving Constants.
+SERVING_HOST: str = "0.0.0.0"
+SERVING_PORT: int = 8080
+SERVING_WORKERS: int = 1
+
+# Training Job Constants.
+# Held while a job trains, so only one process at a time starts the pipeline.
+TRAINING_JOB_LOCK_FILE_PATH: str = "training.lock"
+# The latest job's status, shared by every server process.
+TRAINING_JOB_STATUS_FILE_PATH: str = "training_status.json"
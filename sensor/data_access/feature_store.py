@@ -0,0 +1,100 @@
+import os
+import sys
+import glob
+import pandas as pd
+import pyarrow.parquet as pq
+from typing import List, Optional, Set
+
+from sensor.data_access.sensor_data import ID_COLUMN
+from sensor.exception import SensorException
+from sensor.logger import logging
+
+PART_FILE_PREFIX = "part-"
+PART_FILE_SUFFIX = ".parquet"
+
+
+class FeatureStore:
+    """
+    The Feature store persists ingested records across pipeline runs as
+    Parquet part files. Each part is named after the largest MongoDB `_id` it
+    covers, so the newest part name doubles as the ingestion watermark. Parts
+    keep the `_id` of every record, so a re-read of documents already stored
+    can be recognised; `read` leaves it out.
+    """
+
+    def __init__(self, feature_store_dir: str):
+        try:
+            self.feature_store_dir = feature_store_dir
+            os.makedirs(self.feature_store_dir, exist_ok=True)
+        except Exception as e:
+            raise SensorException(e, sys) from e
+
+    def get_part_file_paths(self) -> List[str]:
+        # ObjectId hex strings have a fixed width, so names sort in `_id` order.
+        pattern = os.path.join(
+            self.feature_store_dir, f"{PART_FILE_PREFIX}*{PART_FILE_SUFFIX}"
+        )
+        return sorted(glob.glob(pattern))
+
+    def get_watermark(self) -> Optional[str]:
+        """
+        :return: The largest `_id` already in the store, or None if it is empty.
+        """
+        try:
+            part_file_paths = self.get_part_file_paths()
+            if not part_file_paths:
+                return None
+            file_name = os.path.basename(part_file_paths[-1])
+            return file_name[len(PART_FILE_PREFIX) : -len(PART_FILE_SUFFIX)]
+        except Exception as e:
+            raise SensorException(e, sys) from e
+
+    def get_ids_since(self, since: str) -> Optional[Set[str]]:
+        """
+        :return: The `_id` of every stored record from `since` on, or None if a
+        part that may hold such records was written without `_id`.
+        """
+        try:
+            ids = set()
+            for part_file_path in self.get_part_file_paths():
+                # A part holds no `_id` above the one it is named after.
+                file_name = os.path.basename(part_file_path)
+                if file_name[len(PART_FILE_PREFIX) : -len(PART_FILE_SUFFIX)] < since:
+                    continue
+                if ID_COLUMN not in pq.read_schema(part_file_path).names:
+                    return None
+                part_ids = pd.read_parquet(part_file_path, columns=[ID_COLUMN])
+                ids.update(part_ids[ID_COLUMN])
+            return ids
+        except Exception as e:
+            raise SensorException(e, sys) from e
+
+    def append(self, dataframe: pd.DataFrame, watermark: str) -> str:
+        """
+        Write `dataframe` as a new part and advance the watermark to `watermark`.
+        The part is renamed into place, so a crashed run never leaves a partial part.
+        """
+        try:
+            part_file_path = os.path.join(
+                self.feature_store_dir,
+                f"{PART_FILE_PREFIX}{watermark}{PART_FILE_SUFFIX}",
+            )
+            dataframe.to_parquet(f"{part_file_path}.tmp", index=False)
+            os.replace(f"{part_file_path}.tmp", part_file_path)
+            logging.info(
+                f"Appended {len(dataframe)} records to the Feature Store up to [{watermark}]."
+            )
+            return part_file_path
+        except Exception as e:
+            raise SensorException(e, sys) from e
+
+    def read(self) -> pd.DataFrame:
+        try:
+            part_file_paths = self.get_part_file_paths()
+            if not part_file_paths:
+                return pd.DataFrame()
+            return pd.concat(
+                [pd.read_parquet(path) for path in part_file_paths], ignore_index=True
+            ).drop(columns=[ID_COLUMN], errors="ignore")
+        except Exception as e:
+            raise SensorException(e, sys) from e
@@ -1,13 +1,24 @@
 import sys
 import json
+import itertools
 import pandas as pd
 import numpy as np
-from typing import Optional
+from bson import ObjectId
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterable, Iterator, List, Optional
 
 from sensor.configuration.mongoDB_connection import MongoDBClient
-from sensor.constant.constant import DATABASE_NAME
+from sensor.constant.constant import (
+    DATABASE_NAME,
+    MONGO_CURSOR_BATCH_SIZE,
+    MONGO_EXPORT_CHUNK_SIZE,
+)
+from sensor.utils.schema_validator import read_schema_config
 from sensor.exception import SensorException
 
+NA_VALUE = "na"
+ID_COLUMN = "_id"
+
 
 class SensorData:
     """
@@ -17,9 +28,107 @@ class SensorData:
     def __init__(self):
         try:
             self.mongo_client = MongoDBClient(database_name=DATABASE_NAME)
+            self._schema_config = read_schema_config()
+
+            # Schema columns that survive the drop, split by decoded type.
+            drop_columns = set(self._schema_config["drop_columns"])
+            self.columns = [
+                column
+                for column_type in self._schema_config["columns"]
+                for column in column_type
+                if column not in drop_columns
+            ]
+            self.categorical_columns = [
+                column
+                for column_type in self._schema_config["columns"]
+                for column, dtype in column_type.items()
+                if dtype == "category" and column not in drop_columns
+            ]
+            self.numerical_columns = [
+                column
+                for column in self.columns
+                if column not in self.categorical_columns
+            ]
+        except Exception as e:
+            raise SensorException(e, sys) from e
+
+    def _get_collection(self, collection_name: str, database_name: Optional[str]):
+        if database_name is None:
+            return self.mongo_client.database[collection_name]
+        return self.mongo_client.client[database_name][collection_name]
+
+    def _find(
+        self,
+        collection_name: str,
+        database_name: Optional[str],
+        query: Optional[dict] = None,
+        include_id: bool = False,
+    ):
+        """
+        Open a cursor that leaves the schema's drop columns, and unless
+        `include_id` is set `_id`, on the server.
+        """
+        collection = self._get_collection(collection_name, database_name)
+        projection = {} if include_id else {ID_COLUMN: 0}
+        projection.update({column: 0 for column in self._schema_config["drop_columns"]})
+        return collection.find(
+            query or {}, projection=projection, batch_size=MONGO_CURSOR_BATCH_SIZE
+        )
+
+    def get_latest_id(
+        self, collection_name: str, database_name: Optional[str] = None
+    ) -> Optional[ObjectId]:
+        """
+        :return: The largest `_id` in the collection, or None if it is empty.
+        """
+        try:
+            collection = self._get_collection(collection_name, database_name)
+            cursor = collection.find({}, projection={"_id": 1}).sort("_id", -1).limit(1)
+            document = next(cursor, None)
+            return None if document is None else document["_id"]
         except Exception as e:
             raise SensorException(e, sys) from e
 
+    @staticmethod
+    def _get_partition_queries(
+        collection, num_partitions: int, query: Optional[dict] = None
+    ) -> List[dict]:
+        """
+        Split the documents matching `query` into contiguous `_id` ranges of
+        roughly equal size. The boundaries are found by skipping along the
+        `_id` index.
+        """
+        query = query or {}
+        count = (
+            collection.count_documents(query)
+            if query
+            else collection.estimated_document_count()
+        )
+        bounds = []
+        for i in range(1, num_partitions):
+            cursor = (
+                collection.find(query, projection={"_id": 1})
+                .sort("_id", 1)
+                .skip(i * count // num_partitions)
+                .limit(1)
+            )
+            document = next(cursor, None)
+            if document is not None and document["_id"] not in bounds:
+                bounds.append(document["_id"])
+
+        queries = []
+        for lower, upper in zip([None] + bounds, bounds + [None]):
+            id_range = {}
+            if lower is not None:
+                id_range["$gte"] = lower
+            if upper is not None:
+                id_range["$lt"] = upper
+            partition_query = {"_id": id_range} if id_range else {}
+            if query and partition_query:
+                partition_query = {"$and": [query, partition_query]}
+            queries.append(partition_query or query)
+        return queries
+
     def save_csv_file(
         self, file_path, collection_name: str, database_name: Optional[str] = None
     ):
@@ -27,34 +136,137 @@ class SensorData:
             data_frame = pd.read_csv(file_path)
             data_frame.reset_index(drop=True, inplace=True)
             records = list(json.loads(data_frame.T.to_json()).values())
-            if database_name is None:
-                collection = self.mongo_client.database[collection_name]
-            else:
-                collection = self.mongo_client[database_name][collection_name]
-
+            collection = self._get_collection(collection_name, database_name)
             collection.insert_many(records)
             return len(records)
 
         except Exception as e:
             raise SensorException(e, sys) from e
 
+    def _decode_documents(
+        self,
+        documents: Iterable[dict],
+        capacity: int,
+        dtype=np.float32,
+        include_id: bool = False,
+    ) -> pd.DataFrame:
+        """
+        Decode documents straight into a preallocated `dtype` block, mapping
+        "na" and missing fields to NaN. The block grows if `capacity` is exceeded.
+        With `include_id`, the `_id` hex strings lead as the first column.
+        """
+        capacity = max(capacity, 1)
+        numerical = np.empty((capacity, len(self.numerical_columns)), dtype=dtype)
+        categorical = np.empty((capacity, len(self.categorical_columns)), dtype=object)
+        ids = []
+
+        num_rows = 0
+        for document in documents:
+            if num_rows == capacity:
+                capacity *= 2
+                numerical = _resize_rows(numerical, capacity)
+                categorical = _resize_rows(categorical, capacity)
+
+            get = document.get
+            values = [get(column) for column in self.numerical_columns]
+            # Numbers and numeric strings alike are parsed by NumPy on assignment.
+            numerical[num_rows] = [
+                np.nan if value is None or value == NA_VALUE else value
+                for value in values
+            ]
+            categorical[num_rows] = [get(column) for column in self.categorical_columns]
+            if include_id:
+                ids.append(str(document[ID_COLUMN]))
+            num_rows += 1
+
+        df = pd.DataFrame(
+            numerical[:num_rows], columns=self.numerical_columns, copy=False
+        )
+        for i, column in enumerate(self.categorical_columns):
+            df.insert(self.columns.index(column), column, categorical[:num_rows, i])
+        if include_id:
+            df.insert(0, ID_COLUMN, ids)
+        return df
+
+    def iter_collection_chunks(
+        self,
+        collection_name: str,
+        database_name: Optional[str] = None,
+        chunk_size: int = MONGO_EXPORT_CHUNK_SIZE,
+        dtype=np.float32,
+    ) -> Iterator[pd.DataFrame]:
+        """
+        Stream the MongoDB records as typed Dataframes of at most `chunk_size` rows.
+        """
+        try:
+            cursor = self._find(collection_name, database_name)
+            while True:
+                df = self._decode_documents(
+                    itertools.islice(cursor, chunk_size), chunk_size, dtype=dtype
+                )
+                if len(df) == 0:
+                    break
+                yield df
+                if len(df) < chunk_size:
+                    break
+
+        except Exception as e:
+            raise SensorException(e, sys) from e
+
     def export_collection_as_dataframe(
-        self, collection_name: str, database_name: Optional[str] = None
+        self,
+        collection_name: str,
+        database_name: Optional[str] = None,
+        dtype=np.float32,
+        num_partitions: int = 1,
+        query: Optional[dict] = None,
+        include_id: bool = False,
     ) -> pd.DataFrame:
         try:
             """
             Export all the MongoDB records as a pandas Dataframe and return the Dataframe.
+            The `_id` and schema drop columns are excluded by the server. With
+            `num_partitions` > 1, `_id` ranges are read concurrently over the shared
+            client's connection pool and reassembled in `_id` order. `query`
+            restricts the export, e.g. to documents above an ingestion watermark.
+            `include_id` keeps `_id` as a leading column of hex strings.
             """
-            if database_name is None:
-                collection = self.mongo_client.database[collection_name]
-            else:
-                collection = self.mongo_client[database_name][collection_name]
+            collection = self._get_collection(collection_name, database_name)
+            count = (
+                collection.count_documents(query)
+                if query
+                else collection.estimated_document_count()
+            )
+            if num_partitions <= 1:
+                cursor = self._find(
+                    collection_name, database_name, query=query, include_id=include_id
+                )
+                return self._decode_documents(
+                    cursor, count, dtype=dtype, include_id=include_id
+                )
+
+            queries = self._get_partition_queries(collection, num_partitions, query)
 
-            df = pd.DataFrame(list(collection.find()))
-            if "_id" in df.columns.to_list():
-                df = df.drop(columns=["_id"], axis=1)
-            df.replace({"na": np.nan}, inplace=True)
-            return df
+            def read_partition(query: dict) -> pd.DataFrame:
+                cursor = self._find(
+                    collection_name, database_name, query=query, include_id=include_id
+                )
+                return self._decode_documents(
+                    cursor,
+                    count // len(queries) + 1,
+                    dtype=dtype,
+                    include_id=include_id,
+                )
+
+            with ThreadPoolExecutor(max_workers=len(queries)) as executor:
+                frames = list(executor.map(read_partition, queries))
+            return pd.concat(frames, ignore_index=True)
 
         except Exception as e:
             raise SensorException(e, sys) from e
+
+
+def _resize_rows(array: np.ndarray, num_rows: int) -> np.ndarray:
+    resized = np.empty((num_rows,) + array.shape[1:], dtype=array.dtype)
+    resized[: len(array)] = array
+    return resized
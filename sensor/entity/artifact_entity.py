@@ -15,6 +15,7 @@ class DataValidationArtifact:
     invalid_train_file_path: str
     invalid_test_file_path: str
     drift_report_file_path: str
+    reference_sketch_file_path: str
 
 
 @dataclass
@@ -22,6 +23,12 @@ class DataTransformationArtifact:
     transformed_object_file_path: str
     transformed_train_file_path: str
     transformed_test_file_path: str
+    transformed_train_label_file_path: str
+    transformed_test_label_file_path: str
+    transformed_valid_file_path: str
+    transformed_valid_label_file_path: str
+    resampling_report_file_path: str
+    scale_pos_weight: float
 
 
 @dataclass
@@ -31,11 +38,21 @@ class ClassificationMetricArtifact:
     recall_score: float
 
 
+@dataclass
+class CostThresholdArtifact:
+    threshold: float
+    cost: float
+    false_positives: int
+    false_negatives: int
+
+
 @dataclass
 class ModelTrainerArtifact:
     trained_model_file_path: str
     train_metric_artifact: ClassificationMetricArtifact
     test_metric_artifact: ClassificationMetricArtifact
+    best_iteration: int
+    threshold_artifact: CostThresholdArtifact
 
 
 @dataclass
@@ -9,6 +9,10 @@ class TrainingPipelineConfig:
         self.pipeline_name: str = training_pipeline.PIPELINE_NAME
         self.artifact_dir: str = os.path.join(training_pipeline.ARTIFACT_DIR, timestamp)
         self.timestamp: str = timestamp
+        self.in_memory_artifact_handoff: bool = (
+            training_pipeline.IN_MEMORY_ARTIFACT_HANDOFF
+        )
+        self.out_of_core_training: bool = training_pipeline.OUT_OF_CORE_TRAINING
 
 
 class DataIngestionConfig:
@@ -36,6 +40,15 @@ class DataIngestionConfig:
             training_pipeline.DATA_INGESTION_TRAIN_TEST_SPLIT_RATIO
         )
         self.collection_name: str = training_pipeline.DATA_INGESTION_COLLECTION_NAME
+        self.export_csv: bool = training_pipeline.DATA_ARTIFACT_EXPORT_CSV
+        self.num_partitions: int = training_pipeline.DATA_INGESTION_NUM_PARTITIONS
+        self.incremental: bool = training_pipeline.DATA_INGESTION_INCREMENTAL
+        self.watermark_overlap_seconds: int = (
+            training_pipeline.DATA_INGESTION_WATERMARK_OVERLAP_SECONDS
+        )
+        self.persisted_feature_store_dir: str = os.path.join(
+            training_pipeline.FEATURE_STORE_DIR, self.collection_name
+        )
 
 
 class DataValidationConfig:
@@ -67,6 +80,18 @@ class DataValidationConfig:
             training_pipeline.DATA_VALIDATION_DRIFT_REPORT_DIR,
             training_pipeline.DATA_VALIDATION_DRIFT_REPORT_FILE_NAME,
         )
+        self.drift_method: str = training_pipeline.DATA_VALIDATION_DRIFT_METHOD
+        self.drift_n_jobs: int = training_pipeline.DATA_VALIDATION_DRIFT_N_JOBS
+        self.psi_bins: int = training_pipeline.DATA_VALIDATION_PSI_BINS
+        self.psi_threshold: float = training_pipeline.DATA_VALIDATION_PSI_THRESHOLD
+        self.null_rate_threshold: float = (
+            training_pipeline.DATA_VALIDATION_NULL_RATE_THRESHOLD
+        )
+        self.reference_sketch_file_path: str = os.path.join(
+            self.data_validation_dir,
+            training_pipeline.DATA_VALIDATION_REFERENCE_SKETCH_DIR,
+            training_pipeline.REFERENCE_SKETCH_FILE_NAME,
+        )
 
 
 class DataTransformationConfig:
@@ -78,18 +103,64 @@ class DataTransformationConfig:
         self.transformed_train_file_path: str = os.path.join(
             self.data_transformation_dir,
             training_pipeline.DATA_TRANSFORMATION_TRANSFORMED_DATA_DIR,
-            training_pipeline.TRAIN_FILE_NAME.replace("csv", "npy"),
+            os.path.splitext(training_pipeline.TRAIN_FILE_NAME)[0] + ".npy",
         )
         self.transformed_test_file_path: str = os.path.join(
             self.data_transformation_dir,
             training_pipeline.DATA_TRANSFORMATION_TRANSFORMED_DATA_DIR,
-            training_pipeline.TEST_FILE_NAME.replace("csv", "npy"),
+            os.path.splitext(training_pipeline.TEST_FILE_NAME)[0] + ".npy",
+        )
+        self.transformed_valid_file_path: str = os.path.join(
+            self.data_transformation_dir,
+            training_pipeline.DATA_TRANSFORMATION_TRANSFORMED_DATA_DIR,
+            os.path.splitext(training_pipeline.VALID_FILE_NAME)[0] + ".npy",
+        )
+        self.transformed_train_label_file_path: str = os.path.join(
+            self.data_transformation_dir,
+            training_pipeline.DATA_TRANSFORMATION_TRANSFORMED_DATA_DIR,
+            os.path.splitext(training_pipeline.TRAIN_FILE_NAME)[0]
+            + training_pipeline.DATA_TRANSFORMATION_LABEL_FILE_SUFFIX,
+        )
+        self.transformed_test_label_file_path: str = os.path.join(
+            self.data_transformation_dir,
+            training_pipeline.DATA_TRANSFORMATION_TRANSFORMED_DATA_DIR,
+            os.path.splitext(training_pipeline.TEST_FILE_NAME)[0]
+            + training_pipeline.DATA_TRANSFORMATION_LABEL_FILE_SUFFIX,
+        )
+        self.transformed_valid_label_file_path: str = os.path.join(
+            self.data_transformation_dir,
+            training_pipeline.DATA_TRANSFORMATION_TRANSFORMED_DATA_DIR,
+            os.path.splitext(training_pipeline.VALID_FILE_NAME)[0]
+            + training_pipeline.DATA_TRANSFORMATION_LABEL_FILE_SUFFIX,
         )
         self.transformed_object_file_path: str = os.path.join(
             self.data_transformation_dir,
             training_pipeline.DATA_TRANSFORMATION_TRANSFORMED_OBJECT_DIR,
             training_pipeline.PREPROCSSING_OBJECT_FILE_NAME,
         )
+        self.resampling_strategy: str = (
+            training_pipeline.DATA_TRANSFORMATION_RESAMPLING_STRATEGY
+        )
+        self.resampling_n_jobs: int = (
+            training_pipeline.DATA_TRANSFORMATION_RESAMPLING_N_JOBS
+        )
+        self.resample_test: bool = training_pipeline.DATA_TRANSFORMATION_RESAMPLE_TEST
+        self.valid_fraction: float = (
+            training_pipeline.DATA_TRANSFORMATION_VALID_FRACTION
+        )
+        self.feature_dtype: str = training_pipeline.DATA_TRANSFORMATION_FEATURE_DTYPE
+        self.label_dtype: str = training_pipeline.DATA_TRANSFORMATION_LABEL_DTYPE
+        self.out_of_core: bool = training_pipeline.OUT_OF_CORE_TRAINING
+        self.batch_rows: int = training_pipeline.DATA_TRANSFORMATION_BATCH_ROWS
+        self.preprocessor: str = training_pipeline.DATA_TRANSFORMATION_PREPROCESSOR
+        self.sketch_relative_accuracy: float = (
+            training_pipeline.DATA_TRANSFORMATION_SKETCH_RELATIVE_ACCURACY
+        )
+        self.sketch_n_jobs: int = training_pipeline.DATA_TRANSFORMATION_SKETCH_N_JOBS
+        self.resampling_report_file_path: str = os.path.join(
+            self.data_transformation_dir,
+            training_pipeline.DATA_TRANSFORMATION_RESAMPLING_REPORT_NAME,
+        )
 
 
 class ModelTrainerConfig:
@@ -107,6 +178,47 @@ class ModelTrainerConfig:
         self.overfitting_underfitting_threshold = (
             training_pipeline.MODEL_TRAINER_OVERFITTING_UNDERFITTING_THRESHOLD
         )
+        self.tree_method: str = training_pipeline.MODEL_TRAINER_TREE_METHOD
+        self.n_jobs: int = training_pipeline.MODEL_TRAINER_N_JOBS
+        self.n_estimators: int = training_pipeline.MODEL_TRAINER_N_ESTIMATORS
+        self.early_stopping_rounds: int = (
+            training_pipeline.MODEL_TRAINER_EARLY_STOPPING_ROUNDS
+        )
+        self.early_stopping_metric: str = (
+            training_pipeline.MODEL_TRAINER_EARLY_STOPPING_METRIC
+        )
+        self.cost_threshold_enabled: bool = (
+            training_pipeline.MODEL_TRAINER_COST_THRESHOLD_ENABLED
+        )
+        self.false_positive_cost: float = (
+            training_pipeline.MODEL_TRAINER_FALSE_POSITIVE_COST
+        )
+        self.false_negative_cost: float = (
+            training_pipeline.MODEL_TRAINER_FALSE_NEGATIVE_COST
+        )
+        self.out_of_core: bool = training_pipeline.OUT_OF_CORE_TRAINING
+        self.external_memory_batch_rows: int = (
+            training_pipeline.MODEL_TRAINER_EXTERNAL_MEMORY_BATCH_ROWS
+        )
+        self.external_memory_cache_dir: str = os.path.join(
+            self.model_trainer_dir,
+            training_pipeline.MODEL_TRAINER_EXTERNAL_MEMORY_CACHE_DIR,
+        )
+        self.tuning_enabled: bool = training_pipeline.MODEL_TRAINER_TUNING_ENABLED
+        self.tuning_cache_dir: str = training_pipeline.TUNING_CACHE_DIR
+        self.tuning_num_trials: int = training_pipeline.MODEL_TRAINER_TUNING_NUM_TRIALS
+        self.tuning_min_rounds: int = training_pipeline.MODEL_TRAINER_TUNING_MIN_ROUNDS
+        self.tuning_max_rounds: int = training_pipeline.MODEL_TRAINER_TUNING_MAX_ROUNDS
+        self.tuning_reduction_factor: int = (
+            training_pipeline.MODEL_TRAINER_TUNING_REDUCTION_FACTOR
+        )
+        self.tuning_early_stopping_rounds: int = (
+            training_pipeline.MODEL_TRAINER_TUNING_EARLY_STOPPING_ROUNDS
+        )
+        self.tuning_n_jobs: int = training_pipeline.MODEL_TRAINER_TUNING_N_JOBS
+        self.tuning_report_file_path: str = os.path.join(
+            self.model_trainer_dir, training_pipeline.MODEL_TRAINER_TUNING_REPORT_NAME
+        )
 
 
 class ModelEvaluationConfig:
@@ -138,3 +250,7 @@ class ModelPusherConfig:
             f"{timestamp}",
             training_pipeline.MODEL_FILE_NAME,
         )
+        self.saved_reference_sketch_path = os.path.join(
+            os.path.dirname(self.saved_model_path),
+            training_pipeline.REFERENCE_SKETCH_FILE_NAME,
+        )
@@ -10,15 +10,23 @@ def error_message_detail(error, error_detail: sys):
 
 
 class SensorException(Exception):
-    def __init__(self, error_message, error_detail):
+    def __init__(self, error_message, error_detail=None):
         """
         :param error_message: Error message in string format.
+        :param error_detail: The sys module, used to locate the raising frame.
         """
         super().__init__(error_message)
 
-        self.error_message = error_message_detail(
-            error_message, error_detail=error_detail
-        )
+        if error_detail is None:
+            self.error_message = str(error_message)
+        else:
+            self.error_message = error_message_detail(
+                error_message, error_detail=error_detail
+            )
+
+    def __reduce__(self):
+        # Rebuild from the formatted message when crossing a process boundary.
+        return self.__class__, (self.error_message,)
 
     def __str__(self):
         return self.error_message
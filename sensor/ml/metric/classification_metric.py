@@ -1,8 +1,28 @@
 import sys
+import numpy as np
 from sklearn.metrics import f1_score, precision_score, recall_score
-from sensor.entity.artifact_entity import ClassificationMetricArtifact
+from sensor.entity.artifact_entity import (
+    ClassificationMetricArtifact,
+    CostThresholdArtifact,
+)
 from sensor.exception import SensorException
 
+EARLY_STOPPING_METRICS = ("logloss", "f1")
+
+
+def f1(y_true: np.ndarray, y_score: np.ndarray) -> float:
+    """
+    Validation F1 at a 0.5 threshold, as an XGBoost evaluation metric.
+    """
+    return f1_score(y_true, y_score > 0.5)
+
+
+def f1_custom_metric(y_score: np.ndarray, dmatrix) -> tuple:
+    """
+    `f1` as a `custom_metric` of `xgb.train`.
+    """
+    return "f1", f1(dmatrix.get_label(), y_score)
+
 
 def get_classification_score(y_true, y_pred) -> ClassificationMetricArtifact:
     try:
@@ -17,3 +37,73 @@ def get_classification_score(y_true, y_pred) -> ClassificationMetricArtifact:
         )
     except Exception as e:
         raise SensorException(e, sys) from e
+
+
+def get_threshold_cost(
+    y_true,
+    y_score,
+    threshold: float,
+    false_positive_cost: float,
+    false_negative_cost: float,
+) -> CostThresholdArtifact:
+    """
+    :return: The total misclassification cost of predicting positive above
+    `threshold`.
+    """
+    try:
+        y_true = np.asarray(y_true, dtype=bool)
+        y_pred = np.asarray(y_score) > threshold
+        false_positives = int(np.sum(y_pred & ~y_true))
+        false_negatives = int(np.sum(~y_pred & y_true))
+        return CostThresholdArtifact(
+            threshold=threshold,
+            cost=false_positive_cost * false_positives
+            + false_negative_cost * false_negatives,
+            false_positives=false_positives,
+            false_negatives=false_negatives,
+        )
+    except Exception as e:
+        raise SensorException(e, sys) from e
+
+
+def get_cost_optimal_threshold(
+    y_true, y_score, false_positive_cost: float, false_negative_cost: float
+) -> CostThresholdArtifact:
+    """
+    Sweep every decision threshold in one sorted pass: with the scores sorted,
+    the false negatives and false positives at each distinct score are running
+    sums of the labels, so all thresholds are costed in O(n log n) instead of
+    re-scoring the set once per threshold.
+    :param y_score: Positive-class probabilities; a sample is predicted
+    positive when its score is above the threshold.
+    :return: The threshold with the lowest total misclassification cost.
+    """
+    try:
+        y_true = np.asarray(y_true, dtype=np.int64)
+        y_score = np.asarray(y_score, dtype=np.float64)
+        order = np.argsort(y_score, kind="stable")
+        scores = y_score[order]
+        positives_at_or_below = np.cumsum(y_true[order])
+        negatives_at_or_below = np.arange(1, len(scores) + 1) - positives_at_or_below
+
+        # Cut after the last sample of each distinct score, or below them all.
+        cut = np.flatnonzero(np.append(scores[1:] != scores[:-1], True))
+        thresholds = np.append(np.nextafter(scores[0], -np.inf), scores[cut])
+        false_negatives = np.append(0, positives_at_or_below[cut])
+        false_positives = negatives_at_or_below[-1] - np.append(
+            0, negatives_at_or_below[cut]
+        )
+        costs = (
+            false_positive_cost * false_positives
+            + false_negative_cost * false_negatives
+        )
+
+        best = int(np.argmin(costs))
+        return CostThresholdArtifact(
+            threshold=float(thresholds[best]),
+            cost=float(costs[best]),
+            false_positives=int(false_positives[best]),
+            false_negatives=int(false_negatives[best]),
+        )
+    except Exception as e:
+        raise SensorException(e, sys) from e
@@ -0,0 +1,164 @@
+import sys
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor
+from typing import Tuple
+
+from sensor.exception import SensorException
+
+# Sample sizes up to which the exact KS p-value is used, matching SciPy's "auto".
+KS_EXACT_MAX_N = 10000
+
+# Number of columns sorted together, bounding the working memory of a KS batch.
+KS_COLUMN_BATCH_SIZE = 16
+
+PSI_EPSILON = 1e-6
+
+
+def _ks_statistic_batch(base: np.ndarray, current: np.ndarray) -> np.ndarray:
+    """
+    Two-sample KS statistics for every column, ignoring NaNs. Each column is
+    sorted contiguously (one row per column) and the two sorted samples are
+    merged with a stable argsort, which reduces to a single merge pass. The
+    empirical CDFs are compared only at the last position of each run of
+    tied values.
+    """
+    n1 = len(base)
+    pooled = np.concatenate(
+        [np.sort(base.T, axis=1), np.sort(current.T, axis=1)], axis=1
+    )
+    order = np.argsort(pooled, axis=1, kind="stable")
+    pooled = np.take_along_axis(pooled, order, axis=1)
+
+    valid = ~np.isnan(pooled)
+    from_base = order < n1
+    base_counts = np.cumsum(from_base & valid, axis=1)
+    current_counts = np.cumsum(~from_base & valid, axis=1)
+    n1_valid = np.maximum(base_counts[:, -1:], 1)
+    n2_valid = np.maximum(current_counts[:, -1:], 1)
+
+    run_end = np.ones_like(valid)
+    run_end[:, :-1] = pooled[:, 1:] != pooled[:, :-1]
+    cdf_diff = np.abs(base_counts / n1_valid - current_counts / n2_valid)
+    return np.where(valid & run_end, cdf_diff, 0.0).max(axis=1)
+
+
+def ks_2samp_columns(
+    base: np.ndarray, current: np.ndarray
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Vectorized equivalent of `scipy.stats.ks_2samp(..., nan_policy="omit")`
+    applied to each column of two 2-D arrays.
+    :return: KS statistics and two-sided p-values, one per column.
+    """
+    try:
+        # Imported here, as serving only needs the PSI helpers of this module.
+        from scipy.stats import kstwo, ks_2samp
+
+        num_columns = base.shape[1]
+        statistics = np.empty(num_columns)
+        for start in range(0, num_columns, KS_COLUMN_BATCH_SIZE):
+            columns = slice(start, start + KS_COLUMN_BATCH_SIZE)
+            statistics[columns] = _ks_statistic_batch(
+                base[:, columns], current[:, columns]
+            )
+
+        n1 = (~np.isnan(base)).sum(axis=0)
+        n2 = (~np.isnan(current)).sum(axis=0)
+        en = np.round(n1 * n2 / np.maximum(n1 + n2, 1))
+        p_values = np.clip(kstwo.sf(statistics, np.maximum(en, 1)), 0, 1)
+
+        # Small samples get SciPy's exact p-value, as `ks_2samp` would use.
+        for i in np.flatnonzero(np.maximum(n1, n2) <= KS_EXACT_MAX_N):
+            if n1[i] == 0 or n2[i] == 0:
+                p_values[i] = np.nan
+                continue
+            result = ks_2samp(base[:, i], current[:, i], nan_policy="omit")
+            statistics[i], p_values[i] = result.statistic, result.pvalue
+        return statistics, p_values
+
+    except Exception as e:
+        raise SensorException(e, sys) from e
+
+
+def parallel_ks_2samp_columns(
+    base: np.ndarray, current: np.ndarray, n_jobs: int
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Run `ks_2samp_columns` over `n_jobs` processes, each taking a group of columns.
+    """
+    try:
+        if n_jobs <= 1 or base.shape[1] <= 1:
+            return ks_2samp_columns(base, current)
+        groups = np.array_split(np.arange(base.shape[1]), n_jobs)
+        groups = [group for group in groups if len(group)]
+        with ProcessPoolExecutor(max_workers=len(groups)) as executor:
+            results = list(
+                executor.map(
+                    ks_2samp_columns,
+                    [base[:, group] for group in groups],
+                    [current[:, group] for group in groups],
+                )
+            )
+        return (
+            np.concatenate([statistics for statistics, _ in results]),
+            np.concatenate([p_values for _, p_values in results]),
+        )
+
+    except Exception as e:
+        raise SensorException(e, sys) from e
+
+
+def quantile_bin_edges(base: np.ndarray, num_bins: int = 10) -> np.ndarray:
+    """
+    :return: Interior quantile bin edges of each column, shape (num_bins - 1, columns).
+    """
+    try:
+        quantiles = np.linspace(0, 1, num_bins + 1)[1:-1]
+        return np.nanquantile(base, quantiles, axis=0)
+    except Exception as e:
+        raise SensorException(e, sys) from e
+
+
+def bin_counts(data: np.ndarray, bin_edges: np.ndarray) -> np.ndarray:
+    """
+    :return: Count of each column's non-NaN values per bin, shape (num_bins, columns).
+    """
+    try:
+        num_bins = len(bin_edges) + 1
+        counts = np.zeros((num_bins, data.shape[1]), dtype=np.int64)
+        for i in range(data.shape[1]):
+            column = data[:, i]
+            column = column[~np.isnan(column)]
+            bins = np.searchsorted(bin_edges[:, i], column, side="right")
+            counts[:, i] = np.bincount(bins, minlength=num_bins)
+        return counts
+    except Exception as e:
+        raise SensorException(e, sys) from e
+
+
+def bin_proportions(data: np.ndarray, bin_edges: np.ndarray) -> np.ndarray:
+    """
+    :return: Share of each column's non-NaN values per bin, shape (num_bins, columns).
+    """
+    try:
+        counts = bin_counts(data, bin_edges)
+        return counts / np.maximum(counts.sum(axis=0), 1)
+    except Exception as e:
+        raise SensorException(e, sys) from e
+
+
+def population_stability_index(
+    base_proportions: np.ndarray, current_proportions: np.ndarray
+) -> np.ndarray:
+    """
+    :return: PSI of each column from per-bin proportions, shape (num_bins, columns).
+    """
+    try:
+        base_proportions = np.clip(base_proportions, PSI_EPSILON, None)
+        current_proportions = np.clip(current_proportions, PSI_EPSILON, None)
+        return (
+            (current_proportions - base_proportions)
+            * np.log(current_proportions / base_proportions)
+        ).sum(axis=0)
+    except Exception as e:
+        raise SensorException(e, sys) from e
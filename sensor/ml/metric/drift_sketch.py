@@ -0,0 +1,254 @@
+import os
+import sys
+import queue
+import threading
+import numpy as np
+import pandas as pd
+from typing import List, Optional
+
+from sensor.ml.metric.drift_metric import (
+    bin_counts,
+    population_stability_index,
+    quantile_bin_edges,
+)
+from sensor.exception import SensorException
+from sensor.logger import logging
+
+
+class ReferenceSketch:
+    """
+    The Reference sketch summarises the training distribution of each numerical
+    column in O(columns) space: interior quantile bin edges, the number of
+    training values per bin and the number of nulls. It is persisted beside the
+    model so that drift can be checked without reloading the training data.
+    """
+
+    def __init__(
+        self,
+        columns: List[str],
+        bin_edges: np.ndarray,
+        bin_counts: np.ndarray,
+        null_counts: np.ndarray,
+        row_count: int,
+    ):
+        self.columns = list(columns)
+        self.bin_edges = bin_edges
+        self.bin_counts = bin_counts
+        self.null_counts = null_counts
+        self.row_count = int(row_count)
+
+    @classmethod
+    def from_dataframe(
+        cls, dataframe: pd.DataFrame, num_bins: int = 10
+    ) -> "ReferenceSketch":
+        """
+        :param dataframe: Training data; only its numerical columns are sketched.
+        """
+        try:
+            dataframe = dataframe.select_dtypes("number")
+            data = dataframe.to_numpy(dtype=np.float64)
+            bin_edges = quantile_bin_edges(data, num_bins=num_bins)
+            return cls(
+                columns=dataframe.columns,
+                bin_edges=bin_edges,
+                bin_counts=bin_counts(data, bin_edges),
+                null_counts=np.isnan(data).sum(axis=0),
+                row_count=len(data),
+            )
+        except Exception as e:
+            raise SensorException(e, sys) from e
+
+    def proportions(self) -> np.ndarray:
+        return self.bin_counts / np.maximum(self.bin_counts.sum(axis=0), 1)
+
+    def null_rates(self) -> np.ndarray:
+        return self.null_counts / max(self.row_count, 1)
+
+    def save(self, file_path: str) -> None:
+        try:
+            os.makedirs(os.path.dirname(file_path), exist_ok=True)
+            with open(file_path, "wb") as file_obj:
+                np.savez(
+                    file_obj,
+                    columns=np.array(self.columns, dtype=str),
+                    bin_edges=self.bin_edges,
+                    bin_counts=self.bin_counts,
+                    null_counts=self.null_counts,
+                    row_count=self.row_count,
+                )
+        except Exception as e:
+            raise SensorException(e, sys) from e
+
+    @classmethod
+    def load(cls, file_path: str) -> "ReferenceSketch":
+        try:
+            with np.load(file_path) as sketch:
+                return cls(
+                    columns=sketch["columns"].tolist(),
+                    bin_edges=sketch["bin_edges"],
+                    bin_counts=sketch["bin_counts"],
+                    null_counts=sketch["null_counts"],
+                    row_count=sketch["row_count"],
+                )
+        except Exception as e:
+            raise SensorException(e, sys) from e
+
+
+class StreamingDriftChecker:
+    """
+    The Streaming drift checker accumulates the same per-bin and null counts as
+    a ReferenceSketch from batches of new data, e.g. prediction traffic or
+    `SensorData.iter_collection_chunks`, and compares them with the reference
+    in O(columns) memory. A column drifts when its PSI exceeds `psi_threshold`
+    or its null rate moves by more than `null_rate_threshold`, once at least
+    `min_rows` rows have been counted; PSI over fewer rows is mostly noise.
+
+    Batches handed to `submit` are counted on a background thread instead, so
+    callers on a latency-sensitive path such as prediction only pay for keeping
+    a random `sample_rate` of the rows. PSI and null rates are proportions, so
+    a uniform row sample estimates them without bias.
+    """
+
+    def __init__(
+        self,
+        reference_sketch: ReferenceSketch,
+        psi_threshold: float,
+        null_rate_threshold: float,
+        sample_rate: float = 1.0,
+        max_pending_batches: int = 64,
+        min_rows: int = 1,
+    ):
+        self.reference_sketch = reference_sketch
+        self.psi_threshold = psi_threshold
+        self.null_rate_threshold = null_rate_threshold
+        self.sample_rate = sample_rate
+        self.min_rows = min_rows
+        self.dropped_batches: int = 0
+        self._lock = threading.Lock()
+        self._rng = np.random.default_rng()
+        self._pending: queue.Queue = queue.Queue(maxsize=max_pending_batches)
+        self._worker: Optional[threading.Thread] = None
+        self._closed = False
+        self.reset()
+
+    def reset(self) -> None:
+        with self._lock:
+            self.bin_counts = np.zeros_like(self.reference_sketch.bin_counts)
+            self.null_counts = np.zeros_like(self.reference_sketch.null_counts)
+            self.row_count = 0
+
+    def update(self, dataframe: pd.DataFrame) -> None:
+        """
+        :param dataframe: A batch of raw sensor readings; missing columns count as nulls.
+        """
+        try:
+            dataframe = dataframe.reindex(columns=self.reference_sketch.columns)
+            # Raw traffic may hold "na" strings; anything non-numeric is a null.
+            for column in dataframe.select_dtypes(exclude="number").columns:
+                dataframe[column] = pd.to_numeric(dataframe[column], errors="coerce")
+            data = dataframe.to_numpy(dtype=np.float64)
+            counts = bin_counts(data, self.reference_sketch.bin_edges)
+            null_counts = np.isnan(data).sum(axis=0)
+            with self._lock:
+                self.bin_counts += counts
+                self.null_counts += null_counts
+                self.row_count += len(data)
+        except Exception as e:
+            raise SensorException(e, sys) from e
+
+    def submit(self, dataframe: pd.DataFrame) -> None:
+        """
+        Queue a sample of the batch for `update` on the background thread. The
+        sample is dropped if `max_pending_batches` are already waiting.
+        :param dataframe: A batch of raw sensor readings.
+        """
+        if self._closed:
+            return
+        if self.sample_rate < 1.0:
+            with self._lock:
+                row_mask = self._rng.random(len(dataframe)) < self.sample_rate
+            if not row_mask.any():
+                return
+            dataframe = dataframe[row_mask]
+        self._start_worker()
+        try:
+            self._pending.put_nowait(dataframe)
+        except queue.Full:
+            self.dropped_batches += 1
+
+    def flush(self) -> None:
+        """
+        Wait until every submitted batch has been counted.
+        """
+        self._pending.join()
+
+    def close(self) -> None:
+        """
+        Count the batches already submitted, then stop the background thread.
+        """
+        self._closed = True
+        if self._worker is not None and self._worker.is_alive():
+            self._pending.put(None)
+
+    def _start_worker(self) -> None:
+        # Also restarts it in a forked process, which inherits no threads.
+        if self._worker is not None and self._worker.is_alive():
+            return
+        with self._lock:
+            if self._worker is None or not self._worker.is_alive():
+                self._worker = threading.Thread(
+                    target=self._count_pending, name="drift-checker", daemon=True
+                )
+                self._worker.start()
+
+    def _count_pending(self) -> None:
+        while True:
+            dataframe = self._pending.get()
+            if dataframe is None:
+                self._pending.task_done()
+                return
+            try:
+                self.update(dataframe)
+            except Exception as e:
+                logging.exception(e)
+            finally:
+                self._pending.task_done()
+
+    def report(self) -> dict:
+        """
+        :return: PSI, null rates and drift status of each column, keyed by column.
+        """
+        try:
+            with self._lock:
+                bin_counts, null_counts, row_count = (
+                    self.bin_counts.copy(),
+                    self.null_counts.copy(),
+                    self.row_count,
+                )
+            psi_values = population_stability_index(
+                self.reference_sketch.proportions(),
+                bin_counts / np.maximum(bin_counts.sum(axis=0), 1),
+            )
+            null_rates = null_counts / max(row_count, 1)
+            reference_null_rates = self.reference_sketch.null_rates()
+
+            report = {}
+            for i, column in enumerate(self.reference_sketch.columns):
+                # Too few rows can't tell drift from sampling noise.
+                is_found = row_count >= max(self.min_rows, 1) and bool(
+                    psi_values[i] > self.psi_threshold
+                    or abs(null_rates[i] - reference_null_rates[i])
+                    > self.null_rate_threshold
+                )
+                report[column] = {
+                    "psi": float(psi_values[i]),
+                    "null_rate": float(null_rates[i]),
+                    "reference_null_rate": float(reference_null_rates[i]),
+                    "drift_status": is_found,
+                }
+            return report
+        except Exception as e:
+            raise SensorException(e, sys) from e
+
+    def is_drift_detected(self) -> bool:
+        return any(column["drift_status"] for column in self.report().values())
@@ -0,0 +1,149 @@
+import os
+import sys
+import numpy as np
+from typing import TYPE_CHECKING
+
+from sensor.constant.training_pipeline import (
+    COMPILED_BOOSTER_FILE_NAME,
+    COMPILED_PREPROCESSOR_FILE_NAME,
+)
+from sensor.ml.preprocessing.fused_preprocessor import (
+    FusedPreprocessor,
+    get_preprocessor_constants,
+)
+from sensor.exception import SensorException
+
+if TYPE_CHECKING:
+    import xgboost as xgb
+
+COMPILED_MODEL_FILE_NAMES = (
+    COMPILED_PREPROCESSOR_FILE_NAME,
+    COMPILED_BOOSTER_FILE_NAME,
+)
+
+
+def export_compiled_model(sensor_model, model_dir: str) -> None:
+    """
+    Save a SensorModel as plain arrays and a native XGBoost model: the
+    preprocessor's constants to `preprocessor.npz` and the booster to
+    `model.ubj`, both in `model_dir`.
+    """
+    try:
+        os.makedirs(model_dir, exist_ok=True)
+        preprocessor = sensor_model.preprocessor
+        classifier = sensor_model.model
+        np.savez(
+            os.path.join(model_dir, COMPILED_PREPROCESSOR_FILE_NAME),
+            feature_names=np.asarray(preprocessor.feature_names_in_, dtype=str),
+            # The trees XGBClassifier.predict uses; 0 for all of them.
+            iteration_end=getattr(classifier.get_booster(), "best_iteration", -1) + 1,
+            threshold=getattr(sensor_model, "threshold", 0.5),
+            **get_preprocessor_constants(preprocessor),
+        )
+        classifier.get_booster().save_model(
+            os.path.join(model_dir, COMPILED_BOOSTER_FILE_NAME)
+        )
+    except Exception as e:
+        raise SensorException(e, sys) from e
+
+
+class CompiledSensorModel:
+    """
+    The Compiled model predicts like the SensorModel it was exported from,
+    from NumPy constant vectors and a native XGBoost Booster alone: missing
+    values are filled, centred and scaled in one pass by a FusedPreprocessor,
+    with no pandas, sklearn or unpickling involved in loading it.
+    """
+
+    def __init__(
+        self,
+        feature_names: np.ndarray,
+        fill_value: np.ndarray,
+        center: np.ndarray,
+        scale: np.ndarray,
+        booster: "xgb.Booster",
+        iteration_end: int = 0,
+        threshold: float = 0.5,
+    ):
+        self.feature_names_in_ = feature_names
+        self.preprocessor = FusedPreprocessor(feature_names, fill_value, center, scale)
+        self.booster = booster
+        self.iteration_end = int(iteration_end)
+        self.threshold = float(threshold)
+
+    @classmethod
+    def load(cls, model_dir: str) -> "CompiledSensorModel":
+        try:
+            # XGBoost imports scikit-learn, so serving imports it only once a
+            # model is loaded.
+            import xgboost as xgb
+
+            with np.load(
+                os.path.join(model_dir, COMPILED_PREPROCESSOR_FILE_NAME)
+            ) as constants:
+                booster = xgb.Booster(
+                    model_file=os.path.join(model_dir, COMPILED_BOOSTER_FILE_NAME)
+                )
+                return cls(
+                    feature_names=constants["feature_names"].astype(object),
+                    fill_value=constants["fill_value"],
+                    center=constants["center"],
+                    scale=constants["scale"],
+                    booster=booster,
+                    iteration_end=constants["iteration_end"],
+                    # Models exported before thresholds were added use 0.5.
+                    threshold=constants.get("threshold", 0.5),
+                )
+        except Exception as e:
+            raise SensorException(e, sys) from e
+
+    def transform(self, x) -> np.ndarray:
+        """
+        :param x: A DataFrame with the training feature columns, or an array
+        with the columns in training order.
+        """
+        return self.preprocessor.transform(x)
+
+    def predict_proba(self, x) -> np.ndarray:
+        """
+        :return: The probability of each class, one row per sample.
+        """
+        try:
+            y_prob = self.booster.inplace_predict(
+                self.transform(x), iteration_range=(0, self.iteration_end)
+            )
+            return np.column_stack([1 - y_prob, y_prob])
+        except Exception as e:
+            raise SensorException(e, sys) from e
+
+    def predict(self, x, threshold: float = None) -> np.ndarray:
+        """
+        :param threshold: Positive-class probability above which a sample is
+        predicted positive; the exported model's threshold by default.
+        """
+        try:
+            if threshold is None:
+                threshold = self.threshold
+            return (self.predict_proba(x)[:, 1] > threshold).astype(np.int64)
+        except Exception as e:
+            raise SensorException(e, sys) from e
+
+
+def load_sensor_model(model_file_path: str):
+    """
+    :return: The CompiledSensorModel exported beside a pickled SensorModel,
+    or the SensorModel itself for models saved without one.
+    """
+    try:
+        model_dir = os.path.dirname(model_file_path)
+        if all(
+            os.path.exists(os.path.join(model_dir, file_name))
+            for file_name in COMPILED_MODEL_FILE_NAMES
+        ):
+            return CompiledSensorModel.load(model_dir)
+
+        from sensor.utils import load_object
+
+        return load_object(file_path=model_file_path)
+    except Exception as e:
+        raise SensorException(e, sys) from e
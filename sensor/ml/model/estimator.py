@@ -1,5 +1,7 @@
 import os
+import numpy as np
 from sensor.constant.training_pipeline import SAVED_MODEL_DIR, MODEL_FILE_NAME
+from sensor.ml.preprocessing.fused_preprocessor import FusedPreprocessor
 
 
 class TargetValueMapping:
@@ -14,19 +16,78 @@ class TargetValueMapping:
         mapping_response = self.to_dict()
         return dict(zip(mapping_response.values(), mapping_response.keys()))
 
+    def labels(self) -> np.ndarray:
+        """
+        :return: The class labels indexed by their encoded value, to map
+        predictions back with an array lookup.
+        """
+        reverse_mapping = self.reverse_mapping()
+        return np.array(
+            [reverse_mapping[value] for value in range(len(reverse_mapping))]
+        )
+
 
 class SensorModel:
-    def __init__(self, preprocessor, model):
+    def __init__(self, preprocessor, model, threshold: float = 0.5):
         try:
             self.preprocessor = preprocessor
             self.model = model
+            self.threshold = threshold
+        except Exception as e:
+            raise e
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state.pop("_fused_preprocessor", None)
+        return state
+
+    @property
+    def feature_names_in_(self):
+        return getattr(self.preprocessor, "feature_names_in_", None)
+
+    def get_fused_preprocessor(self):
+        """
+        :return: The preprocessor's FusedPreprocessor, built on first use, or
+        None for preprocessing steps it doesn't support.
+        """
+        if "_fused_preprocessor" not in self.__dict__:
+            try:
+                fused = FusedPreprocessor.from_preprocessor(self.preprocessor)
+            except Exception:
+                fused = None
+            self._fused_preprocessor = fused
+        return self._fused_preprocessor
+
+    def predict_proba(self, x) -> np.ndarray:
+        """
+        :return: The probability of each class, one row per sample.
+        """
+        try:
+            fused = self.get_fused_preprocessor()
+            if fused is None or not hasattr(self.model, "get_booster"):
+                return self.model.predict_proba(self.preprocessor.transform(x))
+
+            booster = self.model.get_booster()
+            # The trees XGBClassifier.predict uses; 0 for all of them.
+            iteration_end = getattr(booster, "best_iteration", -1) + 1
+            y_prob = booster.inplace_predict(
+                fused.transform(x), iteration_range=(0, iteration_end)
+            )
+            return np.column_stack([1 - y_prob, y_prob])
         except Exception as e:
             raise e
 
-    def predict(self, x):
+    def predict(self, x, threshold: float = None) -> np.ndarray:
+        """
+        :param threshold: Positive-class probability above which a sample is
+        predicted positive; the model's own threshold by default.
+        """
         try:
-            x_transform = self.preprocessor.transform(x)
-            return self.model.predict(x_transform)
+            if threshold is None:
+                # Models pickled before thresholds were added use 0.5.
+                threshold = getattr(self, "threshold", 0.5)
+            y_prob = self.predict_proba(x)[:, 1]
+            return (y_prob > threshold).astype(np.int64)
         except Exception as e:
             raise e
 
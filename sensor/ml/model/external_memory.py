@@ -0,0 +1,101 @@
+import os
+import sys
+import numpy as np
+import xgboost as xgb
+from typing import Tuple
+
+from sensor.utils import load_numpy_array_data
+from sensor.exception import SensorException
+
+
+class NumpyBatchIterator(xgb.DataIter):
+    """
+    The Iterator feeds XGBoost a memory-mapped feature and label array pair,
+    `batch_rows` contiguous rows at a time, so an external-memory DMatrix is
+    built and trained on without holding the matrix in memory.
+    XGBoost keeps its quantized pages under `cache_prefix`.
+    """
+
+    def __init__(
+        self,
+        feature_file_path: str,
+        label_file_path: str,
+        batch_rows: int,
+        cache_prefix: str,
+    ):
+        self.features = load_numpy_array_data(feature_file_path, mmap_mode="r")
+        self.labels = load_numpy_array_data(label_file_path, mmap_mode="r")
+        self.batch_rows = batch_rows
+        self._position = 0
+        super().__init__(cache_prefix=cache_prefix)
+
+    def next(self, input_data) -> bool:
+        if self._position >= len(self.labels):
+            return False
+        end = self._position + self.batch_rows
+        input_data(
+            data=self.features[self._position : end],
+            label=self.labels[self._position : end],
+        )
+        self._position = end
+        return True
+
+    def reset(self) -> None:
+        self._position = 0
+
+
+def build_external_memory_matrices(
+    feature_file_path: str,
+    label_file_path: str,
+    valid_feature_file_path: str,
+    valid_label_file_path: str,
+    batch_rows: int,
+    cache_dir: str,
+) -> Tuple[xgb.DMatrix, xgb.DMatrix]:
+    """
+    Build an external-memory quantile DMatrix for the train and the validation
+    array pairs, the validation one sharing the train cuts.
+    :return: The train and validation DMatrix.
+    """
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+        dtrain = xgb.ExtMemQuantileDMatrix(
+            NumpyBatchIterator(
+                feature_file_path,
+                label_file_path,
+                batch_rows,
+                cache_prefix=os.path.join(cache_dir, "train"),
+            )
+        )
+        dvalid = xgb.ExtMemQuantileDMatrix(
+            NumpyBatchIterator(
+                valid_feature_file_path,
+                valid_label_file_path,
+                batch_rows,
+                cache_prefix=os.path.join(cache_dir, "valid"),
+            ),
+            ref=dtrain,
+        )
+        return dtrain, dvalid
+    except Exception as e:
+        raise SensorException(e, sys) from e
+
+
+def predict_in_batches(
+    model, features: np.ndarray, batch_rows: int, method: str = "predict"
+) -> np.ndarray:
+    """
+    :return: The model's predictions for `features`, made `batch_rows` rows at
+    a time so only one batch of a memory-mapped array is paged in at once.
+    :param method: The model's prediction method, e.g. "predict_proba".
+    """
+    try:
+        predict = getattr(model, method)
+        return np.concatenate(
+            [
+                predict(features[start : start + batch_rows])
+                for start in range(0, len(features), batch_rows)
+            ]
+        )
+    except Exception as e:
+        raise SensorException(e, sys) from e
@@ -0,0 +1,159 @@
+import os
+import sys
+import time
+import threading
+from typing import Optional
+
+from sensor.constant.training_pipeline import (
+    SAVED_MODEL_DIR,
+    REFERENCE_SKETCH_FILE_NAME,
+    DATA_VALIDATION_PSI_THRESHOLD,
+    DATA_VALIDATION_NULL_RATE_THRESHOLD,
+    MODEL_REGISTRY_POLL_INTERVAL_SECONDS,
+    MODEL_REGISTRY_DRIFT_SAMPLE_RATE,
+    MODEL_REGISTRY_DRIFT_MAX_PENDING_BATCHES,
+    MODEL_REGISTRY_DRIFT_MIN_ROWS,
+)
+from sensor.ml.metric.drift_sketch import ReferenceSketch, StreamingDriftChecker
+from sensor.ml.model.compiled import load_sensor_model
+from sensor.ml.model.estimator import ModelResolver
+from sensor.exception import SensorException
+from sensor.logger import logging
+
+
+class ModelRegistry:
+    """
+    The Registry keeps the best SensorModel resident in the process so that
+    prediction requests don't have to load it from disk every time. Models
+    pushed with a compiled export are served as a CompiledSensorModel.
+
+    The saved model directory is only re-listed when its mtime changes (a new
+    timestamp directory pushed by the ModelPusher), and the check itself runs
+    at most once per poll interval. A newer model is loaded off to the side
+    and then swapped in with a single reference assignment.
+
+    If the model was pushed with a reference sketch, a StreamingDriftChecker
+    against it is swapped in alongside, so drift is always tracked relative to
+    the training data of the model being served.
+    """
+
+    def __init__(
+        self,
+        model_dir: str = SAVED_MODEL_DIR,
+        poll_interval: float = MODEL_REGISTRY_POLL_INTERVAL_SECONDS,
+    ):
+        try:
+            self.model_resolver = ModelResolver(model_dir=model_dir)
+            self.poll_interval = poll_interval
+            self._lock = threading.Lock()
+            self._model = None
+            self._model_path: Optional[str] = None
+            self._drift_checker: Optional[StreamingDriftChecker] = None
+            self._dir_mtime: Optional[float] = None
+            self._last_poll: float = 0.0
+
+            self.version: Optional[str] = None
+            self.load_count: int = 0
+            self.last_load_seconds: Optional[float] = None
+            self.loaded_at: Optional[float] = None
+        except Exception as e:
+            raise SensorException(e, sys) from e
+
+    def _get_dir_mtime(self) -> Optional[float]:
+        try:
+            return os.stat(self.model_resolver.model_dir).st_mtime
+        except FileNotFoundError:
+            return None
+
+    def _load(self, model_path: str) -> None:
+        start = time.perf_counter()
+        model = load_sensor_model(model_path)
+        drift_checker = None
+        sketch_path = os.path.join(
+            os.path.dirname(model_path), REFERENCE_SKETCH_FILE_NAME
+        )
+        if os.path.exists(sketch_path):
+            drift_checker = StreamingDriftChecker(
+                ReferenceSketch.load(sketch_path),
+                psi_threshold=DATA_VALIDATION_PSI_THRESHOLD,
+                null_rate_threshold=DATA_VALIDATION_NULL_RATE_THRESHOLD,
+                sample_rate=MODEL_REGISTRY_DRIFT_SAMPLE_RATE,
+                max_pending_batches=MODEL_REGISTRY_DRIFT_MAX_PENDING_BATCHES,
+                min_rows=MODEL_REGISTRY_DRIFT_MIN_ROWS,
+            )
+        elapsed = time.perf_counter() - start
+
+        # Swap only once the new model is fully loaded.
+        previous_drift_checker = self._drift_checker
+        self._model = model
+        self._drift_checker = drift_checker
+        if previous_drift_checker is not None:
+            previous_drift_checker.close()
+        self._model_path = model_path
+        self.version = os.path.basename(os.path.dirname(model_path))
+        self.load_count += 1
+        self.last_load_seconds = elapsed
+        self.loaded_at = time.time()
+        logging.info(
+            f"Model Registry loaded version [{self.version}] in {elapsed:.3f} seconds."
+        )
+
+    def refresh(self, force: bool = False) -> None:
+        """
+        Load the best model if the saved model directory has changed since the
+        last check, or unconditionally when `force` is set.
+        """
+        try:
+            now = time.monotonic()
+            if not force and now - self._last_poll < self.poll_interval:
+                return
+
+            with self._lock:
+                self._last_poll = now
+                dir_mtime = self._get_dir_mtime()
+                if not force and dir_mtime == self._dir_mtime:
+                    return
+
+                # Leave the mtime unrecorded so an incomplete push is retried.
+                if not self.model_resolver.is_model_exists():
+                    return
+
+                best_model_path = self.model_resolver.get_best_model_path()
+                if force or best_model_path != self._model_path:
+                    self._load(best_model_path)
+                self._dir_mtime = dir_mtime
+
+        except Exception as e:
+            raise SensorException(e, sys) from e
+
+    def get_model(self):
+        """
+        :return: The resident SensorModel, or None if no model has been saved yet.
+        """
+        try:
+            self.refresh()
+        except Exception as e:
+            # Keep serving the resident model if a newer one fails to load.
+            if self._model is None:
+                raise e
+            logging.exception(e)
+        return self._model
+
+    def get_drift_checker(self) -> Optional[StreamingDriftChecker]:
+        """
+        :return: The drift checker of the resident model, or None if it has no
+        reference sketch.
+        """
+        return self._drift_checker
+
+    def is_model_loaded(self) -> bool:
+        return self._model is not None
+
+    def stats(self) -> dict:
+        return {
+            "version": self.version,
+            "model_path": self._model_path,
+            "load_count": self.load_count,
+            "last_load_seconds": self.last_load_seconds,
+            "loaded_at": self.loaded_at,
+        }
@@ -0,0 +1,325 @@
+import os
+import sys
+import json
+import shutil
+import hashlib
+import multiprocessing
+import numpy as np
+import xgboost as xgb
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+from sklearn.metrics import f1_score
+
+from sensor.ml.metric.classification_metric import (
+    EARLY_STOPPING_METRICS,
+    f1_custom_metric,
+)
+from sensor.utils import load_dmatrix, load_numpy_array_data
+from sensor.exception import SensorException
+from sensor.logger import logging
+
+XGBOOST_SEARCH_SPACE: Dict[str, list] = {
+    "max_depth": [3, 4, 6, 8],
+    "learning_rate": [0.03, 0.1, 0.3],
+    "subsample": [0.7, 0.85, 1.0],
+    "colsample_bytree": [0.5, 0.75, 1.0],
+    "min_child_weight": [1, 5, 10],
+    "reg_lambda": [1.0, 5.0],
+}
+
+FINGERPRINT_CHUNK_ROWS = 65536
+
+# The train/validation DMatrix pair of the current worker process.
+_worker_matrices: Optional[tuple] = None
+
+
+def _init_tuning_worker(
+    feature_file_path: str,
+    label_file_path: str,
+    valid_feature_file_path: str,
+    valid_label_file_path: str,
+) -> None:
+    """
+    Build the train and validation matrices once per worker, binned straight
+    from the memory-mapped arrays so the features aren't copied first.
+    """
+    global _worker_matrices
+    dtrain = load_dmatrix(feature_file_path, label_file_path, quantile=True)
+    dvalid = load_dmatrix(
+        valid_feature_file_path, valid_label_file_path, quantile=True, ref=dtrain
+    )
+    _worker_matrices = (dtrain, dvalid)
+
+
+def _run_trial(
+    params: dict,
+    num_boost_round: int,
+    early_stopping_rounds: int,
+    early_stopping_metric: str,
+) -> dict:
+    """
+    :return: Validation F1 at the best iteration, which early stopping picks
+    by `early_stopping_metric` on the validation set, as the final fit does.
+    """
+    dtrain, dvalid = _worker_matrices
+    is_f1 = early_stopping_metric == "f1"
+    booster = xgb.train(
+        params,
+        dtrain,
+        num_boost_round=num_boost_round,
+        evals=[(dvalid, "valid")],
+        # Early stopping follows the last metric, the custom one when given.
+        custom_metric=f1_custom_metric if is_f1 else None,
+        maximize=is_f1,
+        early_stopping_rounds=early_stopping_rounds,
+        verbose_eval=False,
+    )
+    best_iteration = booster.best_iteration
+    y_prob = booster.predict(dvalid, iteration_range=(0, best_iteration + 1))
+    score = f1_score(dvalid.get_label(), y_prob > 0.5)
+    return {"score": float(score), "best_iteration": int(best_iteration)}
+
+
+@dataclass
+class TuningResult:
+    best_params: dict
+    best_num_boost_round: int
+    best_score: float
+    trials: List[dict] = field(default_factory=list)
+
+
+class HyperparameterTuner:
+    """
+    The Tuner searches XGBoost parameters with successive halving: `num_trials`
+    random configurations are trained for `min_rounds` boosting rounds, the
+    best 1/`reduction_factor` move on with `reduction_factor` times the rounds,
+    and so on up to `max_rounds`. Every trial stops early on the validation
+    `early_stopping_metric`, like the final fit, and is scored by F1 on the
+    validation set, which is held out before the training set is resampled.
+    Trials of a rung run concurrently over at most `n_jobs` processes, which
+    share `n_jobs` cores between them.
+
+    Trial results are cached on disk under a key made of the parameters and
+    the budget, in a directory per data fingerprint, so a rerun on the same
+    data skips them. Directories of other data are removed when tuning starts.
+    """
+
+    def __init__(
+        self,
+        cache_dir: str,
+        num_trials: int,
+        min_rounds: int,
+        max_rounds: int,
+        reduction_factor: int,
+        early_stopping_rounds: int,
+        n_jobs: int,
+        early_stopping_metric: str = "logloss",
+        search_space: Dict[str, list] = XGBOOST_SEARCH_SPACE,
+        seed: int = 42,
+    ):
+        try:
+            self.cache_dir = cache_dir
+            self.num_trials = num_trials
+            self.min_rounds = min_rounds
+            self.max_rounds = max_rounds
+            self.reduction_factor = reduction_factor
+            self.early_stopping_rounds = early_stopping_rounds
+            if early_stopping_metric not in EARLY_STOPPING_METRICS:
+                raise Exception(
+                    f"Unknown early stopping metric [{early_stopping_metric}]; "
+                    f"expected one of {EARLY_STOPPING_METRICS}."
+                )
+            self.early_stopping_metric = early_stopping_metric
+            self.n_jobs = max(1, n_jobs)
+            self.search_space = search_space
+            self.seed = seed
+        except Exception as e:
+            raise SensorException(e, sys) from e
+
+    def sample_configurations(self) -> List[dict]:
+        rng = np.random.default_rng(self.seed)
+        configurations = []
+        for _ in range(self.num_trials):
+            configurations.append(
+                {
+                    name: values[rng.integers(len(values))]
+                    for name, values in self.search_space.items()
+                }
+            )
+        # Duplicates would only repeat the same trial.
+        unique = {json.dumps(c, sort_keys=True): c for c in configurations}
+        return list(unique.values())
+
+    @staticmethod
+    def get_data_fingerprint(*file_paths: str) -> str:
+        """
+        :return: A hash of the .npy arrays, read in chunks.
+        """
+        digest = hashlib.blake2b(digest_size=16)
+        for file_path in file_paths:
+            array = load_numpy_array_data(file_path, mmap_mode="r")
+            digest.update(f"{array.dtype}{array.shape}".encode())
+            for start in range(0, len(array), FINGERPRINT_CHUNK_ROWS):
+                chunk = array[start : start + FINGERPRINT_CHUNK_ROWS]
+                digest.update(np.ascontiguousarray(chunk).data)
+        return digest.hexdigest()
+
+    def _get_cache_file_path(self, fingerprint: str, trial: dict) -> str:
+        key = json.dumps(
+            {
+                # The thread count doesn't change the result.
+                "params": {
+                    name: value
+                    for name, value in trial["params"].items()
+                    if name != "nthread"
+                },
+                "num_boost_round": trial["num_boost_round"],
+                "early_stopping_rounds": self.early_stopping_rounds,
+                "early_stopping_metric": self.early_stopping_metric,
+                "seed": self.seed,
+            },
+            sort_keys=True,
+        )
+        return os.path.join(
+            self.cache_dir,
+            fingerprint,
+            hashlib.sha256(key.encode()).hexdigest() + ".json",
+        )
+
+    def prune_cache(self, fingerprint: str) -> None:
+        """
+        Remove the cached trials of every other data fingerprint, which a
+        retrain on new data would never read again.
+        """
+        for name in os.listdir(self.cache_dir):
+            if name == fingerprint:
+                continue
+            path = os.path.join(self.cache_dir, name)
+            if os.path.isdir(path):
+                shutil.rmtree(path, ignore_errors=True)
+            else:
+                os.remove(path)
+
+    def _run_rung(self, trials: List[dict], fingerprint: str, executor) -> None:
+        pending = []
+        for trial in trials:
+            cache_file_path = self._get_cache_file_path(fingerprint, trial)
+            if os.path.exists(cache_file_path):
+                with open(cache_file_path) as cache_file:
+                    trial.update(json.load(cache_file), cached=True)
+                continue
+            args = (
+                trial["params"],
+                trial["num_boost_round"],
+                self.early_stopping_rounds,
+                self.early_stopping_metric,
+            )
+            future = executor.submit(_run_trial, *args) if executor else None
+            pending.append((trial, cache_file_path, args, future))
+
+        for trial, cache_file_path, args, future in pending:
+            result = future.result() if future else _run_trial(*args)
+            trial.update(result, cached=False)
+            with open(f"{cache_file_path}.tmp", "w") as cache_file:
+                json.dump(result, cache_file)
+            os.replace(f"{cache_file_path}.tmp", cache_file_path)
+
+    def tune(
+        self,
+        feature_file_path: str,
+        label_file_path: str,
+        valid_feature_file_path: str,
+        valid_label_file_path: str,
+        scale_pos_weight: float = 1.0,
+    ) -> TuningResult:
+        """
+        :param feature_file_path: Transformed training features (.npy).
+        :param label_file_path: Training labels (.npy).
+        :param valid_feature_file_path: Transformed validation features (.npy).
+        :param valid_label_file_path: Validation labels (.npy).
+        :return: The best parameters and the number of boosting rounds they
+        needed, together with every trial that was run.
+        """
+        try:
+            initargs = (
+                feature_file_path,
+                label_file_path,
+                valid_feature_file_path,
+                valid_label_file_path,
+            )
+            fingerprint = self.get_data_fingerprint(*initargs)
+            os.makedirs(os.path.join(self.cache_dir, fingerprint), exist_ok=True)
+            self.prune_cache(fingerprint)
+            configurations = self.sample_configurations()
+            num_workers = min(self.n_jobs, len(configurations))
+            base_params = {
+                "objective": "binary:logistic",
+                "eval_metric": "logloss",
+                "tree_method": "hist",
+                "scale_pos_weight": scale_pos_weight,
+                "nthread": max(1, self.n_jobs // num_workers),
+                "seed": self.seed,
+            }
+
+            executor = None
+            if num_workers > 1:
+                executor = ProcessPoolExecutor(
+                    max_workers=num_workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                    initializer=_init_tuning_worker,
+                    initargs=initargs,
+                )
+            else:
+                _init_tuning_worker(*initargs)
+
+            all_trials = []
+            try:
+                num_boost_round = self.min_rounds
+                rung = 0
+                while True:
+                    trials = [
+                        {
+                            "rung": rung,
+                            "num_boost_round": num_boost_round,
+                            "params": {**base_params, **configuration},
+                        }
+                        for configuration in configurations
+                    ]
+                    self._run_rung(trials, fingerprint, executor)
+                    all_trials.extend(trials)
+                    logging.info(
+                        f"Tuning rung {rung}: {len(trials)} trials at {num_boost_round} "
+                        f"rounds, best F1 {max(t['score'] for t in trials):.4f}."
+                    )
+
+                    if len(trials) == 1 or num_boost_round >= self.max_rounds:
+                        break
+                    trials.sort(key=lambda trial: trial["score"], reverse=True)
+                    num_keep = max(1, len(trials) // self.reduction_factor)
+                    configurations = [
+                        {name: trial["params"][name] for name in self.search_space}
+                        for trial in trials[:num_keep]
+                    ]
+                    num_boost_round = min(
+                        num_boost_round * self.reduction_factor, self.max_rounds
+                    )
+                    rung += 1
+            finally:
+                global _worker_matrices
+                _worker_matrices = None
+                if executor is not None:
+                    executor.shutdown()
+
+            best_trial = max(trials, key=lambda trial: trial["score"])
+            return TuningResult(
+                best_params={
+                    name: best_trial["params"][name] for name in self.search_space
+                },
+                best_num_boost_round=best_trial["best_iteration"] + 1,
+                best_score=best_trial["score"],
+                trials=all_trials,
+            )
+
+        except Exception as e:
+            raise SensorException(e, sys) from e
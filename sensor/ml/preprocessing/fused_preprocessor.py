@@ -0,0 +1,109 @@
+import sys
+import numpy as np
+
+from sensor.exception import SensorException
+
+# Rows per block, so a block's float64 intermediate stays in the CPU cache.
+FUSED_BLOCK_ROWS = 2048
+
+
+def get_preprocessor_constants(preprocessor) -> dict:
+    """
+    Read the fill values, centres and scales of a fitted SimpleImputer +
+    RobustScaler Pipeline or StreamingRobustPreprocessor, by attribute so
+    that sklearn needn't be imported.
+    """
+    num_features = preprocessor.n_features_in_
+    constants = {
+        # NaN fill values leave missing values to XGBoost.
+        "fill_value": np.full(num_features, np.nan),
+        "center": np.zeros(num_features),
+        "scale": np.ones(num_features),
+    }
+    steps = [step for _, step in getattr(preprocessor, "steps", [(None, preprocessor)])]
+    for step in steps:
+        step_name = type(step).__name__
+        if step_name == "SimpleImputer":
+            constants["fill_value"] = np.asarray(step.statistics_, dtype=np.float64)
+        elif step_name == "RobustScaler":
+            if step.center_ is not None:
+                constants["center"] = step.center_
+            if step.scale_ is not None:
+                constants["scale"] = step.scale_
+        elif step_name == "StreamingRobustPreprocessor":
+            constants["fill_value"] = np.full(num_features, step.fill_value, np.float64)
+            constants["center"] = step.center_
+            constants["scale"] = step.scale_
+        else:
+            raise Exception(f"Cannot compile the preprocessing step [{step_name}].")
+        if len(constants["fill_value"]) != num_features:
+            raise Exception(f"[{step_name}] doesn't keep every feature.")
+    return constants
+
+
+class FusedPreprocessor:
+    """
+    The Fused preprocessor applies the imputer + RobustScaler as constant
+    vectors in a single pass: each block of rows is filled, centred and
+    scaled while it is in cache and written into one contiguous float32
+    array, the input XGBoost predicts from without another copy. The
+    arithmetic is done in float64 like the fitted preprocessor, so the output
+    equals its transform cast to float32, as the model was trained on.
+    """
+
+    def __init__(
+        self,
+        feature_names: np.ndarray,
+        fill_value: np.ndarray,
+        center: np.ndarray,
+        scale: np.ndarray,
+    ):
+        self.feature_names_in_ = feature_names
+        self._feature_names = list(feature_names)
+        self.center = np.asarray(center, dtype=np.float64)
+        self.scale = np.asarray(scale, dtype=np.float64)
+        # A missing value transforms to the same constant in every row.
+        self.transformed_fill_value = (fill_value - self.center) / self.scale
+
+    @classmethod
+    def from_preprocessor(cls, preprocessor) -> "FusedPreprocessor":
+        try:
+            return cls(
+                feature_names=np.asarray(preprocessor.feature_names_in_, dtype=object),
+                **get_preprocessor_constants(preprocessor),
+            )
+        except Exception as e:
+            raise SensorException(e, sys) from e
+
+    def _to_array(self, x) -> np.ndarray:
+        if hasattr(x, "columns"):
+            # Reorder only when needed; selecting columns copies the frame.
+            if list(x.columns) != self._feature_names:
+                x = x[self._feature_names]
+            # A view for single-dtype frames; the blocks are copied below.
+            return x.to_numpy(dtype=np.float64, copy=False)
+        return np.asarray(x, dtype=np.float64).reshape(-1, len(self.center))
+
+    def transform(self, x) -> np.ndarray:
+        """
+        :param x: A DataFrame with the training feature columns, or an array
+        with the columns in training order.
+        :return: The transformed rows as a C-contiguous float32 array.
+        """
+        try:
+            source = self._to_array(x)
+            if source.shape[1] != len(self.center):
+                raise Exception(
+                    f"Expected {len(self.center)} features, got {source.shape[1]}."
+                )
+            data = np.empty(source.shape, dtype=np.float32)
+            for start in range(0, len(source), FUSED_BLOCK_ROWS):
+                values = np.array(source[start : start + FUSED_BLOCK_ROWS])
+                missing = np.isnan(values)
+                values -= self.center
+                values /= self.scale
+                np.copyto(values, self.transformed_fill_value, where=missing)
+                data[start : start + FUSED_BLOCK_ROWS] = values
+            return data
+        except Exception as e:
+            raise SensorException(e, sys) from e
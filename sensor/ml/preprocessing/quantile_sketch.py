@@ -0,0 +1,108 @@
+import sys
+import numpy as np
+
+from sensor.exception import SensorException
+
+
+class QuantileSketch:
+    """
+    The Quantile sketch estimates quantiles of every column of a stream of
+    batches in fixed memory, with a relative error of at most
+    `relative_accuracy` on each quantile (the DDSketch scheme). Values are
+    counted in logarithmically sized buckets, separately for positive and
+    negative values; absolute values under `min_value` count as zero and
+    those over `max_value` fall in the last bucket.
+
+    Two sketches with the same parameters merge by adding their counts, so
+    partitions of a dataset can be sketched apart and combined.
+    """
+
+    def __init__(
+        self,
+        num_columns: int,
+        relative_accuracy: float = 0.005,
+        min_value: float = 1e-9,
+        max_value: float = 1e12,
+    ):
+        try:
+            self.num_columns = num_columns
+            self.relative_accuracy = relative_accuracy
+            self.min_value = min_value
+            self.max_value = max_value
+            self.gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+            self._log_gamma = np.log(self.gamma)
+            self._offset = int(np.ceil(np.log(min_value) / self._log_gamma))
+            self.num_buckets = (
+                int(np.ceil(np.log(max_value) / self._log_gamma)) - self._offset + 1
+            )
+            # Per column, in ascending order of value: the negative buckets
+            # from the largest magnitude down, zero, then the positive buckets.
+            self.counts = np.zeros((num_columns, 2 * self.num_buckets + 1), np.int64)
+            self.count = 0
+        except Exception as e:
+            raise SensorException(e, sys) from e
+
+    def update(self, data: np.ndarray) -> None:
+        """
+        :param data: A batch of shape (rows, num_columns) without NaN.
+        """
+        try:
+            data = np.asarray(data, dtype=np.float64)
+            # Bucket k holds the magnitudes in (gamma^(k-1), gamma^k]; computed
+            # in place, as batches can be large.
+            position = np.abs(data)
+            with np.errstate(divide="ignore"):
+                np.log(position, out=position)
+            position /= self._log_gamma
+            np.ceil(position, out=position)
+            position -= self._offset
+            is_zero = position < 0
+            np.minimum(position, self.num_buckets - 1, out=position)
+
+            # Column of `counts`: num_buckets +/- (bucket + 1), or num_buckets for zero.
+            position += 1
+            np.copysign(position, data, out=position)
+            position[is_zero] = 0
+            num_positions = self.counts.shape[1]
+            position += self.num_buckets + np.arange(self.num_columns) * num_positions
+            self.counts += np.bincount(
+                position.astype(np.intp).ravel(),
+                minlength=self.counts.size,
+            ).reshape(self.counts.shape)
+            self.count += len(data)
+        except Exception as e:
+            raise SensorException(e, sys) from e
+
+    def merge(self, other: "QuantileSketch") -> None:
+        try:
+            if (
+                other.num_columns != self.num_columns
+                or other.relative_accuracy != self.relative_accuracy
+                or other.min_value != self.min_value
+                or other.max_value != self.max_value
+            ):
+                raise Exception("Only sketches with the same parameters can merge.")
+            self.counts += other.counts
+            self.count += other.count
+        except Exception as e:
+            raise SensorException(e, sys) from e
+
+    def quantile(self, q: float) -> np.ndarray:
+        """
+        :param q: Quantile in [0, 1].
+        :return: The estimated q-th quantile of every column.
+        """
+        try:
+            if self.count == 0:
+                raise Exception("Cannot compute quantiles of an empty sketch.")
+            rank = q * (self.count - 1)
+            position = np.argmax(np.cumsum(self.counts, axis=1) > rank, axis=1)
+
+            # Each bucket is represented by the value with the same relative
+            # distance to both of its bounds.
+            signed_bucket = position - self.num_buckets
+            bucket = np.abs(signed_bucket) - 1 + self._offset
+            value = 2 * self.gamma**bucket / (self.gamma + 1)
+            return np.where(signed_bucket == 0, 0.0, np.sign(signed_bucket) * value)
+        except Exception as e:
+            raise SensorException(e, sys) from e
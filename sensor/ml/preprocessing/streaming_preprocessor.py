@@ -0,0 +1,141 @@
+import sys
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Tuple
+from sklearn.base import BaseEstimator, TransformerMixin
+from sklearn.utils.validation import validate_data
+
+from sensor.ml.preprocessing.quantile_sketch import QuantileSketch
+from sensor.exception import SensorException
+
+
+class StreamingRobustPreprocessor(TransformerMixin, BaseEstimator):
+    """
+    The Streaming preprocessor is a drop-in replacement for the
+    SimpleImputer(strategy="constant") + RobustScaler Pipeline that can be
+    fitted batch by batch: missing values are filled with `fill_value`, then
+    each column is centred on its median and divided by its interquartile
+    range. The medians and quartiles come from a mergeable QuantileSketch
+    instead of the sorted data, so they are within `relative_accuracy` of the
+    exact ones and partitions can be fitted in parallel.
+    """
+
+    def __init__(
+        self,
+        fill_value: float = 0.0,
+        quantile_range: Tuple[float, float] = (25.0, 75.0),
+        relative_accuracy: float = 0.005,
+    ):
+        self.fill_value = fill_value
+        self.quantile_range = quantile_range
+        self.relative_accuracy = relative_accuracy
+
+    def _to_array(self, X, reset: bool) -> np.ndarray:
+        # Checks the columns against those seen first, like sklearn transformers,
+        # and always returns a copy that can be modified in place.
+        data = validate_data(
+            self,
+            X,
+            reset=reset,
+            dtype=np.float64,
+            ensure_all_finite="allow-nan",
+            copy=True,
+        )
+        data[np.isnan(data)] = self.fill_value
+        return data
+
+    def _update_statistics(self) -> None:
+        q_min, q_max = self.quantile_range
+        self.center_ = self.sketch_.quantile(0.5)
+        scale = self.sketch_.quantile(q_max / 100) - self.sketch_.quantile(q_min / 100)
+        # Like RobustScaler, constant columns are left unscaled.
+        self.scale_ = np.where(scale == 0, 1.0, scale)
+
+    def partial_fit(self, X, y=None) -> "StreamingRobustPreprocessor":
+        """
+        Add a batch of rows to the statistics.
+        """
+        try:
+            first_batch = not hasattr(self, "sketch_")
+            data = self._to_array(X, reset=first_batch)
+            if first_batch:
+                self.sketch_ = QuantileSketch(
+                    self.n_features_in_, relative_accuracy=self.relative_accuracy
+                )
+            self.sketch_.update(data)
+            self._update_statistics()
+            return self
+        except Exception as e:
+            raise SensorException(e, sys) from e
+
+    def fit(self, X, y=None) -> "StreamingRobustPreprocessor":
+        if hasattr(self, "sketch_"):
+            del self.sketch_
+        return self.partial_fit(X)
+
+    def merge(
+        self, other: "StreamingRobustPreprocessor"
+    ) -> "StreamingRobustPreprocessor":
+        """
+        Combine the statistics of a preprocessor fitted on another partition.
+        """
+        try:
+            self.sketch_.merge(other.sketch_)
+            self._update_statistics()
+            return self
+        except Exception as e:
+            raise SensorException(e, sys) from e
+
+    def fit_partitions(
+        self, partitions: List, n_jobs: int = 1
+    ) -> "StreamingRobustPreprocessor":
+        """
+        Fit one preprocessor per partition over `n_jobs` processes and merge them.
+        :param partitions: DataFrames or arrays with the same columns.
+        """
+        try:
+            if n_jobs <= 1 or len(partitions) <= 1:
+                fitted = [
+                    self.__class__(**self.get_params()).fit(p) for p in partitions
+                ]
+            else:
+                with ProcessPoolExecutor(max_workers=n_jobs) as executor:
+                    fitted = list(
+                        executor.map(
+                            _fit_partition,
+                            [self.get_params()] * len(partitions),
+                            partitions,
+                        )
+                    )
+
+            merged = fitted[0]
+            for other in fitted[1:]:
+                merged.merge(other)
+            self.__dict__.update(merged.__dict__)
+            return self
+        except Exception as e:
+            raise SensorException(e, sys) from e
+
+    def transform(self, X) -> np.ndarray:
+        try:
+            data = self._to_array(X, reset=False)
+            data -= self.center_
+            data /= self.scale_
+            return data
+        except Exception as e:
+            raise SensorException(e, sys) from e
+
+
+def _fit_partition(params: dict, partition) -> StreamingRobustPreprocessor:
+    return StreamingRobustPreprocessor(**params).fit(partition)
+
+
+def split_rows(data, num_partitions: int) -> List:
+    """
+    :return: Up to `num_partitions` contiguous row slices of a DataFrame or array.
+    """
+    bounds = np.linspace(0, len(data), num_partitions + 1).astype(int)
+    slicer = data.iloc if hasattr(data, "iloc") else data
+    return [
+        slicer[start:end] for start, end in zip(bounds[:-1], bounds[1:]) if end > start
+    ]
@@ -0,0 +1,133 @@
+import sys
+import time
+import tracemalloc
+import numpy as np
+from dataclasses import dataclass
+from typing import Tuple
+from imblearn.combine import SMOTETomek
+from imblearn.over_sampling import SMOTE
+from imblearn.under_sampling import RandomUnderSampler, TomekLinks
+from sklearn.neighbors import NearestNeighbors
+
+from sensor.exception import SensorException
+
+SMOTE_K_NEIGHBORS = 5
+
+RESAMPLING_STRATEGIES = (
+    "smote_tomek",
+    "smote",
+    "random_undersample",
+    "class_weight",
+    "none",
+)
+
+
+@dataclass
+class ResamplingReport:
+    strategy: str
+    seconds: float
+    peak_memory_mb: float
+    rows_before: int
+    rows_after: int
+    positive_rate_before: float
+    positive_rate_after: float
+    scale_pos_weight: float
+
+
+class Resampler:
+    """
+    The Resampler handles the class imbalance of the training set with one of
+    the `RESAMPLING_STRATEGIES`:
+        smote_tomek:          SMOTE oversampling followed by Tomek-link cleaning.
+        smote:                SMOTE with ball-tree neighbours searched on `n_jobs` cores.
+        random_undersample:   Drop majority rows at random down to the minority count.
+        class_weight:         Keep the rows and weight the positive class by
+                              `scale_pos_weight` in XGBoost instead.
+        none:                 Keep the rows as they are.
+    The time and peak memory of each run are recorded in a ResamplingReport.
+    """
+
+    def __init__(self, strategy: str, n_jobs: int = -1, random_state: int = 42):
+        try:
+            if strategy not in RESAMPLING_STRATEGIES:
+                raise Exception(
+                    f"Unknown resampling strategy [{strategy}]; "
+                    f"expected one of {RESAMPLING_STRATEGIES}."
+                )
+            self.strategy = strategy
+            self.n_jobs = n_jobs
+            self.random_state = random_state
+        except Exception as e:
+            raise SensorException(e, sys) from e
+
+    def _get_sampler(self):
+        nearest_neighbors = NearestNeighbors(
+            n_neighbors=SMOTE_K_NEIGHBORS + 1, algorithm="ball_tree", n_jobs=self.n_jobs
+        )
+        if self.strategy == "smote_tomek":
+            return SMOTETomek(
+                sampling_strategy="minority",
+                smote=SMOTE(
+                    sampling_strategy="minority",
+                    k_neighbors=nearest_neighbors,
+                    random_state=self.random_state,
+                ),
+                tomek=TomekLinks(sampling_strategy="all", n_jobs=self.n_jobs),
+                random_state=self.random_state,
+            )
+        if self.strategy == "smote":
+            return SMOTE(
+                sampling_strategy="minority",
+                k_neighbors=nearest_neighbors,
+                random_state=self.random_state,
+            )
+        if self.strategy == "random_undersample":
+            return RandomUnderSampler(random_state=self.random_state)
+        return None
+
+    def fit_resample(
+        self, X: np.ndarray, y: np.ndarray
+    ) -> Tuple[np.ndarray, np.ndarray, ResamplingReport]:
+        """
+        :param X: Transformed features.
+        :param y: Binary target, 1 for the positive class.
+        :return: Resampled features and target, and the run's ResamplingReport.
+        """
+        try:
+            y = np.asarray(y)
+            start = time.perf_counter()
+            tracemalloc.start()
+            try:
+                sampler = self._get_sampler()
+                if sampler is not None:
+                    X_resampled, y_resampled = sampler.fit_resample(X, y)
+                else:
+                    X_resampled, y_resampled = X, y
+                _, peak_memory = tracemalloc.get_traced_memory()
+            finally:
+                tracemalloc.stop()
+            seconds = time.perf_counter() - start
+
+            scale_pos_weight = 1.0
+            if self.strategy == "class_weight":
+                num_positive = int(np.sum(y_resampled == 1))
+                scale_pos_weight = (len(y_resampled) - num_positive) / max(
+                    num_positive, 1
+                )
+
+            report = ResamplingReport(
+                strategy=self.strategy,
+                seconds=seconds,
+                peak_memory_mb=peak_memory / 2**20,
+                rows_before=len(y),
+                rows_after=len(y_resampled),
+                positive_rate_before=float(np.mean(y == 1)) if len(y) else 0.0,
+                positive_rate_after=(
+                    float(np.mean(y_resampled == 1)) if len(y_resampled) else 0.0
+                ),
+                scale_pos_weight=scale_pos_weight,
+            )
+            return X_resampled, np.asarray(y_resampled), report
+
+        except Exception as e:
+            raise SensorException(e, sys) from e
@@ -0,0 +1,130 @@
+import io
+import sys
+import asyncio
+import multiprocessing
+import pandas as pd
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+from typing import List, Optional, Union
+
+from sensor.constant.training_pipeline import (
+    PREDICTION_EXECUTOR_TYPE,
+    PREDICTION_MAX_WORKERS,
+)
+from sensor.ml.model.registry import ModelRegistry
+from sensor.pipeline.prediction_pipeline import PredictionPipeline
+from sensor.exception import SensorException
+
+# The PredictionPipeline used by the current worker. Thread workers share the
+# application's pipeline; each process worker builds and warms its own.
+_worker_pipeline: Optional[PredictionPipeline] = None
+
+
+def _init_process_worker(model_dir: str, schema_config: dict) -> None:
+    global _worker_pipeline
+    _worker_pipeline = PredictionPipeline(
+        ModelRegistry(model_dir=model_dir), schema_config=schema_config
+    )
+    _worker_pipeline.model_registry.get_model()
+
+
+def _predict_csv(data) -> Optional[pd.Series]:
+    if _worker_pipeline.model_registry.get_model() is None:
+        return None
+    if isinstance(data, bytes):
+        data = io.BytesIO(data)
+    return _worker_pipeline.predict(pd.read_csv(data))
+
+
+def _predict_dataframe(
+    dataframe: pd.DataFrame, with_probability: bool = False
+) -> Optional[Union[pd.Series, pd.DataFrame]]:
+    if _worker_pipeline.model_registry.get_model() is None:
+        return None
+    return _worker_pipeline.predict(dataframe, with_probability=with_probability)
+
+
+def _predict_records(
+    records: List[dict], with_probability: bool = False
+) -> Optional[Union[pd.Series, pd.DataFrame]]:
+    if _worker_pipeline.model_registry.get_model() is None:
+        return None
+    return _worker_pipeline.predict_records(records, with_probability)
+
+
+class InferencePool:
+    """
+    The Inference pool runs CSV parsing and model prediction on a thread or
+    process pool, keeping the CPU-bound work off the server's event loop.
+    """
+
+    def __init__(
+        self,
+        prediction_pipeline: PredictionPipeline,
+        executor_type: str = PREDICTION_EXECUTOR_TYPE,
+        max_workers: int = PREDICTION_MAX_WORKERS,
+    ):
+        try:
+            global _worker_pipeline
+            self.executor_type = executor_type
+            self.max_workers = max_workers
+
+            if executor_type == "thread":
+                _worker_pipeline = prediction_pipeline
+                self.executor = ThreadPoolExecutor(
+                    max_workers=max_workers, thread_name_prefix="inference"
+                )
+            elif executor_type == "process":
+                model_dir = prediction_pipeline.model_registry.model_resolver.model_dir
+                self.executor = ProcessPoolExecutor(
+                    max_workers=max_workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                    initializer=_init_process_worker,
+                    initargs=(model_dir, prediction_pipeline.schema_config),
+                )
+            else:
+                raise Exception(f"Unsupported executor type: {executor_type}.")
+
+        except Exception as e:
+            raise SensorException(e, sys) from e
+
+    async def predict_csv(self, datafile) -> Optional[pd.Series]:
+        """
+        :param datafile: Uploaded CSV file.
+        :return: Predicted class labels, or None if no model is available.
+        """
+        loop = asyncio.get_running_loop()
+        if self.executor_type == "process":
+            # File handles can't cross process boundaries; send the raw bytes.
+            data = await datafile.read()
+        else:
+            data = datafile.file
+        return await loop.run_in_executor(self.executor, _predict_csv, data)
+
+    async def predict_dataframe(
+        self, dataframe: pd.DataFrame, with_probability: bool = False
+    ) -> Optional[Union[pd.Series, pd.DataFrame]]:
+        """
+        :param dataframe: Raw sensor readings, e.g. one chunk of a CSV upload.
+        :param with_probability: Also return the positive-class probabilities.
+        :return: Predicted class labels, or None if no model is available.
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self.executor, _predict_dataframe, dataframe, with_probability
+        )
+
+    async def predict_records(
+        self, records: List[dict], with_probability: bool = False
+    ) -> Optional[Union[pd.Series, pd.DataFrame]]:
+        """
+        :param records: Sensor readings as column-to-value mappings.
+        :param with_probability: Also return the positive-class probabilities.
+        :return: Predicted class labels, or None if no model is available.
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self.executor, _predict_records, records, with_probability
+        )
+
+    def shutdown(self) -> None:
+        self.executor.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,135 @@
+import asyncio
+from typing import Awaitable, Callable, List, Optional, Sequence, Set, Tuple
+
+from sensor.constant.training_pipeline import (
+    MICRO_BATCH_MAX_SIZE,
+    MICRO_BATCH_MAX_WAIT_MS,
+)
+from sensor.logger import logging
+
+PredictFn = Callable[[List[dict]], Awaitable[Optional[Sequence]]]
+
+
+class MicroBatcher:
+    """
+    The Micro-batcher coalesces concurrent small prediction requests into one
+    vectorized model call. A batch is dispatched once it holds `max_batch_size`
+    records or `max_wait_ms` has passed since its first request arrived.
+    """
+
+    def __init__(
+        self,
+        predict_fn: PredictFn,
+        max_batch_size: int = MICRO_BATCH_MAX_SIZE,
+        max_wait_ms: float = MICRO_BATCH_MAX_WAIT_MS,
+    ):
+        self.predict_fn = predict_fn
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000
+        self.batch_count: int = 0
+        self.record_count: int = 0
+        self._queue: Optional[asyncio.Queue] = None
+        self._task: Optional[asyncio.Task] = None
+        self._batch_tasks: Set[asyncio.Task] = set()
+
+    def start(self) -> None:
+        self._queue = asyncio.Queue()
+        self._task = asyncio.create_task(self._collect_batches())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+        if self._batch_tasks:
+            await asyncio.gather(*self._batch_tasks, return_exceptions=True)
+        while self._queue is not None and not self._queue.empty():
+            _, future = self._queue.get_nowait()
+            _set_exception(future, Exception("Micro-batcher is shutting down."))
+
+    async def predict(self, records: List[dict]) -> list:
+        """
+        :param records: Sensor readings for a single request.
+        :return: One prediction per record, in the order of `records`.
+        """
+        future = asyncio.get_running_loop().create_future()
+        self._queue.put_nowait((records, future))
+        return await future
+
+    async def _collect_batches(self) -> None:
+        loop = asyncio.get_running_loop()
+        # A pending get is carried over to the next batch rather than
+        # cancelled, so a request arriving right at the deadline is never lost.
+        getter = None
+        while True:
+            if getter is None:
+                getter = asyncio.ensure_future(self._queue.get())
+            items = [await getter]
+            getter = None
+            size = len(items[0][0])
+            deadline = loop.time() + self.max_wait
+            while size < self.max_batch_size:
+                if not self._queue.empty():
+                    item = self._queue.get_nowait()
+                else:
+                    timeout = deadline - loop.time()
+                    if timeout <= 0:
+                        break
+                    getter = asyncio.ensure_future(self._queue.get())
+                    done, _ = await asyncio.wait({getter}, timeout=timeout)
+                    if not done:
+                        break
+                    item, getter = getter.result(), None
+                items.append(item)
+                size += len(item[0])
+
+            # Don't block collection of the next batch on this one's prediction.
+            task = asyncio.create_task(self._run_batch(items))
+            self._batch_tasks.add(task)
+            task.add_done_callback(self._batch_tasks.discard)
+
+    async def _run_batch(self, items: List[Tuple[List[dict], asyncio.Future]]) -> None:
+        records = [record for request_records, _ in items for record in request_records]
+        try:
+            predictions = await self.predict_fn(records)
+        except Exception as e:
+            if len(items) == 1:
+                _set_exception(items[0][1], e)
+                return
+            # Retry requests one at a time so a malformed record only fails
+            # its own request and not the whole batch.
+            logging.info(f"Micro-batch of {len(items)} requests failed, retrying each.")
+            await asyncio.gather(*(self._run_batch([item]) for item in items))
+            return
+
+        if predictions is None:
+            for _, future in items:
+                _set_exception(future, Exception("Model is Unavailable."))
+            return
+
+        self.batch_count += 1
+        self.record_count += len(records)
+        # A DataFrame of outputs is split into one mapping per record.
+        if hasattr(predictions, "columns"):
+            predictions = predictions.to_dict(orient="records")
+        else:
+            predictions = list(predictions)
+        offset = 0
+        for request_records, future in items:
+            if not future.done():
+                future.set_result(predictions[offset : offset + len(request_records)])
+            offset += len(request_records)
+
+    def stats(self) -> dict:
+        return {
+            "batch_count": self.batch_count,
+            "record_count": self.record_count,
+            "mean_batch_size": (
+                self.record_count / self.batch_count if self.batch_count else None
+            ),
+            "max_batch_size": self.max_batch_size,
+            "max_wait_ms": self.max_wait * 1000,
+        }
+
+
+def _set_exception(future: asyncio.Future, error: Exception) -> None:
+    if not future.done():
+        future.set_exception(error)
@@ -0,0 +1,87 @@
+import sys
+import numpy as np
+import pandas as pd
+from typing import List, Optional, Union
+
+from sensor.ml.model.estimator import TargetValueMapping
+from sensor.ml.model.registry import ModelRegistry
+from sensor.utils.schema_validator import read_schema_config
+from sensor.exception import SensorException
+
+
+class PredictionPipeline:
+    """
+    The Prediction pipeline scores sensor readings with the best model held
+    by the ModelRegistry and maps the predictions back to class labels.
+    """
+
+    def __init__(
+        self, model_registry: ModelRegistry, schema_config: Optional[dict] = None
+    ):
+        try:
+            self.model_registry = model_registry
+            self.schema_config = (
+                schema_config if schema_config is not None else read_schema_config()
+            )
+            self._labels = TargetValueMapping().labels()
+        except Exception as e:
+            raise SensorException(e, sys) from e
+
+    def get_model(self):
+        model = self.model_registry.get_model()
+        if model is None:
+            raise Exception("Model is Unavailable.")
+        return model
+
+    def predict(
+        self, dataframe: pd.DataFrame, with_probability: bool = False
+    ) -> Union[pd.Series, pd.DataFrame]:
+        """
+        :param dataframe: Raw sensor readings, including the schema's drop columns.
+        :param with_probability: Also return the positive-class probability.
+        :return: Predicted class label for each row, or with `with_probability`
+        a DataFrame of the labels and probabilities.
+        """
+        try:
+            model = self.get_model()
+            dataframe = dataframe.drop(
+                self.schema_config["drop_columns"], axis=1, errors="ignore"
+            )
+            y_prob = model.predict_proba(dataframe)[:, 1]
+            y_pred = (y_prob > getattr(model, "threshold", 0.5)).astype(np.int64)
+
+            drift_checker = self.model_registry.get_drift_checker()
+            if drift_checker is not None:
+                drift_checker.submit(dataframe)
+
+            # The encoded classes index the labels directly.
+            predicted_class = pd.Series(
+                pd.Categorical.from_codes(y_pred, categories=self._labels),
+                name="predicted_class",
+            )
+            if not with_probability:
+                return predicted_class
+            return pd.DataFrame(
+                {"predicted_class": predicted_class, "probability": y_prob}
+            )
+        except Exception as e:
+            raise SensorException(e, sys) from e
+
+    def predict_records(
+        self, records: List[dict], with_probability: bool = False
+    ) -> Union[pd.Series, pd.DataFrame]:
+        """
+        :param records: Sensor readings as column-to-value mappings, e.g. JSON objects.
+        :return: Predicted class label for each record; see `predict`.
+        """
+        try:
+            model = self.get_model()
+            dataframe = pd.DataFrame.from_records(records).replace({"na": np.nan})
+
+            # Records carry no column order; align them to the fitted features.
+            feature_names = getattr(model, "feature_names_in_", None)
+            if feature_names is not None:
+                dataframe = dataframe.reindex(columns=feature_names)
+            return self.predict(dataframe, with_probability=with_probability)
+        except Exception as e:
+            raise SensorException(e, sys) from e
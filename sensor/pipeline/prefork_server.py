@@ -0,0 +1,140 @@
+import gc
+import os
+import sys
+import time
+import signal
+import socket
+from typing import Set
+import uvicorn
+
+from sensor.constant.training_pipeline import (
+    SERVING_HOST,
+    SERVING_PORT,
+    SERVING_WORKERS,
+)
+from sensor.ml.model.registry import ModelRegistry
+from sensor.exception import SensorException
+from sensor.logger import logging
+
+# Seconds to wait before replacing a worker that exited, so a worker failing
+# at startup doesn't turn into a fork loop.
+WORKER_RESTART_DELAY_SECONDS = 1.0
+
+
+class PreforkServer:
+    """
+    The Pre-fork server runs the app in `workers` processes that accept
+    connections from one listening socket, to use every core for prediction.
+
+    The best model is loaded in the parent before forking, so workers start
+    with it resident instead of each loading its own copy. Nothing is moved
+    into explicitly shared memory: the workers share the parent's pages
+    copy-on-write, which holds for the booster's trees because prediction only
+    reads them. The parent's objects are frozen out of the garbage collector
+    so that collections in the workers don't dirty those pages.
+
+    A model pushed later is loaded by each worker's registry on its own;
+    restarting the server shares it again. Each worker also keeps its own
+    training job runner; they share a lock file, so only one job runs at a
+    time, and a status file, so every worker reports it. Drift is tracked per
+    worker, over the predictions that worker served.
+    """
+
+    def __init__(
+        self,
+        app,
+        model_registry: ModelRegistry,
+        host: str = SERVING_HOST,
+        port: int = SERVING_PORT,
+        workers: int = SERVING_WORKERS,
+    ):
+        self.app = app
+        self.model_registry = model_registry
+        self.host = host
+        self.port = port
+        self.workers = workers
+        self._pids: Set[int] = set()
+        self._stopping = False
+
+    def _load_shared_model(self) -> None:
+        # Split the cores between the workers; set before XGBoost is imported.
+        os.environ.setdefault(
+            "OMP_NUM_THREADS", str(max(1, (os.cpu_count() or 1) // self.workers))
+        )
+        model = self.model_registry.get_model()
+        if model is None:
+            logging.info("Pre-fork Server started without a model.")
+        elif hasattr(model, "get_fused_preprocessor"):
+            # Built once here rather than after the fork in every worker.
+            model.get_fused_preprocessor()
+
+    def _bind_socket(self) -> socket.socket:
+        sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        sock.bind((self.host, self.port))
+        sock.listen(2048)
+        sock.set_inheritable(True)
+        return sock
+
+    def _start_worker(self, sock: socket.socket) -> None:
+        pid = os.fork()
+        if pid != 0:
+            self._pids.add(pid)
+            return
+
+        exit_code = 0
+        try:
+            signal.signal(signal.SIGINT, signal.SIG_DFL)
+            signal.signal(signal.SIGTERM, signal.SIG_DFL)
+            server = uvicorn.Server(uvicorn.Config(self.app))
+            server.run(sockets=[sock])
+        except BaseException as e:
+            logging.exception(e)
+            exit_code = 1
+        finally:
+            os._exit(exit_code)
+
+    def _stop(self, signum, frame) -> None:
+        self._stopping = True
+        for pid in list(self._pids):
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+
+    def run(self) -> None:
+        try:
+            if self.workers <= 1 or not hasattr(os, "fork"):
+                uvicorn.run(self.app, host=self.host, port=self.port)
+                return
+
+            self._load_shared_model()
+            sock = self._bind_socket()
+            gc.collect()
+            gc.freeze()
+
+            signal.signal(signal.SIGINT, self._stop)
+            signal.signal(signal.SIGTERM, self._stop)
+            for _ in range(self.workers):
+                self._start_worker(sock)
+            logging.info(
+                f"Pre-fork Server started {self.workers} workers on "
+                f"{self.host}:{self.port}."
+            )
+
+            while self._pids:
+                pid, status = os.wait()
+                self._pids.discard(pid)
+                if self._stopping:
+                    continue
+                logging.info(
+                    f"Worker [{pid}] exited with status [{status}]; restarting it."
+                )
+                time.sleep(WORKER_RESTART_DELAY_SECONDS)
+                if not self._stopping:
+                    self._start_worker(sock)
+            sock.close()
+            logging.info("Pre-fork Server stopped.")
+
+        except Exception as e:
+            raise SensorException(e, sys) from e
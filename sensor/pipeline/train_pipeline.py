@@ -1,4 +1,6 @@
 import sys
+from contextlib import nullcontext
+from typing import Optional
 
 from sensor.components.data_ingestion import DataIngestion
 from sensor.components.data_validation import DataValidation
@@ -27,6 +29,7 @@ from sensor.entity.config_entity import (
 )
 from sensor.exception import SensorException
 from sensor.logger import logging
+from sensor.utils.artifact_cache import ArtifactCache
 
 
 class TrainPipeline:
@@ -115,12 +118,20 @@ class TrainPipeline:
         except Exception as e:
             raise SensorException(e, sys) from e
 
-    def start_model_pusher(self, model_evaluation_artifact: ModelEvaluationArtifact):
+    def start_model_pusher(
+        self,
+        model_evaluation_artifact: ModelEvaluationArtifact,
+        data_validation_artifact: Optional[DataValidationArtifact] = None,
+    ):
         try:
             model_pusher_config = ModelPusherConfig(
                 training_pipeline_config=self.training_pipeline_config
             )
-            model_pusher = ModelPusher(model_pusher_config, model_evaluation_artifact)
+            model_pusher = ModelPusher(
+                model_evaluation_artifact,
+                model_pusher_config,
+                data_validation_artifact=data_validation_artifact,
+            )
             return model_pusher.initiate_model_pusher()
 
         except Exception as e:
@@ -152,24 +163,40 @@ class TrainPipeline:
             logging.info(">>> Training Pipeline Started.")
             TrainPipeline.is_pipeline_running = True
 
-            data_ingestion_artifact: DataIngestionArtifact = self.start_data_ingestion()
-
-            data_validation_artifact = self.start_data_validaton(
-                data_ingestion_artifact=data_ingestion_artifact
-            )
-            data_transformation_artifact = self.start_data_transformation(
-                data_validation_artifact=data_validation_artifact
-            )
-            model_trainer_artifact = self.start_model_trainer(
-                data_transformation_artifact
-            )
-            model_evaluation_artifact = self.start_model_evaluation(
-                data_validation_artifact, model_trainer_artifact
-            )
-            if not model_evaluation_artifact.is_model_accepted:
-                raise Exception("The trained model is inefficient than the best model.")
-
-            model_pusher_artifact = self.start_model_pusher(model_evaluation_artifact)
+            # Stages hand DataFrames and arrays over in memory; pending artifact
+            # writes are flushed on leaving the block, before any S3 sync.
+            # Out-of-core runs stream from disk and never hold the data whole.
+            artifact_cache = (
+                ArtifactCache()
+                if self.training_pipeline_config.in_memory_artifact_handoff
+                and not self.training_pipeline_config.out_of_core_training
+                else nullcontext()
+            )
+            with artifact_cache:
+                data_ingestion_artifact: DataIngestionArtifact = (
+                    self.start_data_ingestion()
+                )
+
+                data_validation_artifact = self.start_data_validaton(
+                    data_ingestion_artifact=data_ingestion_artifact
+                )
+                data_transformation_artifact = self.start_data_transformation(
+                    data_validation_artifact=data_validation_artifact
+                )
+                model_trainer_artifact = self.start_model_trainer(
+                    data_transformation_artifact
+                )
+                model_evaluation_artifact = self.start_model_evaluation(
+                    data_validation_artifact, model_trainer_artifact
+                )
+                if not model_evaluation_artifact.is_model_accepted:
+                    raise Exception(
+                        "The trained model is inefficient than the best model."
+                    )
+
+                model_pusher_artifact = self.start_model_pusher(
+                    model_evaluation_artifact, data_validation_artifact
+                )
 
             TrainPipeline.is_pipeline_running = False
             self.sync_artifact_dir_to_s3()
@@ -0,0 +1,172 @@
+import os
+import sys
+import json
+import uuid
+import threading
+import multiprocessing
+from dataclasses import dataclass, asdict
+from datetime import datetime
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import IO, Optional
+
+from sensor.constant.training_pipeline import (
+    TRAINING_JOB_LOCK_FILE_PATH,
+    TRAINING_JOB_STATUS_FILE_PATH,
+)
+from sensor.exception import SensorException
+from sensor.logger import logging
+
+try:
+    import fcntl
+except ImportError:
+    # Without fork there is only one server process to guard against.
+    fcntl = None
+
+
+def _run_training_pipeline() -> None:
+    # Imported in the job's process, keeping the components out of the server.
+    from sensor.pipeline.train_pipeline import TrainPipeline
+
+    TrainPipeline().run_pipeline()
+
+
+@dataclass
+class TrainingJob:
+    job_id: str
+    status: str
+    started_at: str
+    finished_at: Optional[str] = None
+    error: Optional[str] = None
+
+
+class TrainingJobRunner:
+    """
+    The Training job runner executes the TrainPipeline in a separate process,
+    one job at a time, so the server stays responsive while a model trains.
+    A job also holds an exclusive lock on `lock_file_path`, so runners in
+    other server processes don't start a second one meanwhile, and its status
+    is written to `status_file_path`, so every process reports the same job.
+    """
+
+    def __init__(
+        self,
+        lock_file_path: str = TRAINING_JOB_LOCK_FILE_PATH,
+        status_file_path: str = TRAINING_JOB_STATUS_FILE_PATH,
+    ):
+        self.lock_file_path = lock_file_path
+        self.status_file_path = status_file_path
+        self._lock = threading.Lock()
+        self._future: Optional[Future] = None
+        self.job: Optional[TrainingJob] = None
+
+    def is_running(self) -> bool:
+        return self._future is not None and not self._future.done()
+
+    def _acquire_lock_file(self) -> Optional[IO]:
+        """
+        :return: The open lock file, or None if another process holds it.
+        """
+        lock_dir = os.path.dirname(self.lock_file_path)
+        if lock_dir:
+            os.makedirs(lock_dir, exist_ok=True)
+        lock_file = open(self.lock_file_path, "a")
+        if fcntl is None:
+            return lock_file
+        try:
+            fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            lock_file.close()
+            return None
+        return lock_file
+
+    def _write_status(self, job: TrainingJob) -> None:
+        status_dir = os.path.dirname(self.status_file_path)
+        if status_dir:
+            os.makedirs(status_dir, exist_ok=True)
+        with open(f"{self.status_file_path}.tmp", "w") as status_file:
+            json.dump(asdict(job), status_file)
+        os.replace(f"{self.status_file_path}.tmp", self.status_file_path)
+
+    def submit(self) -> Optional[TrainingJob]:
+        """
+        :return: The started job, or None if a job is already running.
+        """
+        try:
+            with self._lock:
+                if self.is_running():
+                    return None
+                lock_file = self._acquire_lock_file()
+                if lock_file is None:
+                    return None
+
+                job = TrainingJob(
+                    job_id=uuid.uuid4().hex, status="running", started_at=_now()
+                )
+                self.job = job
+                try:
+                    self._write_status(job)
+                    # A fresh process per job returns the training memory to the OS.
+                    executor = ProcessPoolExecutor(
+                        max_workers=1, mp_context=multiprocessing.get_context("spawn")
+                    )
+                    self._future = executor.submit(_run_training_pipeline)
+                except BaseException:
+                    lock_file.close()
+                    raise
+                self._future.add_done_callback(
+                    lambda future: self._on_done(future, job, lock_file)
+                )
+                executor.shutdown(wait=False)
+                logging.info(f"Training Job [{job.job_id}] Started.")
+                return job
+
+        except Exception as e:
+            raise SensorException(e, sys) from e
+
+    def _read_status(self) -> dict:
+        with open(self.status_file_path) as status_file:
+            return json.load(status_file)
+
+    def _on_done(self, future: Future, job: TrainingJob, lock_file: IO) -> None:
+        try:
+            error = future.exception()
+            job.finished_at = _now()
+            job.status = "failed" if error else "succeeded"
+            job.error = str(error) if error else None
+            self._write_status(job)
+            logging.info(
+                f"Training Job [{job.job_id}] Ended with status [{job.status}]."
+            )
+        finally:
+            # Released only once the final status is written; see `status`.
+            lock_file.close()
+
+    def status(self) -> Optional[dict]:
+        """
+        :return: The latest job's status, whichever server process started it,
+        or None if no job has been started.
+        """
+        try:
+            if not os.path.exists(self.status_file_path):
+                return asdict(self.job) if self.job is not None else None
+            status = self._read_status()
+
+            # A running job holds the lock; if it is free and the status still
+            # says running, the process that started the job exited first.
+            if status["status"] == "running" and fcntl is not None:
+                lock_file = self._acquire_lock_file()
+                if lock_file is not None:
+                    with lock_file:
+                        status = self._read_status()
+                    if status["status"] == "running":
+                        status.update(
+                            status="interrupted",
+                            error="The server process running the job exited.",
+                        )
+            return status
+        except Exception as e:
+            raise SensorException(e, sys) from e
+
+
+def _now() -> str:
+    return datetime.now().isoformat(timespec="seconds")
@@ -3,7 +3,16 @@ import sys
 import dill
 import yaml
 import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.ipc as ipc
+import pyarrow.parquet as pq
+from typing import TYPE_CHECKING, Iterator, Optional, Union
 from sensor.exception import SensorException
+from sensor.utils.artifact_cache import get_active_cache
+
+if TYPE_CHECKING:
+    import xgboost as xgb
 
 
 def read_yaml_file(file_path: str) -> dict:
@@ -44,7 +53,7 @@ def load_object(file_path: str) -> object:
         raise SensorException(e, sys) from e
 
 
-def save_numpy_array_data(file_path: str, array: np.array):
+def _write_numpy_array_data(file_path: str, array: np.array) -> None:
     try:
         os.makedirs(os.path.dirname(file_path), exist_ok=True)
         with open(file_path, "wb") as file_obj:
@@ -53,9 +62,174 @@ def save_numpy_array_data(file_path: str, array: np.array):
         raise SensorException(e, sys) from e
 
 
-def load_numpy_array_data(file_path: str) -> np.array:
+def save_numpy_array_data(
+    file_path: str,
+    array: np.array,
+    dtype: Optional[Union[str, np.dtype]] = None,
+):
+    """
+    :param dtype: Cast the array to this dtype before saving.
+    """
+    if dtype is not None:
+        array = np.asarray(array, dtype=dtype)
+    artifact_cache = get_active_cache()
+    if artifact_cache is not None:
+        artifact_cache.put(file_path, array, _write_numpy_array_data)
+    else:
+        _write_numpy_array_data(file_path, array)
+
+
+def load_numpy_array_data(file_path: str, mmap_mode: Optional[str] = None) -> np.array:
+    """
+    :param mmap_mode: Memory-map the file instead of reading it, e.g. "r" for
+    read-only access that pages the array in on demand.
+    """
+    artifact_cache = get_active_cache()
+    cached = artifact_cache.get(file_path) if artifact_cache is not None else None
+    if cached is not None:
+        return cached
     try:
+        if mmap_mode is not None:
+            return np.load(file_path, mmap_mode=mmap_mode)
         with open(file_path, "rb") as file_obj:
             return np.load(file_obj)
     except Exception as e:
         raise SensorException(e, sys) from e
+
+
+def load_dmatrix(
+    feature_file_path: str,
+    label_file_path: Optional[str] = None,
+    quantile: bool = False,
+    ref: Optional["xgb.DMatrix"] = None,
+    **kwargs,
+) -> "xgb.DMatrix":
+    """
+    Build an XGBoost matrix straight from memory-mapped feature and label
+    arrays, without reading them into memory first.
+    :param quantile: Build a QuantileDMatrix, which keeps only the binned
+    features the "hist" tree method needs.
+    :param ref: QuantileDMatrix whose bins to reuse, e.g. the training matrix
+    when building the evaluation matrix.
+    """
+    try:
+        import xgboost as xgb
+
+        data = load_numpy_array_data(feature_file_path, mmap_mode="r")
+        label = (
+            load_numpy_array_data(label_file_path, mmap_mode="r")
+            if label_file_path is not None
+            else None
+        )
+        if quantile:
+            return xgb.QuantileDMatrix(data, label=label, ref=ref, **kwargs)
+        return xgb.DMatrix(data, label=label, **kwargs)
+    except Exception as e:
+        raise SensorException(e, sys) from e
+
+
+def _write_dataframe(
+    file_path: str, dataframe: pd.DataFrame, export_csv: bool = False
+) -> None:
+    try:
+        os.makedirs(os.path.dirname(file_path), exist_ok=True)
+        base_path, extension = os.path.splitext(file_path)
+        if extension == ".parquet":
+            dataframe.to_parquet(file_path, index=False)
+        elif extension == ".feather":
+            dataframe.reset_index(drop=True).to_feather(file_path)
+        elif extension == ".csv":
+            dataframe.to_csv(file_path, index=False, header=True)
+        else:
+            raise Exception(f"Unsupported Dataframe file format: [{extension}].")
+
+        if export_csv and extension != ".csv":
+            dataframe.to_csv(f"{base_path}.csv", index=False, header=True)
+    except Exception as e:
+        raise SensorException(e, sys) from e
+
+
+def save_dataframe(
+    file_path: str, dataframe: pd.DataFrame, export_csv: bool = False
+) -> None:
+    """
+    Save a Dataframe in the format given by the file extension: parquet, feather or csv.
+    :param export_csv: Also write a CSV copy alongside a columnar file.
+    """
+    artifact_cache = get_active_cache()
+    if artifact_cache is not None:
+        artifact_cache.put(
+            file_path,
+            dataframe,
+            lambda path, df: _write_dataframe(path, df, export_csv=export_csv),
+        )
+    else:
+        _write_dataframe(file_path, dataframe, export_csv=export_csv)
+
+
+def load_dataframe(file_path: str) -> pd.DataFrame:
+    artifact_cache = get_active_cache()
+    cached = artifact_cache.get(file_path) if artifact_cache is not None else None
+    if cached is not None:
+        return cached
+    try:
+        extension = os.path.splitext(file_path)[1]
+        if extension == ".parquet":
+            return pd.read_parquet(file_path)
+        if extension == ".feather":
+            return pd.read_feather(file_path)
+        if extension == ".csv":
+            return pd.read_csv(file_path)
+        raise Exception(f"Unsupported Dataframe file format: [{extension}].")
+    except Exception as e:
+        raise SensorException(e, sys) from e
+
+
+def iter_dataframe_batches(file_path: str, batch_rows: int) -> Iterator[pd.DataFrame]:
+    """
+    Read a parquet, feather or csv Dataframe file in batches of up to `batch_rows`
+    rows, without loading the whole file.
+    """
+    try:
+        artifact_cache = get_active_cache()
+        cached = artifact_cache.get(file_path) if artifact_cache is not None else None
+        if cached is not None:
+            for start in range(0, len(cached), batch_rows):
+                yield cached.iloc[start : start + batch_rows]
+            return
+
+        extension = os.path.splitext(file_path)[1]
+        if extension == ".parquet":
+            for batch in pq.ParquetFile(file_path).iter_batches(batch_size=batch_rows):
+                yield batch.to_pandas()
+        elif extension == ".feather":
+            # Record batches are read and decompressed one at a time.
+            with ipc.open_file(pa.memory_map(file_path)) as reader:
+                for index in range(reader.num_record_batches):
+                    batch = reader.get_batch(index)
+                    for start in range(0, batch.num_rows, batch_rows):
+                        yield batch.slice(start, batch_rows).to_pandas()
+        elif extension == ".csv":
+            yield from pd.read_csv(file_path, chunksize=batch_rows)
+        else:
+            raise Exception(f"Unsupported Dataframe file format: [{extension}].")
+    except Exception as e:
+        raise SensorException(e, sys) from e
+
+
+def count_dataframe_rows(file_path: str) -> int:
+    try:
+        artifact_cache = get_active_cache()
+        cached = artifact_cache.get(file_path) if artifact_cache is not None else None
+        if cached is not None:
+            return len(cached)
+
+        extension = os.path.splitext(file_path)[1]
+        if extension == ".parquet":
+            return pq.ParquetFile(file_path).metadata.num_rows
+        if extension == ".feather":
+            with ipc.open_file(pa.memory_map(file_path)) as reader:
+                return reader.count_rows()
+        return sum(len(batch) for batch in iter_dataframe_batches(file_path, 65536))
+    except Exception as e:
+        raise SensorException(e, sys) from e
@@ -0,0 +1,68 @@
+import os
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional
+
+from sensor.logger import logging
+
+_active_cache: Optional["ArtifactCache"] = None
+
+
+class ArtifactCache:
+    """
+    The Artifact cache lets pipeline stages hand DataFrames and arrays to the
+    next stage in memory. While it is active, saved artifacts are kept by path
+    and persisted to disk on a background thread for lineage, and loads of a
+    cached path skip the disk. Stages must not modify loaded artifacts in place.
+
+        with ArtifactCache():
+            ...  # Run the pipeline stages.
+    """
+
+    def __init__(self):
+        self._artifacts: Dict[str, object] = {}
+        self._futures: List[Future] = []
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+    def __enter__(self) -> "ArtifactCache":
+        global _active_cache
+        self._executor = ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="artifact-writer"
+        )
+        _active_cache = self
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> bool:
+        global _active_cache
+        _active_cache = None
+        try:
+            self.flush()
+        except Exception as e:
+            # Don't mask the error that ended the pipeline with a write error.
+            if exc_type is None:
+                raise e
+            logging.exception(e)
+        finally:
+            self._executor.shutdown()
+            self._artifacts.clear()
+        return False
+
+    def put(
+        self, file_path: str, artifact: object, save_fn: Callable[[str, object], None]
+    ) -> None:
+        self._artifacts[os.path.abspath(file_path)] = artifact
+        self._futures.append(self._executor.submit(save_fn, file_path, artifact))
+
+    def get(self, file_path: str) -> Optional[object]:
+        return self._artifacts.get(os.path.abspath(file_path))
+
+    def flush(self) -> None:
+        """
+        Wait for all pending writes, raising the first write error.
+        """
+        futures, self._futures = self._futures, []
+        for future in futures:
+            future.result()
+
+
+def get_active_cache() -> Optional[ArtifactCache]:
+    return _active_cache
@@ -0,0 +1,178 @@
+import os
+import sys
+import glob
+import json
+import math
+import numpy as np
+import pandas as pd
+from datetime import datetime
+from typing import Iterable, Optional
+from pyarrow import json as pa_json
+
+from sensor.constant.training_pipeline import (
+    ARTIFACT_DIR,
+    DATA_VALIDATION_DIR_NAME,
+    DATA_VALIDATION_DRIFT_REPORT_DIR,
+    DATA_VALIDATION_DRIFT_REPORT_FILE_NAME,
+    MODEL_EVALUATION_DIR_NAME,
+    MODEL_EVALUATION_REPORT_NAME,
+)
+from sensor.exception import SensorException
+
+RUN_TIMESTAMP_FORMAT = "%m_%d_%Y_%H_%M_%S"
+
+DRIFT_REPORT_PATH = os.path.join(
+    DATA_VALIDATION_DIR_NAME,
+    DATA_VALIDATION_DRIFT_REPORT_DIR,
+    DATA_VALIDATION_DRIFT_REPORT_FILE_NAME,
+)
+MODEL_EVALUATION_REPORT_PATH = os.path.join(
+    MODEL_EVALUATION_DIR_NAME, MODEL_EVALUATION_REPORT_NAME
+)
+
+
+def _to_json_value(value):
+    if isinstance(value, np.generic):
+        return value.item()
+    raise TypeError(f"{type(value).__name__} is not JSON serializable")
+
+
+def _to_json_line(record: dict) -> str:
+    # NaN is not valid JSON; it is written as null.
+    record = {
+        key: None if isinstance(value, float) and math.isnan(value) else value
+        for key, value in record.items()
+    }
+    return json.dumps(record, default=_to_json_value) + "\n"
+
+
+class JsonLinesReportWriter:
+    """
+    The Report writer appends one flat JSON object per line as records are
+    produced, so a report is never held in memory as a whole and each file
+    reads back as a table.
+
+        with JsonLinesReportWriter(file_path) as writer:
+            writer.write({"column": "aa_000", "p_value": 0.42})
+    """
+
+    def __init__(self, file_path: str):
+        self.file_path = file_path
+        self._file = None
+
+    def __enter__(self) -> "JsonLinesReportWriter":
+        os.makedirs(os.path.dirname(self.file_path), exist_ok=True)
+        self._file = open(self.file_path, "w")
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> bool:
+        self._file.close()
+        return False
+
+    def write(self, record: dict) -> None:
+        self._file.write(_to_json_line(record))
+
+
+def write_jsonl_report(file_path: str, records: Iterable[dict]) -> None:
+    try:
+        with JsonLinesReportWriter(file_path) as writer:
+            for record in records:
+                writer.write(record)
+    except Exception as e:
+        raise SensorException(e, sys) from e
+
+
+def flatten_record(record: dict, prefix: str = "") -> dict:
+    """
+    Flatten nested dicts into one level, joining keys with ".".
+    """
+    flat = {}
+    for key, value in record.items():
+        if isinstance(value, dict):
+            flat.update(flatten_record(value, prefix=f"{prefix}{key}."))
+        else:
+            flat[f"{prefix}{key}"] = value
+    return flat
+
+
+def read_jsonl_report(file_path: str) -> pd.DataFrame:
+    try:
+        return pa_json.read_json(file_path).to_pandas()
+    except Exception as e:
+        raise SensorException(e, sys) from e
+
+
+def query_run_reports(
+    report_path: str, artifact_dir: str = ARTIFACT_DIR
+) -> pd.DataFrame:
+    """
+    Stack one report from every `artifact/<timestamp>` run into a single table.
+    :param report_path: Path of the report inside a run directory.
+    :return: The report records with `run` and `run_time` columns, oldest run first.
+    """
+    try:
+        frames = []
+        for file_path in glob.glob(os.path.join(artifact_dir, "*", report_path)):
+            run = os.path.relpath(file_path, artifact_dir).split(os.sep)[0]
+            df = read_jsonl_report(file_path)
+            df.insert(0, "run", run)
+            frames.append(df)
+        if not frames:
+            return pd.DataFrame(columns=["run", "run_time"])
+
+        reports = pd.concat(frames, ignore_index=True)
+        reports.insert(
+            1,
+            "run_time",
+            pd.to_datetime(
+                reports["run"], format=RUN_TIMESTAMP_FORMAT, errors="coerce"
+            ),
+        )
+        return reports.sort_values("run_time", kind="stable", ignore_index=True)
+    except Exception as e:
+        raise SensorException(e, sys) from e
+
+
+def query_drift_reports(
+    artifact_dir: str = ARTIFACT_DIR, since: Optional[datetime] = None
+) -> pd.DataFrame:
+    """
+    :return: One row per run and column: `method`, `p_value`, `psi` and `drift_status`.
+    """
+    reports = query_run_reports(DRIFT_REPORT_PATH, artifact_dir=artifact_dir)
+    if since is not None:
+        reports = reports[reports["run_time"] >= since]
+    return reports
+
+
+def summarize_drift_reports(
+    artifact_dir: str = ARTIFACT_DIR, since: Optional[datetime] = None
+) -> pd.DataFrame:
+    """
+    :return: Per column, the number of runs, how often it drifted and its
+    p-value and PSI statistics, most frequently drifting columns first.
+    """
+    try:
+        reports = query_drift_reports(artifact_dir=artifact_dir, since=since)
+        for column in ("column", "p_value", "psi", "drift_status"):
+            if column not in reports:
+                reports[column] = np.nan
+        summary = reports.groupby("column").agg(
+            runs=("run", "nunique"),
+            drift_count=("drift_status", "sum"),
+            drift_rate=("drift_status", "mean"),
+            mean_p_value=("p_value", "mean"),
+            min_p_value=("p_value", "min"),
+            mean_psi=("psi", "mean"),
+            max_psi=("psi", "max"),
+        )
+        return summary.sort_values("drift_rate", ascending=False)
+    except Exception as e:
+        raise SensorException(e, sys) from e
+
+
+def query_model_evaluation_reports(artifact_dir: str = ARTIFACT_DIR) -> pd.DataFrame:
+    """
+    :return: One row per run with the flattened ModelEvaluationArtifact.
+    """
+    return query_run_reports(MODEL_EVALUATION_REPORT_PATH, artifact_dir=artifact_dir)
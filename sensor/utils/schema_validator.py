@@ -0,0 +1,131 @@
+import sys
+import numpy as np
+import pandas as pd
+from functools import lru_cache
+from typing import List, Tuple
+
+from sensor.constant.training_pipeline import SCHEMA_FILE_PATH
+from sensor.utils import read_yaml_file
+from sensor.exception import SensorException
+
+CATEGORY_DTYPE = "category"
+INTEGER_DTYPE = "int"
+
+
+class SchemaValidator:
+    """
+    The Schema validator is compiled once from schema.yaml into column
+    indexes and per-column bound vectors, so that a whole chunk is checked
+    with a few vectorized operations rather than a scan per schema column.
+
+    Besides the `columns` section, it reads two optional sections:
+        ranges:       column -> [min, max] (either bound may be null)
+        categories:   column -> allowed values
+    """
+
+    def __init__(self, schema_config: dict):
+        try:
+            self.dtypes = {
+                column: dtype
+                for column_type in schema_config["columns"]
+                for column, dtype in column_type.items()
+            }
+            self.columns = list(self.dtypes)
+            self.column_set = frozenset(self.columns)
+            self.numerical_columns = [
+                column
+                for column, dtype in self.dtypes.items()
+                if dtype != CATEGORY_DTYPE
+            ]
+            self.categories = {
+                column: frozenset(values)
+                for column, values in (schema_config.get("categories") or {}).items()
+            }
+
+            ranges = schema_config.get("ranges") or {}
+            self._lower_bounds = np.full(len(self.numerical_columns), -np.inf)
+            self._upper_bounds = np.full(len(self.numerical_columns), np.inf)
+            for i, column in enumerate(self.numerical_columns):
+                lower, upper = ranges.get(column, (None, None))
+                if lower is not None:
+                    self._lower_bounds[i] = lower
+                if upper is not None:
+                    self._upper_bounds[i] = upper
+            self._is_integer = np.array(
+                [
+                    self.dtypes[column] == INTEGER_DTYPE
+                    for column in self.numerical_columns
+                ]
+            )
+        except Exception as e:
+            raise SensorException(e, sys) from e
+
+    def get_missing_columns(self, dataframe: pd.DataFrame) -> List[str]:
+        return [column for column in self.columns if column not in dataframe.columns]
+
+    def get_unexpected_columns(self, dataframe: pd.DataFrame) -> List[str]:
+        return [column for column in dataframe.columns if column not in self.column_set]
+
+    def get_invalid_dtype_columns(self, dataframe: pd.DataFrame) -> List[str]:
+        """
+        :return: Numerical schema columns whose values are not numeric.
+        """
+        return [
+            column
+            for column in self.numerical_columns
+            if column in dataframe.columns
+            and not pd.api.types.is_numeric_dtype(dataframe[column])
+        ]
+
+    def get_invalid_row_mask(self, dataframe: pd.DataFrame) -> np.ndarray:
+        """
+        :param dataframe: A chunk with every schema column present.
+        :return: True for each row with a value outside its column's range, a
+        non-integral value in an "int" column, or a category not in the schema.
+        Missing values are never a violation.
+        """
+        try:
+            values = dataframe[self.numerical_columns].to_numpy(dtype=np.float64)
+            with np.errstate(invalid="ignore"):
+                violations = (values < self._lower_bounds) | (
+                    values > self._upper_bounds
+                )
+                violations[:, self._is_integer] |= (
+                    np.floor(values[:, self._is_integer]) != values[:, self._is_integer]
+                ) & ~np.isnan(values[:, self._is_integer])
+            invalid = violations.any(axis=1)
+
+            for column, allowed_values in self.categories.items():
+                series = dataframe[column]
+                invalid |= (~series.isin(allowed_values) & series.notna()).to_numpy()
+            return invalid
+        except Exception as e:
+            raise SensorException(e, sys) from e
+
+    def split_valid_rows(
+        self, dataframe: pd.DataFrame
+    ) -> Tuple[pd.DataFrame, pd.DataFrame]:
+        """
+        :return: The valid and the invalid rows of `dataframe`.
+        """
+        try:
+            invalid = self.get_invalid_row_mask(dataframe)
+            if not invalid.any():
+                return dataframe, dataframe.iloc[:0]
+            return dataframe[~invalid], dataframe[invalid]
+        except Exception as e:
+            raise SensorException(e, sys) from e
+
+
+@lru_cache(maxsize=None)
+def read_schema_config(file_path: str = SCHEMA_FILE_PATH) -> dict:
+    """
+    Parse schema.yaml once per process. The returned dict is shared and must
+    not be modified.
+    """
+    return read_yaml_file(file_path)
+
+
+@lru_cache(maxsize=None)
+def get_schema_validator(file_path: str = SCHEMA_FILE_PATH) -> SchemaValidator:
+    return SchemaValidator(read_schema_config(file_path))
@@ -20,5 +20,6 @@ setup(
     author_email="aritraganguly.msc@protonmail.com",
     description="Sensor Fault Detection",
     packages=find_packages(),
+    python_requires=">=3.10",
     install_requires=get_requirements_list(),
 )